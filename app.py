@@ -1,9 +1,15 @@
 import streamlit as st
-from core.config import GROQ_API_KEY
+from core.config import GROQ_API_KEY, ENABLE_FAKE_LLM
 from ui.candidate_form import candidate_form
-from ui.interview_flow import ask_questions, evaluate_answers
-from core.llm_wrapper import LLMWrapper
-import json, re
+from ui.interview_flow import ask_questions, evaluate_answers, job_progress
+from core.llm_wrapper import warm_up
+from core.chain_pool import get_chain_pool
+from core.question_bank import normalize_profile, questions_for
+from core.jobs import get_job_queue, offload_available, submit_questions
+from core.session import get_session_registry
+from core import metrics
+
+metrics.start_exporters()
 
 # Ensure required session_state keys exist
 for key in ["chain", "provider", "api_key", "model_name"]:
@@ -14,7 +20,7 @@ for key in ["chain", "provider", "api_key", "model_name"]:
 # ---------------- Sidebar Settings ----------------
 with st.sidebar:
     st.header("Settings")
-    provider = st.selectbox("LLM Provider", ["Groq"], index=0).lower()
+    provider = st.selectbox("LLM Provider", ["Groq"] + (["Fake"] if ENABLE_FAKE_LLM else []), index=0).lower()
 
     # Save API key in session_state
     if "api_key" not in st.session_state:
@@ -26,15 +32,19 @@ with st.sidebar:
         type="password"
     )
     st.session_state.api_key = api_key  # keep it synced
+    if api_key:
+        warm_up(provider)  # load the SDK in the background while the page renders
 
     model_name = st.selectbox("Model", ["llama3-8b-8192", "llama-3.1-8b-instant"], index=0)
     st.session_state.model_name = model_name
     st.session_state.provider = provider
 
     if st.button("Clear Chat"):
-        for key in ["messages","candidate","questions","current_q","answers","chain","consent","bot_intro"]:
+        for key in ["chain","consent","bot_intro"]:
             if key in st.session_state:
                 del st.session_state[key]
+        if "interview" in st.session_state:
+            st.session_state.interview.reset()
         st.session_state["proceed"] = None    
         st.rerun() 
 
@@ -44,31 +54,47 @@ st.title("🚀 TalentScout — Intelligent Hiring Assistant")
 
 
 # ---------------- Initialize session state ----------------
-for key in ["messages","candidate","questions","current_q","answers"]:
-    if key not in st.session_state:
-        st.session_state[key] = [] if key != "candidate" else {}
+# Candidate, questions and answers live in one compact InterviewSession (core/session.py),
+# checkpointed after every step; the URL's ?sid= token resumes it in any worker process
+if "interview" not in st.session_state:
+    st.session_state.interview = get_session_registry().open_session(st.query_params.get("sid"))
+    st.query_params["sid"] = st.session_state.interview.token
+st.session_state.interview.touch()
+if st.session_state.interview.expired and not st.session_state.interview.resume():
+    st.session_state.interview.reset()
+    st.warning("⚠️ This session was idle for too long and has been cleared. Please fill in the form again.")
 if "consent" not in st.session_state:
-    st.session_state.consent = None
+    st.session_state.consent = st.session_state.interview.flags.get("consent")
 if "bot_intro" not in st.session_state:
-    st.session_state.bot_intro = False
-
-# ---------------- Bot Introduction ----------------
-if not st.session_state.bot_intro:
-    if st.session_state.api_key:
-        @st.cache_resource
-        def load_chain(provider, api_key, model_name):
-            # Cache per unique (provider, api_key, model_name)
-            return LLMWrapper(provider=provider, api_key=api_key, model_name=model_name)
-
-        # Always rebuild when api_key/provider/model_name changes
-        st.session_state.chain = load_chain(
+    st.session_state.bot_intro = st.session_state.interview.flags.get("bot_intro", False)
+
+# ---------------- Shared chain ----------------
+# Sessions lease one chain per (provider, api_key, model_name) from the process-wide pool;
+# changing the settings swaps the lease, and an ended session releases it
+if st.session_state.api_key:
+    with metrics.STAGE_SECONDS.time(stage="load_chain"):
+        st.session_state.chain_lease = get_chain_pool().lease(
             st.session_state.provider,
             st.session_state.api_key,
-            st.session_state.model_name
+            st.session_state.model_name,
+            current=st.session_state.get("chain_lease"),
         )
+    st.session_state.chain = st.session_state.chain_lease.chain
+else:
+    lease = st.session_state.pop("chain_lease", None)
+    if lease:
+        lease.release()
+    st.session_state.chain = None
 
+# ---------------- Bot Introduction ----------------
+if not st.session_state.bot_intro:
+    if st.session_state.chain:
         # Validate before proceeding
-        if not st.session_state.chain.validate():
+        valid = st.session_state.chain.validate()
+        if valid is None:
+            st.warning("⚠️ Could not reach the provider to check your API key. Please try again shortly.")
+            st.stop()
+        if not valid:
             st.error("❌ Invalid API key or model. Please try again.")
             st.stop()
     else:
@@ -90,6 +116,7 @@ if not st.session_state.bot_intro:
     if proceed == "Yes":
         st.session_state.consent = True
         st.session_state.bot_intro = True
+        st.session_state.interview.set_flags(consent=True, bot_intro=True)
         st.success("Great! Let's start the process.")
     elif proceed == "No":
         st.session_state.consent = False
@@ -100,9 +127,7 @@ else:
     # 🚨 Check if user changed their mind to "No"
     if st.session_state.get("proceed") == "No":
         # Reset intro + clear candidate form/session state
-        for key in ["candidate", "questions", "current_q", "answers"]:
-            if key in st.session_state:
-                del st.session_state[key]
+        st.session_state.interview.reset()
         st.session_state.bot_intro = False
         st.session_state.consent = False
         st.warning("You chose not to proceed. Restart anytime.")
@@ -110,36 +135,54 @@ else:
         
 
 # ---------------- Candidate Form ----------------
+# The form, the skills editor, the question and the evaluation are fragments
+# (st.fragment): editing them reruns only that part, not this script
 if st.session_state.consent:
-    if candidate_form():
+    candidate_form()
+    if st.session_state.pop("questions_requested", False):
+        st.success("✅ Candidate saved!")
         chain = st.session_state.get("chain")
         if chain:
-            candidate = st.session_state.candidate
-            prompt_text = f"""
-Candidate: {candidate}
-
-Generate ONLY 3 to 5 technical interview questions TOTAL.
-Return STRICT JSON ONLY.
-JSON Format:
-{{
-  "questions": [
-    {{"question": "string", "expected_answer_outline": "string"}}
-  ]
-}}
-"""
+            # Questions depend only on the normalized profile (no PII), so they can be shared
+            profile = normalize_profile(st.session_state.interview.candidate.to_dict())
             try:
-                full_response = "".join([c for c in chain.stream(prompt_text)])
-                try:
-                    q_json = json.loads(full_response.strip())
-                except json.JSONDecodeError:
-                    match = re.search(r"\{.*\}", full_response, re.DOTALL)
-                    q_json = json.loads(match.group()) if match else {}
-                st.session_state.questions = q_json.get("questions", [])[:5]
-                if st.session_state.questions:
-                    st.success("✅ Candidate info collected. Let's start the interview!")
+                # Usually already generated while the form was being filled in (ui/candidate_form.py);
+                # otherwise a background job when job workers run (core/jobs.py), else inline: offline
+                # pool first (covers the built-in roles/skills), then the cache, then the LLM,
+                # rendering each generated question as soon as its JSON object closes
+                preview = st.empty()
+                show = lambda qs: preview.markdown("\n".join(f"{i}. {q['question']}" for i, q in enumerate(qs, 1)))
+                with metrics.STAGE_SECONDS.time(stage="questions_after_submit"):
+                    prefetch = st.session_state.interview.take_prefetch()
+                    questions = prefetch.result(profile, on_question=show) if prefetch else None
+                    if questions is None and offload_available(st.session_state.provider, st.session_state.api_key):
+                        job = submit_questions(st.session_state.provider, st.session_state.model_name, profile)
+                        st.session_state.interview.set_flags(questions_job=job.key)  # picked up below
+                    elif questions is None:
+                        questions, _ = questions_for(chain, profile, on_question=show)
+                preview.empty()
+                if questions is not None:
+                    st.session_state.interview.set_questions(questions)
+                    if st.session_state.interview.questions:
+                        st.success("✅ Candidate info collected. Let's start the interview!")
             except Exception as e:
                 st.error(f"Error generating questions: {e}")
 
+# ---------------- Questions from a background job ----------------
+# The job key is checkpointed with the session, so a reload or another app worker finds it
+questions_job = st.session_state.interview.flags.get("questions_job")
+if questions_job:
+    job = get_job_queue().get(questions_job)
+    if job is not None and not job.finished:
+        job_progress(questions_job, "Generating your interview questions")
+    else:
+        st.session_state.interview.set_flags(questions_job=None)
+        if job is not None and job.status == "done":
+            st.session_state.interview.set_questions(job.result["questions"])
+            st.success("✅ Candidate info collected. Let's start the interview!")
+        else:
+            st.error(f"Error generating questions: {job.error if job else 'the job was lost'}")
+
 # ---------------- Interview Flow ----------------
 ask_questions(st.session_state.get("chain"))
 evaluate_answers(st.session_state.get("chain"))
@@ -1,10 +1,10 @@
 import streamlit as st
-from langchain_groq import ChatGroq
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-import os, json, hashlib
+import os, hashlib
 from datetime import datetime
 from dotenv import load_dotenv
+from core.parsing import QuestionSet, Evaluation, ParseError, parse_or_repair, to_dict
+from core.prompts import chat_prompt, question_prompt, evaluation_prompt
+from core.question_bank import normalize_profile
 
 load_dotenv()
 
@@ -37,17 +37,18 @@ def anonymize_candidate(candidate: dict) -> dict:
         "created_at": datetime.utcnow().isoformat()+"Z"
     }
 
+class _RawChain:
+    """Adapts a raw LangChain chain ({"question": ...} input) to the parser's chain.stream(str)"""
+    def __init__(self, chain):
+        self.chain = chain
+
+    def stream(self, question: str):
+        return self.chain.stream({"question": question})
+
 def save_candidate(candidate: dict):
-    records = []
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                records = json.load(f)
-        except Exception:
-            records = []
-    records.append(candidate)
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(records, f, indent=2)
+    # Shares the append-only store with app.py instead of rewriting DATA_FILE
+    from core.storage import get_store
+    get_store().append(candidate)
 
 # -----------------------
 # Streamlit UI
@@ -109,11 +110,10 @@ if submitted:
         @st.cache_resource
         def get_chain(api_key, model_name):
             if not api_key: return None
+            from langchain_groq import ChatGroq  # heavy; only once a key is entered
+            from langchain_core.output_parsers import StrOutputParser
             llm = ChatGroq(groq_api_key=api_key, model_name=model_name, temperature=0.2, streaming=True)
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", "You are TalentScout Assistant. ONLY return valid JSON, no explanations."),
-                ("user", "{question}")
-            ])
+            prompt = chat_prompt()  # shared system prefix
             return prompt | llm | StrOutputParser()
         
         st.session_state.chain = get_chain(api_key, model_name)
@@ -124,36 +124,16 @@ if submitted:
     if not chain:
         st.warning("Enter your Groq API key.")
     else:
-        prompt_text = f"""
-Candidate: {candidate}
-
-Generate ONLY 2 technical interview questions TOTAL.
-Return STRICT JSON ONLY, nothing else.
-JSON Format:
-{{
-  "questions": [
-    {{"question": "string", "expected_answer_outline": "string"}},
-    {{"question": "string", "expected_answer_outline": "string"}}
-  ]
-}}
-"""
+        # Only the normalized profile reaches the model: no PII or profile links
+        prompt_text = question_prompt(normalize_profile(candidate), count=2)
 
         try:
             full_response = "".join([c for c in chain.stream({"question": prompt_text})])
 
-            # Try parsing strictly
-            try:
-                q_json = json.loads(full_response.strip())
-            except json.JSONDecodeError:
-                # Fallback: extract JSON substring if extra text wrapped
-                import re
-                match = re.search(r"\{.*\}", full_response, re.DOTALL)
-                if match:
-                    q_json = json.loads(match.group())
-                else:
-                    raise
-
-            st.session_state.questions = q_json.get("questions", [])[:2]
+            # Brace-balanced parse with one repair call (core/parsing.py)
+            q_set = parse_or_repair(_RawChain(chain), full_response, QuestionSet, kind="questions")
+
+            st.session_state.questions = [to_dict(q) for q in q_set.questions][:2]
             if st.session_state.questions:
                 st.success("✅ Analy user data. Let's start!")
             else:
@@ -186,34 +166,18 @@ if st.session_state.current_q >= 2 and st.session_state.answers:
     if not chain:
         st.warning("LLM chain not initialized. Please enter your API key.")
     else:
-        eval_prompt = f"""
-Evaluate the following answers. Score each (1–10) + give feedback.
-Also return a final average score.
-{json.dumps(st.session_state.answers, indent=2)}
-JSON Format:
-{{
-  "results": [
-    {{"question": "...", "score": 7, "feedback": "..."}}
-  ],
-  "final_average_score": 8
-}}
-"""
+        eval_prompt = evaluation_prompt(st.session_state.answers)
         try:
             # Stream evaluation from LLM
             evaluation_raw = "".join([c for c in chain.stream({"question": eval_prompt})])
 
             # Parse JSON safely
-            import re
             try:
-                evaluation_json = json.loads(evaluation_raw)
-            except json.JSONDecodeError:
-                match = re.search(r"\{.*\}", evaluation_raw, re.DOTALL)
-                if match:
-                    evaluation_json = json.loads(match.group())
-                else:
-                    st.error("Could not parse evaluation JSON")
-                    st.text(evaluation_raw)
-                    evaluation_json = None
+                evaluation_json = to_dict(parse_or_repair(_RawChain(chain), evaluation_raw, Evaluation, kind="evaluation"))
+            except ParseError:
+                st.error("Could not parse evaluation JSON")
+                st.text(evaluation_raw)
+                evaluation_json = None
 
             if evaluation_json:
                 # Display each question's feedback
@@ -0,0 +1,150 @@
+"""
+Candidate query latency: secondary indexes vs a full scan of the store.
+
+    python bench/bench_candidate_index.py --records 1000000 --store jsonl
+
+Writes synthetic records (skills Zipf-ish over ~200 terms, 30 locations,
+10 positions, 0-30 years, ~2% resubmissions) to a temporary store, builds
+the index, then times paged queries of different selectivity (20 results,
+records fetched from the store) and id / email_hash lookups. A full scan
+of the same filter is timed once per query for comparison.
+"""
+import argparse, json, os, random, resource, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.storage import JsonlCandidateStore, SqliteCandidateStore
+from core.candidate_index import CandidateIndex
+
+SKILLS = ["Python", "Java", "JavaScript", "C++", "React", "Node.js", "Django", "SQL", "AWS", "Docker"] + \
+    [f"skill-{i}" for i in range(190)]
+LOCATIONS = [f"City {i}" for i in range(30)]
+POSITIONS = ["Software Engineer", "Data Scientist", "Machine Learning Engineer", "Full Stack Developer",
+             "Backend Developer", "Frontend Developer", "DevOps Engineer", "Cloud Engineer", "QA Engineer",
+             "Product Manager"]
+
+QUERIES = {
+    "skill (common)": dict(skills=["Python"]),
+    "skill (rare)": dict(skills=["skill-150"]),
+    "2 skills + location": dict(skills=["Python", "AWS"], location="City 3"),
+    "skill + position + years 3-5": dict(skills=["SQL"], position="Data Scientist", min_years=3, max_years=5),
+    "location + years >= 20": dict(location="City 7", min_years=20),
+    "rare combo (few matches)": dict(skills=["skill-120", "skill-180"], location="City 29"),
+}
+
+
+def _records(n, seed=7):
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(SKILLS))]
+    for i in range(n):
+        cid = i if i < 1000 or rng.random() > 0.02 else rng.randrange(i)  # some resubmissions
+        yield {
+            "id": f"{cid:016x}", "email_hash": f"{cid * 7 + 1:016x}", "name_hash": f"{i:016x}",
+            "years_exp": rng.randrange(31), "desired_positions": [rng.choice(POSITIONS)],
+            "location": rng.choice(LOCATIONS),
+            "tech_stack": list({s for s in rng.choices(SKILLS, weights, k=rng.randint(1, 5))}),
+            "created_at": "2025-01-01T00:00:00Z",
+        }
+
+
+def _full_scan(store, skills=(), location=None, position=None, min_years=None, max_years=None, limit=20):
+    """What a reader without indexes has to do: scan everything, keep latest per id, filter, page"""
+    latest = {}
+    for record in store:
+        latest.pop(record["id"], None)  # keep dict order = order of the latest submission
+        latest[record["id"]] = record
+    lo, hi = min_years or 0, 10**9 if max_years is None else max_years
+    wanted = {s.lower() for s in skills}
+    out = []
+    for record in reversed(list(latest.values())):
+        if not lo <= record["years_exp"] <= hi:
+            continue
+        if location and record["location"].lower() != location.lower():
+            continue
+        if position and record["desired_positions"][0].lower() != position.lower():
+            continue
+        if not wanted <= {s.lower() for s in record["tech_stack"]}:
+            continue
+        out.append(record)
+        if len(out) == limit:
+            break
+    return out
+
+
+def _pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=1_000_000)
+    ap.add_argument("--store", choices=["jsonl", "sqlite"], default="jsonl")
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--skip-scan", action="store_true", help="don't time the full-scan baseline")
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="talentscout-index-")
+    if args.store == "jsonl":
+        store = JsonlCandidateStore(os.path.join(workdir, "candidates.jsonl"), fsync_batch=10**9)
+    else:
+        store = SqliteCandidateStore(os.path.join(workdir, "candidates.db"))
+    batch = []
+    for record in _records(args.records):
+        batch.append(record)
+        if len(batch) == 10000:
+            store.extend(batch)
+            batch = []
+    store.extend(batch)
+    store.flush()
+
+    rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    index = CandidateIndex(store)
+    t0 = time.perf_counter()
+    index.refresh()
+    build = time.perf_counter() - t0
+    report = {"records": args.records, "store": args.store, "build_s": round(build, 2),
+              "index_max_rss_growth_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - rss0, 1),
+              "stats": index.stats(), "queries": {}}
+
+    for name, q in QUERIES.items():
+        times, pages = [], 0
+        first = index.query(**q)
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            page = index.query(**q)
+            times.append((time.perf_counter() - t0) * 1e3)
+        # Walk a few pages with the cursor
+        cursor, t0 = first["next_cursor"], time.perf_counter()
+        while cursor is not None and pages < 10:
+            cursor = index.query(cursor=cursor, **q)["next_cursor"]
+            pages += 1
+        page_ms = (time.perf_counter() - t0) * 1e3 / max(pages, 1)
+        entry = {"results": len(page["results"]), "p50_ms": round(_pct(times, 50), 3),
+                 "p99_ms": round(_pct(times, 99), 3), "next_page_ms": round(page_ms, 3)}
+        if not args.skip_scan:
+            t0 = time.perf_counter()
+            expected = _full_scan(store, **q)
+            entry["full_scan_ms"] = round((time.perf_counter() - t0) * 1e3, 1)
+            entry["same_results"] = [r["name_hash"] for r in expected] == [r["name_hash"] for r in page["results"]]
+        report["queries"][name] = entry
+
+    rng = random.Random(1)
+    ids = [f"{rng.randrange(args.records):016x}" for _ in range(args.repeat)]
+    times = []
+    for cid in ids:
+        t0 = time.perf_counter()
+        index.get(cid)
+        times.append((time.perf_counter() - t0) * 1e3)
+    report["get_by_id"] = {"p50_ms": round(_pct(times, 50), 3), "p99_ms": round(_pct(times, 99), 3)}
+    times = []
+    for cid in ids:
+        t0 = time.perf_counter()
+        index.by_email_hash(f"{int(cid, 16) * 7 + 1:016x}")
+        times.append((time.perf_counter() - t0) * 1e3)
+    report["get_by_email_hash"] = {"p50_ms": round(_pct(times, 50), 3), "p99_ms": round(_pct(times, 99), 3)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Shared chain pool vs building chains per session / caching them forever.
+
+    python bench/bench_chain_pool.py --sessions 500 --keys 3 --rotations 1000
+
+Chains are real Groq chains (nothing is sent; keys are fake). Scenarios:
+
+    shared     `--sessions` concurrent sessions over `--keys` API keys
+    rotation   `--rotations` short sessions, each with a new key (key rotation,
+               many tenants): the pool stays bounded, an unbounded per-key
+               cache (what st.cache_resource does) keeps every chain
+    idle       every lease released; after the idle TTL nothing is left
+
+Prints one JSON line per scenario with build time, traced memory and pool stats.
+"""
+import argparse, gc, json, os, sys, time, tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODEL = "llama3-8b-8192"
+
+
+def _measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - t0
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"seconds": round(seconds, 3), "memory_mb": round(current / 2**20, 2)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=500)
+    ap.add_argument("--keys", type=int, default=3)
+    ap.add_argument("--rotations", type=int, default=1000)
+    ap.add_argument("--max-idle", type=int, default=32)
+    args = ap.parse_args()
+
+    from core.chain_pool import ChainPool
+    from core.llm_wrapper import LLMWrapper
+    from core.router import get_router
+
+    def build(provider, api_key, model_name):
+        return get_router(LLMWrapper(provider=provider, api_key=api_key, model_name=model_name))
+
+    build("groq", "warm-up", MODEL)  # imports and HTTP clients are not what we measure
+
+    # shared: every session builds its own chain vs leasing from the pool
+    keys = [f"key-{i}" for i in range(args.keys)]
+    with ThreadPoolExecutor(32) as executor:
+        chains, per_session = _measure(lambda: list(executor.map(
+            lambda i: build("groq", keys[i % args.keys], MODEL), range(args.sessions))))
+        del chains
+        pool = ChainPool(max_idle=args.max_idle)
+        leases, pooled = _measure(lambda: list(executor.map(
+            lambda i: pool.lease("groq", keys[i % args.keys], MODEL), range(args.sessions))))
+    print(json.dumps({"scenario": "shared", "sessions": args.sessions, "per_session": per_session,
+                      "pool": pooled, "stats": pool.stats()}))
+    del leases
+
+    # rotation: each short session uses a fresh key
+    def unbounded():
+        cache = {}
+        for i in range(args.rotations):
+            cache.setdefault(f"rotated-{i}", build("groq", f"rotated-{i}", MODEL))
+        return cache
+
+    cache, cached = _measure(unbounded)
+    cached["chains"] = len(cache)
+    del cache
+    pool = ChainPool(max_idle=args.max_idle)
+
+    def rotate():
+        for i in range(args.rotations):
+            lease = pool.lease("groq", f"pooled-{i}", MODEL)
+            del lease  # session ends
+        return pool.stats()
+
+    stats, pooled = _measure(rotate)
+    print(json.dumps({"scenario": "rotation", "sessions": args.rotations, "unbounded_cache": cached,
+                      "pool": pooled, "stats": stats}))
+
+    # idle: released chains go away after the TTL
+    pool = ChainPool(idle_ttl=0.2, max_idle=args.max_idle)
+    leases = [pool.lease("groq", f"idle-{i % args.keys}", MODEL) for i in range(args.sessions)]
+    held = pool.stats()
+    del leases
+    released = pool.stats()
+    time.sleep(0.25)
+    print(json.dumps({"scenario": "idle", "held": held, "released": released, "after_ttl": pool.stats()}))
+
+
+if __name__ == "__main__":
+    main()
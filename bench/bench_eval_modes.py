@@ -0,0 +1,72 @@
+"""
+Time the candidate waits on the final screen: batch vs incremental evaluation.
+
+A fake chain emits tokens at a fixed rate, so output length drives latency
+the same way a real provider does. The candidate spends `--think` seconds per answer.
+
+    python bench/bench_eval_modes.py --questions 5 --think 2
+"""
+import argparse, json, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.evaluator import submit_answer, aggregate_results
+
+
+class FakeChain:
+    def __init__(self, ttft, tokens_per_s, tokens_per_result):
+        self.ttft = ttft
+        self.delay = 1.0 / tokens_per_s
+        self.tokens_per_result = tokens_per_result
+
+    def stream(self, prompt):
+        n_results = max(1, prompt.count('"a":'))
+        time.sleep(self.ttft)
+        yield "{"
+        for _ in range(self.tokens_per_result * n_results):
+            time.sleep(self.delay)
+            yield " "
+        yield '"score": 7, "feedback": "ok"}'
+
+
+def _answers(n):
+    return [{"q": {"question": f"Q{i}", "expected_answer_outline": "..."}, "a": "answer"} for i in range(n)]
+
+
+def batch(chain, answers, think):
+    time.sleep(think * len(answers))
+    t0 = time.perf_counter()
+    "".join(chain.stream(json.dumps(answers)))
+    return time.perf_counter() - t0
+
+
+def incremental(chain, answers, think):
+    futures = []
+    for a in answers:
+        time.sleep(think)
+        futures.append(submit_answer(chain, a))
+    t0 = time.perf_counter()
+    aggregate_results([f.result() for f in futures])
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--questions", type=int, default=5)
+    ap.add_argument("--think", type=float, default=2.0)
+    ap.add_argument("--ttft", type=float, default=0.3)
+    ap.add_argument("--tps", type=float, default=200)
+    ap.add_argument("--tokens", type=int, default=120, help="output tokens per scored answer")
+    args = ap.parse_args()
+
+    chain = FakeChain(args.ttft, args.tps, args.tokens)
+    answers = _answers(args.questions)
+    out = {
+        "batch_wait_s": round(batch(chain, answers, args.think), 3),
+        "incremental_wait_s": round(incremental(chain, answers, args.think), 3),
+    }
+    print(json.dumps(out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Script execution time per interaction: full app reruns vs fragment reruns.
+
+    python bench/bench_fragments.py --repeat 20
+
+Drives app.py through Streamlit's AppTest with the local fake provider. Each
+interaction (typing a name, adding / picking a skill, typing / submitting an
+answer) is timed twice:
+
+    full       the whole script reruns, as every interaction did before the
+               form and interview widgets became fragments
+    fragment   only the fragment owning the widget reruns, as in the browser
+
+AppTest always reruns the whole script, so fragment runs are requested from
+its script runner directly (Streamlit internals; bench only). `--app` points
+at another checkout's app.py to time an older tree's full reruns. Prints JSON
+with p50/p95 milliseconds per interaction: script execution (first script
+start to last stop, reruns included) and the whole AppTest run around it.
+"""
+import argparse, json, logging, os, statistics, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Fragment id the next AppTest run is limited to; widget states the next full run restores
+_scope = {"fragment": None, "restore": None, "exec_s": None}
+
+
+def _patch_runner():
+    from streamlit.testing.v1 import local_script_runner
+    from streamlit.runtime.scriptrunner_utils.script_requests import RerunData, ScriptRequests
+
+    full_run = local_script_runner.LocalScriptRunner.run
+
+    def run(self, widget_state=None, query_params=None, timeout=3, page_hash=""):
+        # Script execution: first SCRIPT_STARTED to the last *STOPPED* event (reruns included)
+        marks = []
+        self.on_event.connect(lambda sender, event, **kwargs: marks.append((event.name, time.perf_counter())),
+                              weak=False)
+        try:
+            if _scope["fragment"] is None:
+                if _scope["restore"] is not None:
+                    widget_state, _scope["restore"] = _scope["restore"], None
+                return full_run(self, widget_state, query_params, timeout, page_hash)
+            # Replace the runner's initial full-run request with a fragment rerun,
+            # which is what the browser sends for a widget inside a fragment
+            self._requests = ScriptRequests()
+            self.request_rerun(RerunData(widget_states=widget_state, page_script_hash=page_hash,
+                                         fragment_id_queue=[_scope["fragment"]]))
+            try:
+                if not self._script_thread:
+                    self.start()
+                local_script_runner.require_widgets_deltas(self, timeout)
+            finally:
+                self.join()
+            return local_script_runner.parse_tree_from_messages(self.forward_msgs())
+        finally:
+            started = [t for name, t in marks if name == "SCRIPT_STARTED"]
+            stopped = [t for name, t in marks if "STOPPED" in name]
+            _scope["exec_s"] = stopped[-1] - started[0] if started and stopped else None
+
+    local_script_runner.LocalScriptRunner.run = run
+
+
+def _fragment_ids(at) -> dict:
+    """Fragment id per decorated function name, from the AppTest's fragment storage"""
+    ids = {}
+    for fragment_id, wrapped in at._fragment_storage._fragments.items():
+        cells = dict(zip(wrapped.__code__.co_freevars, (c.cell_contents for c in wrapped.__closure__ or ())))
+        func = cells.get("non_optional_func")
+        if func is not None:
+            ids[func.__name__] = fragment_id
+    return ids
+
+
+def _ms(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return {"p50": round(1000 * statistics.median(values), 2),
+            "p95": round(1000 * values[int(0.95 * (len(values) - 1))], 2)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    args = ap.parse_args()
+
+    app = os.path.abspath(args.app)
+    os.environ.update({"ENABLE_FAKE_LLM": "1", "FAKE_LLM_TTFT": "0.01", "FAKE_LLM_TPS": "20000",
+                       "EVAL_MODE": "batch", "QUESTION_PREFETCH": "0"})
+    sys.path.insert(0, os.path.dirname(app))
+    os.chdir(tempfile.mkdtemp(prefix="talentscout-fragments-"))
+    logging.disable(logging.WARNING)
+    _patch_runner()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=60)
+    at.run()
+    at.sidebar.selectbox[0].set_value("Fake").run()
+    at.sidebar.text_input[0].input("bench-key").run()
+    at.radio[0].set_value("Yes").run()
+
+    def text(label):
+        return lambda at, n: next(w for w in at.text_input if w.label == label).input(f"Bench Candidate {n}")
+
+    def add_skill(at, n):
+        next(b for b in at.button if b.label == "➕ Add Skill").click()
+
+    def pick_skill(at, n):
+        at.selectbox(key="skill_dropdown_0").set_value(["Python", "Java", "SQL"][n % 3])
+
+    def type_answer(at, n):
+        at.text_area(key=f"ans_{at.session_state.interview.current_q}").input(f"Answer draft {n}")
+
+    def submit_answer(at, n):
+        interview = at.session_state.interview
+        interview.answers.clear()  # rewind to the first question; the last answer would end the interview
+        interview.current_q = 0
+        at.run()
+        at.text_area(key="ans_0").input(f"Answer {n}")
+        at.button(key="submit_0").click()
+
+    report = {"app": app, "repeat": args.repeat, "interactions": {}}
+
+    def measure(name, fragment, action, repeat=args.repeat):
+        fragment_id = _fragment_ids(at).get(fragment)
+        timings = {"full": [], "fragment": []}
+        walls = {"full": [], "fragment": []}
+        for n in range(repeat):
+            for mode in ("full", "fragment"):
+                if mode == "fragment" and fragment_id is None:
+                    continue
+                at.run()  # back to a full tree before the timed interaction
+                # A fragment run returns only the fragment's elements; the next full run would
+                # reset every other widget (sidebar included), so it restores these states
+                states = at._tree.get_widget_states()
+                action(at, 2 * n + (mode == "fragment"))
+                _scope["fragment"] = fragment_id if mode == "fragment" else None
+                t0 = time.perf_counter()
+                try:
+                    at.run()
+                finally:
+                    _scope["fragment"] = None
+                walls[mode].append(time.perf_counter() - t0)
+                timings[mode].append(_scope["exec_s"])
+                if at.exception:
+                    raise RuntimeError(f"{name} ({mode}): {at.exception[0].message}")
+                if mode == "fragment":
+                    _scope["restore"] = states
+        report["interactions"][name] = {
+            "fragment": fragment,
+            "script_ms": {"full": _ms(timings["full"]), "fragment": _ms(timings["fragment"])},
+            "apptest_run_ms": {"full": _ms(walls["full"]), "fragment": _ms(walls["fragment"])},
+        }
+
+    measure("type_name", "candidate_form", text("Full Name"))
+    measure("add_skill", "_skills_editor", add_skill, repeat=min(args.repeat, 10))
+    at.session_state["skills"] = [{"value": "", "type": "none"}]
+    measure("pick_skill", "_skills_editor", pick_skill)
+
+    # Submit the form, then time the interview widgets
+    at.run()  # restores the full tree
+    for label, value in [("Full Name", "Bench Candidate"), ("Email", "bench@example.com"),
+                         ("Phone Number", "9000000000"), ("Current Location", "Pune")]:
+        next(w for w in at.text_input if w.label == label).input(value)
+    next(w for w in at.selectbox if w.label == "Desired Position").set_value("Backend Developer")
+    next(b for b in at.button if b.label == "Save & Start Mini Interview").click().run()
+    questions = len(at.session_state.interview.questions)
+    if not questions:
+        raise RuntimeError(f"no questions after submitting the form: {[e.value for e in at.error]}")
+    measure("type_answer", "ask_questions", type_answer)
+    measure("submit_answer", "ask_questions", submit_answer)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
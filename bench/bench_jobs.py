@@ -0,0 +1,202 @@
+"""
+Background job queue (core/jobs.py): throughput, crash recovery, and the
+app's script time with LLM work inline vs offloaded.
+
+    python bench/bench_jobs.py --jobs 200 --workers 4 --threads 8
+
+Uses the local fake provider; runs in a temporary directory.
+
+- throughput: `--jobs` batch evaluations with distinct answers through 1
+  and `--workers` worker processes; jobs/s and enqueue-to-done latency
+- crash: two worker processes take slow jobs and one is killed (SIGKILL)
+  mid-run; with a short JOB_LEASE its jobs are retried by the other, and
+  every job ends up done exactly once per key
+- app: app.py in AppTest, a custom skill (so no pool/bank hit) and a slow
+  provider. With workers running, the submit run returns while the questions
+  are generated; a second AppTest opened with the page's `?sid=` (a reload)
+  picks up the same job. Without workers (BACKGROUND_JOBS=0) the submit run
+  blocks on the LLM as before.
+
+Prints JSON.
+"""
+import argparse, json, logging, multiprocessing, os, signal, sqlite3, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+
+def _ms(values):
+    values = sorted(values)
+    return {"p50": round(1000 * statistics.median(values), 1),
+            "p95": round(1000 * values[int(0.95 * (len(values) - 1))], 1)}
+
+
+def _answers(n):
+    return [{"q": {"question": f"How would you shard table {n}-{i}?", "expected_answer_outline": "Key, rebalance."},
+             "a": f"By tenant id ({n}-{i})."} for i in range(3)]
+
+
+def _wait_all(queue, keys, timeout=300):
+    """Enqueue-to-finish seconds per job key, from the queue's own timestamps (one query per poll)"""
+    keys, deadline = set(keys), time.time() + timeout
+    conn = sqlite3.connect(queue.path)
+    while time.time() < deadline:
+        rows = conn.execute("SELECT key, updated_at - created_at FROM jobs "
+                            "WHERE status IN ('done', 'failed', 'cancelled')").fetchall()
+        done = {key: seconds for key, seconds in rows if key in keys}
+        if len(done) == len(keys):
+            break
+        time.sleep(0.1)
+    conn.close()
+    return done
+
+
+def _start_workers(ctx, n, threads):
+    from core.jobs import _worker_process
+    procs = [ctx.Process(target=_worker_process, args=(threads,), daemon=True) for _ in range(n)]
+    for p in procs:
+        p.start()
+    return procs
+
+
+def _stop(procs):
+    for p in procs:
+        if p.is_alive():
+            p.terminate()
+        p.join()
+
+
+def bench_throughput(args, ctx):
+    from core.jobs import get_job_queue, submit_evaluation
+    queue = get_job_queue()
+    report = {"cpus": os.cpu_count()}  # fake-provider jobs are CPU-bound: processes scale up to this
+    for workers in sorted({1, args.workers}):
+        procs = _start_workers(ctx, workers, args.threads)
+        while queue.workers_alive() < workers:
+            time.sleep(0.05)
+        t0 = time.perf_counter()
+        submitted = [submit_evaluation("fake", "fake-model", f"throughput-{workers}-{n}", "batch",
+                                       _answers(f"{workers}-{n}")).key for n in range(args.jobs)]
+        done = _wait_all(queue, submitted)
+        elapsed = time.perf_counter() - t0
+        _stop(procs)
+        statuses = [queue.get(key).status for key in submitted]
+        report[f"{workers}_processes"] = {"threads": args.threads, "jobs": args.jobs,
+                                          "done": statuses.count("done"), "seconds": round(elapsed, 2),
+                                          "jobs_per_s": round(len(done) / elapsed, 1),
+                                          "enqueue_to_done_ms": _ms(list(done.values()))}
+    return report
+
+
+def bench_crash(args, ctx):
+    from core.jobs import get_job_queue, submit_evaluation
+    queue = get_job_queue()
+    os.environ.update({"JOB_LEASE": "2", "FAKE_LLM_TTFT": "0.5"})  # read by the spawned workers
+    procs = _start_workers(ctx, 2, 4)
+    while queue.workers_alive() < 2:
+        time.sleep(0.05)
+    submitted = [submit_evaluation("fake", "fake-model", f"crash-{n}", "batch", _answers(f"crash-{n}")).key
+                 for n in range(16)]
+    time.sleep(0.3)  # both workers are mid-call
+    os.kill(procs[0].pid, signal.SIGKILL)
+    t0 = time.perf_counter()
+    done = _wait_all(queue, submitted)
+    _stop(procs)
+    jobs = [queue.get(key) for key in submitted]
+    os.environ.update({"JOB_LEASE": "300", "FAKE_LLM_TTFT": str(args.ttft)})
+    return {"jobs": len(jobs), "done": sum(job.status == "done" for job in jobs),
+            "retried_after_kill": sum(job.attempts > 1 for job in jobs),
+            "recovered_within_s": round(time.perf_counter() - t0, 2), "finished": len(done)}
+
+
+def _drive(mode, token, skill):
+    """One AppTest session; prints how long the submit run took and when questions were shown"""
+    os.environ.update({"ENABLE_FAKE_LLM": "1", "QUESTION_PREFETCH": "0",
+                       "BACKGROUND_JOBS": "0" if mode == "inline" else "1"})
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.WARNING)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    if token:
+        at.query_params["sid"] = token
+    at.run()
+    at.sidebar.selectbox[0].set_value("Fake").run()
+    at.sidebar.text_input[0].input("fake").run()  # the workers' key for the fake provider
+    submit_s = None
+    if not token:
+        at.radio[0].set_value("Yes").run()
+        for label, value in [("Full Name", "Jobs Candidate"), ("Email", "jobs@example.com"),
+                             ("Phone Number", "9000000002"), ("Current Location", "Pune")]:
+            next(w for w in at.text_input if w.label == label).input(value)
+        next(w for w in at.selectbox if w.label == "Desired Position").set_value("Backend Developer")
+        at.text_input(key="skill_custom_0").input(skill)
+        next(b for b in at.button if b.label == "Save & Start Mini Interview").click()
+        t0 = time.perf_counter()
+        at.run()
+        submit_s = time.perf_counter() - t0
+        if mode == "reload":
+            # The page goes away mid-generation; the next process resumes from ?sid=
+            print(json.dumps({"token": at.session_state.interview.token, "submit_run_s": round(submit_s, 3),
+                              "job": at.session_state.interview.flags.get("questions_job")}))
+            return
+    t0 = time.perf_counter()
+    while not at.session_state.interview.questions and time.perf_counter() - t0 < 60:
+        time.sleep(0.1)  # job_progress() reruns every JOB_POLL_INTERVAL in the browser
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    print(json.dumps({"submit_run_s": round(submit_s, 3) if submit_s is not None else None,
+                      "polled_s": round(time.perf_counter() - t0, 3),
+                      "questions": len(at.session_state.interview.questions)}))
+
+
+def bench_app(args, ctx, workdir):
+    def run(mode, token="", skill=""):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--drive", mode, "--token", token,
+                              "--skill", skill], cwd=workdir, env={**os.environ, "PYTHONPATH": ROOT},
+                             capture_output=True, text=True)
+        if out.returncode:
+            raise RuntimeError(out.stderr[-2000:])
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    os.environ["FAKE_LLM_TTFT"] = str(args.app_ttft)
+    report = {"provider_ttft_s": args.app_ttft, "inline": run("inline", skill="inline-skill")}
+    procs = _start_workers(ctx, 1, args.threads)
+    try:
+        report["offloaded"] = run("offload", skill="offload-skill")
+        first = run("reload", skill="reload-skill")
+        report["reload"] = {"first_page": first, "reloaded_page": run("offload", token=first["token"])}
+    finally:
+        _stop(procs)
+        os.environ["FAKE_LLM_TTFT"] = str(args.ttft)
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--ttft", type=float, default=0.2)
+    ap.add_argument("--app-ttft", type=float, default=2.0)
+    ap.add_argument("--drive", choices=["inline", "offload", "reload"], help=argparse.SUPPRESS)
+    ap.add_argument("--token", default="", help=argparse.SUPPRESS)
+    ap.add_argument("--skill", default="", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.drive:
+        _drive(args.drive, args.token, args.skill)
+        return
+    workdir = tempfile.mkdtemp(prefix="talentscout-jobs-")
+    os.environ.update({"ENABLE_FAKE_LLM": "1", "FAKE_LLM_TTFT": str(args.ttft), "FAKE_LLM_TPS": "2000"})
+    sys.path.insert(0, ROOT)
+    os.chdir(workdir)
+    ctx = multiprocessing.get_context("spawn")
+    report = {"throughput": bench_throughput(args, ctx), "crash": bench_crash(args, ctx),
+              "app": bench_app(args, ctx, workdir)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Fuzz and benchmark core/parsing.py against the old greedy regex fallback.
+
+    python bench/bench_parsing.py --fuzz 20000 --seed 1
+    python bench/bench_parsing.py --bench
+
+Fuzzing wraps a valid reply in random prose, stray braces, quotes, code
+fences and truncation. Invariants: no exception other than ParseError
+escapes, and whenever the intact reply is present it is recovered.
+"""
+import argparse, json, os, random, re, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.parsing import QuestionSet, ParseError, parse_structured, json_spans
+
+REPLY = json.dumps({"questions": [
+    {"question": "What does {x} mean in an f-string?", "expected_answer_outline": "Interpolation; \"escapes\" and }} braces."},
+    {"question": "Explain Python's GIL.", "expected_answer_outline": "Mutex around bytecode execution."},
+]})
+NOISE = ["Sure!", "Here's the JSON:", "```json", "```", "{", "}", '"', "'", "{note}", "I hope this helps :}",
+         '{"questions": []}', "\\", "\n", "Let me know if {you} need more.", '{"broken": ']
+
+
+def _regex(raw):
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        match = re.search(r"\{.*\}", raw, re.DOTALL)
+        return json.loads(match.group()) if match else {}
+
+
+def _noisy(rng, intact=True):
+    before = " ".join(rng.choice(NOISE) for _ in range(rng.randint(0, 4)))
+    after = " ".join(rng.choice(NOISE) for _ in range(rng.randint(0, 4)))
+    body = REPLY if intact else REPLY[:rng.randint(0, len(REPLY) - 1)]
+    return f"{before} {body} {after}"
+
+
+def fuzz(n, seed):
+    rng = random.Random(seed)
+    recovered = regex_recovered = failures = 0
+    for i in range(n):
+        intact = rng.random() < 0.8
+        raw = _noisy(rng, intact)
+        try:
+            result = parse_structured(raw, QuestionSet)
+            ok = len(result.questions) == 2
+        except ParseError:
+            ok = False
+        if intact and not ok:
+            failures += 1
+            print(f"FAIL #{i}: {raw!r}")
+        recovered += ok
+        try:
+            regex_recovered += len(_regex(raw).get("questions", [])) == 2
+        except Exception:
+            pass
+    print(json.dumps({"cases": n, "scanner_recovered": recovered, "regex_recovered": regex_recovered,
+                      "invariant_failures": failures}))
+    return failures
+
+
+def bench():
+    sizes = [1_000, 10_000, 100_000, 1_000_000]
+    out = {}
+    for size in sizes:
+        prose = ("The answer is {x}. " * (size // 18))[:size]
+        raw = prose + REPLY + " Hope {this} helps!"
+        t0 = time.perf_counter()
+        parse_structured(raw, QuestionSet)
+        out[size] = round((time.perf_counter() - t0) * 1e3, 3)
+    print(json.dumps({"parse_ms_by_prose_chars": out, "spans_at_1M": len(json_spans(raw))}))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fuzz", type=int, default=0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--bench", action="store_true")
+    args = ap.parse_args()
+    failures = fuzz(args.fuzz, args.seed) if args.fuzz else 0
+    if args.bench or not args.fuzz:
+        bench()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
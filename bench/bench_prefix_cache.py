@@ -0,0 +1,88 @@
+"""
+Static system prefix and the exact-match response cache.
+
+    python bench/bench_prefix_cache.py --calls 200 --unique 50 --ttft 0.2
+
+- prefix: every chain's system message is `core.prompts.SYSTEM_PREFIX`,
+  byte-identical for every prompt kind; reports its tokens against the
+  variable user message, i.e. the share a provider prompt cache can reuse
+- replay: `--calls` answer-scoring prompts drawn from `--unique` distinct
+  ones, through the local fake provider at temperature 0 (cache on) and 0.2
+  (cache off); reports hit rate and latency of hits vs misses
+
+Prints JSON.
+"""
+import argparse, json, os, random, statistics, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _ms(values):
+    values = sorted(values)
+    if not values:
+        return None
+    return {"p50": round(1000 * statistics.median(values), 2),
+            "p95": round(1000 * values[int(0.95 * (len(values) - 1))], 2)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=200)
+    ap.add_argument("--unique", type=int, default=50)
+    ap.add_argument("--ttft", type=float, default=0.2)
+    ap.add_argument("--tps", type=float, default=2000)
+    args = ap.parse_args()
+
+    os.environ["FAKE_LLM_TTFT"], os.environ["FAKE_LLM_TPS"] = str(args.ttft), str(args.tps)
+    sys.path.insert(0, ROOT)
+    os.chdir(tempfile.mkdtemp(prefix="talentscout-prefix-"))  # the result cache lives under ./data
+    from core.prompts import SYSTEM_PREFIX, PREFIX_ID, chat_prompt, count_tokens
+    from core.prompts import question_prompt, answer_prompt, evaluation_prompt
+    from core.llm_wrapper import LLMWrapper
+
+    rng = random.Random(5)
+    answers = [{"q": {"question": f"How would you shard table {i} of a {rng.choice(['SQL', 'Redis'])} store?",
+                      "expected_answer_outline": "Pick a key, rebalance, route reads."},
+                "a": f"By tenant id, with consistent hashing. ({i})"} for i in range(args.unique)]
+    profile = {"position": "Backend Developer", "experience": "3-5", "tech_stack": ["Python", "SQL"]}
+    prompts = {"questions": question_prompt(profile), "answer": answer_prompt(answers[0]),
+               "evaluation": evaluation_prompt(answers[:5])}
+
+    template = chat_prompt()
+    systems = {kind: template.format_messages(question=p)[0].content for kind, p in prompts.items()}
+    prefix_tokens = count_tokens(SYSTEM_PREFIX)
+    report = {"prefix": {
+        "id": PREFIX_ID,
+        "byte_identical": len({s.encode("utf-8") for s in systems.values()}) == 1 and systems["answer"] == SYSTEM_PREFIX,
+        "prefix_tokens": prefix_tokens,
+        "variable_tokens": {kind: count_tokens(p) for kind, p in prompts.items()},
+        "cacheable_share": {kind: round(prefix_tokens / (prefix_tokens + count_tokens(p)), 3)
+                            for kind, p in prompts.items()},
+    }}
+
+    workload = [answer_prompt(rng.choice(answers)) for _ in range(args.calls)]
+    for temperature in (0.2, 0.0):
+        wrapper = LLMWrapper(provider="fake", api_key="fake", model_name="fake-model", temperature=temperature)
+        before = LLMWrapper.response_cache_stats()
+        hits, misses = [], []
+        t0 = time.perf_counter()
+        for prompt in workload:
+            start = time.perf_counter()
+            hit_before = LLMWrapper.response_cache_stats()["hits"]
+            "".join(wrapper.stream(prompt))
+            hit = LLMWrapper.response_cache_stats()["hits"] > hit_before
+            (hits if hit else misses).append(time.perf_counter() - start)
+        after = LLMWrapper.response_cache_stats()
+        lookups = after["hits"] + after["misses"] - before["hits"] - before["misses"]
+        report[f"replay_temperature_{temperature}"] = {
+            "calls": args.calls, "unique": args.unique,
+            "seconds": round(time.perf_counter() - t0, 2),
+            "cache_lookups": lookups,
+            "hit_rate": round((after["hits"] - before["hits"]) / lookups, 3) if lookups else 0.0,
+            "hit_ms": _ms(hits), "miss_ms": _ms(misses),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Local pre-scoring of trivial answers (core/prescore.py): accuracy on a
+labelled set, and LLM calls and time saved per interview.
+
+    python bench/bench_prescore.py --interviews 40 --trivial-share 0.2
+
+- accuracy: hand-labelled trivial answers (blank, "idk", copied questions,
+  one unrelated word) and real ones (full answers, terse answers that name a
+  keyword of the outline); reports how many trivial ones are caught and any
+  real answer scored locally (must be none)
+- interviews: `--interviews` interviews of 5 answers, each trivial with
+  probability `--trivial-share`, scored through the local fake provider in
+  both EVAL_MODEs with pre-scoring off and on; LLM calls, prompt tokens and
+  seconds
+
+Prints JSON.
+"""
+import argparse, json, os, random, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTION = {"question": "How would you reduce p99 latency of a read-heavy Python service?",
+            "expected_answer_outline": "Profile, identify the bottleneck, cache hot reads, add back-pressure, "
+                                       "measure before and after."}
+TRIVIAL = ["", "   ", "idk", "I don't know.", "no idea, sorry", "pass", "skip", "n/a", "?", "...", "no",
+           "Not sure", "I do not know", "How would you reduce p99 latency of a read-heavy Python service?",
+           "reduce p99 latency of a python service", "latency", "Redis", "yes definitely", "asdf"]
+REAL = ["I would profile first with py-spy, find the slow query, then cache hot reads in Redis.",
+        "Caching.", "Add back-pressure and a cache.", "Profile it.", "Use a read replica and measure p99 again.",
+        "Move the hot path to an in-memory LRU cache and benchmark before and after.",
+        "How would I reduce it? Find the bottleneck with a profiler, then cache the hot reads.",
+        "Connection pooling plus async IO so slow calls don't block the workers.",
+        "Kafka queues", "CDN for static reads", "Index the lookup column"]
+
+
+def accuracy():
+    from core.prescore import prescore
+    caught = [a for a in TRIVIAL if prescore({"q": QUESTION, "a": a})]
+    false_positives = [a for a in REAL if prescore({"q": QUESTION, "a": a})]
+    return {"trivial": len(TRIVIAL), "caught": len(caught), "missed": [a for a in TRIVIAL if a not in caught],
+            "real": len(REAL), "false_positives": false_positives}
+
+
+def interviews(args):
+    from core import prescore as prescore_module
+    from core.evaluator import evaluate_batch, score_answer
+    from core.llm_wrapper import LLMWrapper
+    from core.prompts import answer_prompt, evaluation_prompt, count_tokens
+
+    class Counting:
+        """The fake chain, counting calls and prompt tokens"""
+        def __init__(self, chain):
+            self.chain, self.calls, self.tokens = chain, 0, 0
+
+        def stream(self, prompt):
+            self.calls += 1
+            self.tokens += count_tokens(prompt)
+            return self.chain.stream(prompt)
+
+    rng = random.Random(11)
+    sets = []
+    for n in range(args.interviews):
+        sets.append([{"q": {"question": f"{QUESTION['question']} ({n}-{i})",
+                            "expected_answer_outline": QUESTION["expected_answer_outline"]},
+                      "a": rng.choice(TRIVIAL) if rng.random() < args.trivial_share else f"{rng.choice(REAL)} ({n}-{i})"}
+                     for i in range(5)])
+
+    report = {}
+    for mode in ("incremental", "batch"):
+        for enabled in (False, True):
+            prescore_module.PRESCORE = enabled
+            chain = Counting(LLMWrapper(provider="fake", api_key="fake", model_name="fake-model"))
+            t0 = time.perf_counter()
+            for answers in sets:
+                if mode == "incremental":
+                    [score_answer(chain, answer) for answer in answers]
+                else:
+                    evaluate_batch(chain, answers)
+            report.setdefault(mode, {})["prescore_on" if enabled else "prescore_off"] = {
+                "llm_calls": chain.calls, "prompt_tokens": chain.tokens,
+                "seconds": round(time.perf_counter() - t0, 2)}
+        off, on = report[mode]["prescore_off"], report[mode]["prescore_on"]
+        report[mode]["calls_saved"] = off["llm_calls"] - on["llm_calls"]
+        report[mode]["tokens_saved_pct"] = round(100 * (1 - on["prompt_tokens"] / off["prompt_tokens"]), 1)
+    prescore_module.PRESCORE = True
+
+    t0 = time.perf_counter()
+    for answers in sets:
+        for answer in answers:
+            prescore_module.prescore(answer)
+    report["prescore_us_per_answer"] = round(1e6 * (time.perf_counter() - t0) / (5 * len(sets)), 1)
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--interviews", type=int, default=40)
+    ap.add_argument("--trivial-share", type=float, default=0.2)
+    ap.add_argument("--ttft", type=float, default=0.05)
+    args = ap.parse_args()
+
+    os.environ.update({"FAKE_LLM_TTFT": str(args.ttft), "FAKE_LLM_TPS": "2000", "RESPONSE_CACHE": "0"})
+    sys.path.insert(0, ROOT)
+    os.chdir(tempfile.mkdtemp(prefix="talentscout-prescore-"))
+    print(json.dumps({"accuracy": accuracy(), "interviews": {"count": args.interviews,
+                                                             "trivial_share": args.trivial_share, **interviews(args)}},
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Prompt tokens per interview: the previous f-string prompts vs core.prompts.
+
+    python bench/bench_prompts.py --profiles 50 --questions 5
+
+Sample profiles carry contact details, profile links and answers of mixed
+length (some pasted at length). Counts use `core.prompts.count_tokens`
+(tiktoken cl100k_base when installed, the local approximation otherwise).
+Prints JSON: tokens per prompt kind and per interview in both evaluation
+modes.
+"""
+import argparse, json, os, random, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.prompts import count_tokens, question_prompt, answer_prompt, evaluation_prompt, _tiktoken
+from core.question_bank import normalize_profile
+
+SKILLS = ["Python", "Java", "SQL", "AWS", "Docker", "React", "Kubernetes", "Django", "Kafka", "Redis"]
+SENTENCE = ("I would measure first, then add a cache in front of the database, "
+            "invalidate on writes and watch the hit rate and p99 latency. ")
+
+
+# ---- the prompts as they were built before ----
+def legacy_question_prompt(profile):
+    return f"""
+Candidate profile: position={profile['position']}; experience={profile['experience']} years; tech_stack={', '.join(profile['tech_stack'])}
+
+Generate ONLY 3 to 5 technical interview questions TOTAL.
+Return STRICT JSON ONLY.
+JSON Format:
+{{
+  "questions": [
+    {{"question": "string", "expected_answer_outline": "string"}}
+  ]
+}}
+"""
+
+
+def legacy_aqchat_question_prompt(candidate):
+    """aqchat.py sent the raw candidate dict, PII and links included"""
+    return f"""
+Candidate: {candidate}
+
+Generate ONLY 3 to 5 technical interview questions TOTAL.
+Return STRICT JSON ONLY, nothing else.
+JSON Format:
+{{
+  "questions": [
+    {{"question": "string", "expected_answer_outline": "string"}}
+  ]
+}}
+"""
+
+
+def legacy_answer_prompt(answer):
+    return f"""
+Evaluate this interview answer. Score it (1–10) + give feedback.
+Question: {answer["q"].get("question", "")}
+Expected answer outline: {answer["q"].get("expected_answer_outline", "")}
+Answer: {answer["a"]}
+JSON Format:
+{{"score": 7, "feedback": "..."}}
+"""
+
+
+def legacy_evaluation_prompt(answers):
+    return f"""
+Evaluate the following answers. Score each (1–10) + give feedback.
+Also return a final average score.
+{json.dumps(answers, indent=2)}
+JSON Format:
+{{
+  "results": [
+    {{"question": "...", "score": 7, "feedback": "..."}}
+  ],
+  "final_average_score": 8
+}}
+"""
+
+
+def sample(rng, i, n):
+    candidate = {
+        "name": f"Candidate Number {i}", "email": f"candidate.{i}@example.com", "phone": f"98{i:08d}",
+        "years_exp": rng.randrange(0, 12), "desired_positions": [rng.choice(["Backend Developer", "Data Scientist"])],
+        "location": "Pune, Maharashtra", "linkedin": f"https://www.linkedin.com/in/candidate-{i}-a1b2c3/",
+        "github": f"https://github.com/candidate{i}", "preferred_location": "Bengaluru or remote",
+        "tech_stack": rng.sample(SKILLS, rng.randint(2, 6)),
+        "degree": "B.E.", "domain": "Computer Engineering", "cgpa": "8.4", "marks_12th": "88", "marks_10th": "91",
+    }
+    answers = []
+    for q in range(n):
+        length = rng.choice([1, 3, 8, 40])  # sentences; the last is a pasted wall of text
+        answers.append({
+            "q": {"question": f"How would you reduce p99 latency of a read-heavy {rng.choice(SKILLS)} service? ({q})",
+                  "expected_answer_outline": "Profile, identify the bottleneck, cache hot reads, "
+                                             "add back-pressure, measure before and after."},
+            "a": "  \n".join([SENTENCE] * length),
+        })
+    return candidate, answers
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profiles", type=int, default=50)
+    ap.add_argument("--questions", type=int, default=5)
+    args = ap.parse_args()
+
+    rng = random.Random(3)
+    totals = {kind: {"before": 0, "after": 0} for kind in ("questions", "questions_aqchat", "answer", "evaluation")}
+    for i in range(args.profiles):
+        candidate, answers = sample(rng, i, args.questions)
+        profile = normalize_profile(candidate)
+        pairs = [("questions", legacy_question_prompt(profile), question_prompt(profile)),
+                 ("questions_aqchat", legacy_aqchat_question_prompt(candidate), question_prompt(profile, count=2)),
+                 ("evaluation", legacy_evaluation_prompt(answers), evaluation_prompt(answers))]
+        pairs += [("answer", legacy_answer_prompt(a), answer_prompt(a)) for a in answers]
+        for kind, before, after in pairs:
+            totals[kind]["before"] += count_tokens(before)
+            totals[kind]["after"] += count_tokens(after)
+
+    def per_interview(kinds):
+        before = sum(totals[k]["before"] for k in kinds) / args.profiles
+        after = sum(totals[k]["after"] for k in kinds) / args.profiles
+        return {"before": round(before), "after": round(after), "saved_pct": round(100 * (1 - after / before), 1)}
+
+    report = {
+        "tokenizer": "tiktoken cl100k_base" if _tiktoken() else "local approximation",
+        "profiles": args.profiles,
+        "questions": args.questions,
+        "per_prompt": {
+            kind: {"before": round(t["before"] / args.profiles / (args.questions if kind == "answer" else 1)),
+                   "after": round(t["after"] / args.profiles / (args.questions if kind == "answer" else 1))}
+            for kind, t in totals.items()
+        },
+        "per_interview_incremental": per_interview(["questions", "answer"]),
+        "per_interview_batch": per_interview(["questions", "evaluation"]),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
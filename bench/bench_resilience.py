@@ -0,0 +1,182 @@
+"""
+Retry / timeout / hedging checks against a local OpenAI-compatible fake server.
+
+The server streams chat completions (SSE) and misbehaves according to the
+requested model name, so every scenario runs through the real Groq client,
+the shared connection pool, the rate limiter and RetryPolicy:
+
+    ok              normal stream
+    fail-429-N      first N calls return 429, then ok
+    fail-503-N      first N calls return 503, then ok
+    fail-400        always 400 (must not be retried)
+    stall-first-N   first N calls never send a token, then ok
+    stall-mid       sends a few tokens, then stalls
+    tail            every 10th call has a 2s first token, others 50ms
+    slow-S          first token after S seconds
+
+    python bench/bench_resilience.py --requests 100 --concurrency 10
+
+Prints one JSON line per scenario plus a tail-latency comparison with and
+without hedging. Exits non-zero if any scenario behaves unexpectedly.
+"""
+import argparse, asyncio, json, os, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPLY = ["{", '"', "ok", '"', ":", " true", "}"]
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def next_call(self, model) -> int:
+        with self.lock:
+            self.calls[model] = self.calls.get(model, 0) + 1
+            return self.calls[model]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _error(self, code):
+        body = json.dumps({"error": {"message": f"fake {code}", "type": "fake"}}).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("retry-after", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _chunk(self, model, content=None, finish=None):
+        delta = {"role": "assistant", "content": content} if content is not None else {}
+        payload = {"id": "fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                   "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish}]}
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+    def do_POST(self):
+        try:
+            self._respond()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (timeout or hedge loser)
+
+    def _respond(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        model = body.get("model", "ok")
+        call = self.server.next_call(model)
+        parts = model.split("-")
+        if parts[0] == "fail" and (parts[1] == "400" or call <= int(parts[2])):
+            return self._error(int(parts[1]))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        if model.startswith("stall-first") and call <= int(parts[2]):
+            time.sleep(60)
+            return
+        if parts[0] == "slow":
+            time.sleep(float(parts[1]))
+        time.sleep(2.0 if model == "tail" and call % 10 == 0 else 0.05)
+        for i, token in enumerate(REPLY):
+            if model == "stall-mid" and i == 3:
+                time.sleep(60)
+                return
+            self._chunk(model, token)
+        self._chunk(model, finish="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    k = (len(values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=100, help="requests per tail-latency run")
+    ap.add_argument("--concurrency", type=int, default=10)
+    ap.add_argument("--hedge-after", type=float, default=0.3)
+    args = ap.parse_args()
+
+    server = FakeServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.setdefault("GROQ_RPM", "100000")
+    os.environ.setdefault("GROQ_TPM", "100000000")
+    sys.path.insert(0, ROOT)
+    from core import aio, metrics
+    from core.llm_wrapper import LLMWrapper, LLMTimeoutError, RetryPolicy
+
+    fast = dict(timeout=10, first_token_timeout=1.0, idle_timeout=1.0, max_retries=3, backoff_base=0.05)
+
+    def run_one(model, **policy):
+        wrapper = LLMWrapper("groq", "test-key", model, policy=RetryPolicy(**{**fast, **policy}))
+        retries_before = sum(metrics.LLM_RETRIES.value(provider="groq", reason=r)
+                             for r in ("429", "503", "timeout", "connection"))
+        t0 = time.perf_counter()
+        try:
+            text, error = "".join(wrapper.stream("ping")), None
+        except Exception as e:
+            text, error = None, e
+        retries = sum(metrics.LLM_RETRIES.value(provider="groq", reason=r)
+                      for r in ("429", "503", "timeout", "connection")) - retries_before
+        return text, error, retries, time.perf_counter() - t0
+
+    expected = {
+        "ok": (True, 0),
+        "fail-429-2": (True, 2),
+        "fail-503-1": (True, 1),
+        "fail-400": (False, 0),
+        "stall-first-1": (True, 1),
+        "stall-mid": (False, 0),
+    }
+    failures = 0
+    for model, (should_succeed, want_retries) in expected.items():
+        text, error, retries, elapsed = run_one(model)
+        ok = (text == "".join(REPLY)) == should_succeed and retries == want_retries
+        if model == "stall-mid":
+            ok = ok and isinstance(error, LLMTimeoutError) and elapsed < 5
+        failures += not ok
+        print(json.dumps({"scenario": model, "pass": ok, "retries": retries, "seconds": round(elapsed, 3),
+                          "error": type(error).__name__ if error else None}))
+
+    def tail_run(hedge_after):
+        wrapper = LLMWrapper("groq", "test-key", "tail",
+                             policy=RetryPolicy(**{**fast, "first_token_timeout": 5.0},
+                                                hedge_after=hedge_after, hedge_model="ok"))
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(i):
+            async with semaphore:
+                t0 = time.perf_counter()
+                await wrapper._ainvoke("ping", session=i)
+                return time.perf_counter() - t0
+
+        async def run_all():
+            return await asyncio.gather(*[one(i) for i in range(args.requests)])
+
+        latencies = aio.run(run_all())
+        return {"p50_s": round(_percentile(latencies, 50), 3), "p99_s": round(_percentile(latencies, 99), 3),
+                "max_s": round(max(latencies), 3)}
+
+    plain = tail_run(0)
+    hedged = tail_run(args.hedge_after)
+    hedges = {w: metrics.LLM_HEDGES.value(provider="groq", winner=w) for w in ("primary", "hedge")}
+    tail_ok = hedged["p99_s"] < plain["p99_s"]
+    failures += not tail_ok
+    print(json.dumps({"scenario": "tail", "pass": tail_ok, "no_hedge": plain,
+                      f"hedge_after_{args.hedge_after:g}s": hedged, "hedges": hedges}))
+    server.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
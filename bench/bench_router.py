@@ -0,0 +1,81 @@
+"""
+Multi-backend routing and failover against the local fake server from
+bench_resilience (all backends go through the real Groq client).
+
+    python bench/bench_router.py --rpm 120 --requests 150 --concurrency 16
+
+Scenarios, each run with the first backend alone and with the router:
+
+    throttled   first backend always answers 429; router fails over and opens its breaker
+    latency     first backend is slow (0.5s first token); router learns to prefer the fast one
+    quota       two healthy backends with small RPM budgets; router spreads the load
+
+Prints one JSON line per scenario. Exits non-zero if the router does worse.
+"""
+import argparse, asyncio, json, os, sys, threading, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rpm", type=int, default=120, help="per-backend requests per minute")
+    ap.add_argument("--requests", type=int, default=150)
+    ap.add_argument("--concurrency", type=int, default=16)
+    args = ap.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from bench.bench_resilience import FakeServer, REPLY
+
+    server = FakeServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["GROQ_RPM"] = str(args.rpm)
+    os.environ["GROQ_TPM"] = "100000000"
+    os.environ["LLM_MAX_CONCURRENCY"] = str(args.concurrency)
+    os.environ["LLM_MAX_RETRIES"] = "1"
+    os.environ["LLM_BACKOFF_BASE"] = "0.05"
+    from core import aio
+    from core.router import LLMRouter, shared_backend
+
+    def run(llm, n):
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(i):
+            async with semaphore:
+                try:
+                    return await llm._ainvoke("ping", i) == "".join(REPLY)
+                except Exception:
+                    return False
+
+        async def run_all():
+            return await asyncio.gather(*[one(i) for i in range(n)])
+
+        t0 = time.perf_counter()
+        results = aio.run(run_all())
+        wall = time.perf_counter() - t0
+        return {"ok": sum(results), "failed": n - sum(results), "wall_s": round(wall, 3),
+                "throughput_per_s": round(sum(results) / wall, 1)}
+
+    failures = 0
+    scenarios = {
+        "throttled": (["fail-429-1000000", "ok"], 100),
+        "latency": (["slow-0.5", "ok"], 100),
+        "quota": (["ok", "ok2"], args.requests),
+    }
+    for name, (models, n) in scenarios.items():
+        # Distinct keys give each scenario fresh limiters and backend state
+        backends = [shared_backend("groq", m, f"{name}-key") for m in models]
+        single = run(backends[0].wrapper, n)
+        backends = [shared_backend("groq", m, f"{name}-router-key") for m in models]
+        routed = run(LLMRouter(backends), n)
+        better = routed["ok"] >= single["ok"] and routed["throughput_per_s"] >= single["throughput_per_s"]
+        failures += not better
+        print(json.dumps({"scenario": name, "pass": better, "single": single, "router": routed,
+                          "backends": [b.stats() for b in backends]}))
+    server.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Session checkpoints: save/load latency, concurrent worker processes, and an
+interview resumed by another process.
+
+    python bench/bench_session_store.py --saves 500 --processes 4
+
+- checkpoint: `--saves` checkpoints of a mid-interview session (candidate,
+  5 questions, 3 answers) per backend (memory, sqlite); save and load
+  p50/p99 milliseconds and state size
+- writers: `--processes` processes share one SQLite file and repeatedly
+  load, bump and save the same sessions, as workers behind a load balancer
+  would; every save either lands or is rejected as a conflict, so the stored
+  versions must add up to the saves that landed (no lost updates)
+- resume: one process drives app.py (AppTest, fake provider) through the form
+  and the first answer, then exits; a second process opens the app with that
+  `?sid=` token, continues at question 2 and finishes the interview
+
+Runs in a temporary directory. Prints JSON.
+"""
+import argparse, json, logging, multiprocessing, os, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+
+def _ms(values):
+    values = sorted(values)
+    return {"p50": round(1000 * statistics.median(values), 3),
+            "p99": round(1000 * values[int(0.99 * (len(values) - 1))], 3)}
+
+
+def _sample_state(n: int) -> dict:
+    from core.session import Answer, Candidate, InterviewQuestion, InterviewSession
+    session = InterviewSession()
+    session.candidate = Candidate.from_dict({
+        "name": f"Bench Candidate {n}", "email": f"bench{n}@example.com", "phone": "9000000000",
+        "years_exp": 4, "desired_positions": ["Backend Developer"], "location": "Pune",
+        "tech_stack": ["Python", "SQL", "Docker"],
+    })
+    session.questions = tuple(InterviewQuestion.from_dict({"question": f"How would you shard table {q}?",
+                                                           "expected_answer_outline": "Key, rebalance, route."})
+                              for q in range(5))
+    session.answers = [Answer(q, "By tenant id with consistent hashing, then measure p99. " * 4)
+                       for q in session.questions[:3]]
+    session.current_q = 3
+    return session.to_state()
+
+
+def bench_checkpoint(args, workdir):
+    from core.session_store import MemorySessionStore, SqliteSessionStore
+    state = _sample_state(0)
+    report = {"state_bytes": len(json.dumps(state, separators=(",", ":")))}
+    for name, store in [("memory", MemorySessionStore()),
+                        ("sqlite", SqliteSessionStore(os.path.join(workdir, "checkpoint.db")))]:
+        saves, loads = [], []
+        for version in range(1, args.saves + 1):
+            t0 = time.perf_counter()
+            store.save(f"token-{version % 50}", version, state)
+            saves.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            store.load(f"token-{version % 50}")
+            loads.append(time.perf_counter() - t0)
+        store.close()
+        report[name] = {"save_ms": _ms(saves), "load_ms": _ms(loads)}
+    return report
+
+
+def _writer(path, tokens, rounds, results):
+    sys.path.insert(0, ROOT)
+    from core.session_store import SqliteSessionStore
+    store = SqliteSessionStore(path)
+    state = {"answers": ["x" * 200] * 3, "current_q": 3}
+    landed = {token: 0 for token in tokens}
+    conflicts = 0
+    for _ in range(rounds):
+        for token in tokens:
+            entry = store.load(token)
+            version = entry[0] + 1 if entry else 1
+            if store.save(token, version, state):
+                landed[token] += 1
+            else:
+                conflicts += 1
+    store.close()
+    results.put((landed, conflicts))
+
+
+def bench_writers(args, workdir):
+    from core.session_store import SqliteSessionStore
+    path = os.path.join(workdir, "writers.db")
+    SqliteSessionStore(path).close()  # create the schema once, before the race
+    tokens = [f"shared-{i}" for i in range(args.sessions)]
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_writer, args=(path, tokens, args.rounds, results)) for _ in range(args.processes)]
+    t0 = time.perf_counter()
+    for p in procs:
+        p.start()
+    outcomes = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+
+    landed = sum(sum(counts.values()) for counts, _ in outcomes)
+    store = SqliteSessionStore(path)
+    stored = sum(store.load(token)[0] for token in tokens)
+    store.close()
+    attempts = args.processes * args.sessions * args.rounds
+    return {"processes": args.processes, "sessions": args.sessions, "attempts": attempts,
+            "landed": landed, "conflicts": sum(c for _, c in outcomes),
+            "stored_versions": stored, "lost_updates": landed - stored,
+            "saves_per_s": round(attempts / elapsed)}
+
+
+def _drive(role, token):
+    """One worker process's share of the interview; prints JSON about where it got"""
+    os.environ.update({"ENABLE_FAKE_LLM": "1", "FAKE_LLM_TTFT": "0.01", "FAKE_LLM_TPS": "20000",
+                       "SESSION_STORE": "sqlite", "QUESTION_PREFETCH": "0"})
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.WARNING)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    if token:
+        at.query_params["sid"] = token
+    at.run()
+    at.sidebar.selectbox[0].set_value("Fake").run()
+    at.sidebar.text_input[0].input("bench-key").run()
+    if role == "first":
+        at.radio[0].set_value("Yes").run()
+        for label, value in [("Full Name", "Resume Candidate"), ("Email", "resume@example.com"),
+                             ("Phone Number", "9000000001"), ("Current Location", "Pune")]:
+            next(w for w in at.text_input if w.label == label).input(value)
+        next(w for w in at.selectbox if w.label == "Desired Position").set_value("Backend Developer")
+        at.selectbox(key="skill_dropdown_0").set_value("Python")
+        next(b for b in at.button if b.label == "Save & Start Mini Interview").click().run()
+        answers = 1
+    else:
+        answers = len(at.session_state.interview.questions)
+    interview = at.session_state.interview
+    # Read before answering: archiving the finished interview frees the candidate and questions
+    started_at, questions = interview.current_q, len(interview.questions)
+    candidate = interview.candidate.name if interview.candidate else None
+    submitted = 0
+    while submitted < answers and interview.current_q < questions and not interview.archived:
+        q = interview.current_q
+        at.text_area(key=f"ans_{q}").input(f"Answer {q}: I would profile first, then cache.")
+        at.button(key=f"submit_{q}").click().run()
+        submitted += 1
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    print(json.dumps({"token": interview.token, "pid": os.getpid(), "started_at_question": started_at,
+                      "submitted": submitted, "questions": questions, "candidate": candidate,
+                      "archived": interview.archived,
+                      "evaluated": bool(interview.evaluation and interview.evaluation.get("result"))}))
+
+
+def bench_resume(workdir):
+    def run(role, token=""):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--drive", role, "--token", token],
+                             cwd=workdir, env={**os.environ, "PYTHONPATH": ROOT}, capture_output=True, text=True)
+        if out.returncode:
+            raise RuntimeError(out.stderr[-2000:])
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    first = run("first")
+    second = run("second", first["token"])
+    return {"first_process": first, "second_process": second,
+            "resumed": second["pid"] != first["pid"] and second["started_at_question"] == first["submitted"]
+                       and second["candidate"] == first["candidate"] and second["evaluated"]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--saves", type=int, default=500)
+    ap.add_argument("--processes", type=int, default=4)
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--rounds", type=int, default=50)
+    ap.add_argument("--drive", choices=["first", "second"], help=argparse.SUPPRESS)
+    ap.add_argument("--token", default="", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.drive:
+        _drive(args.drive, args.token)
+        return
+    workdir = tempfile.mkdtemp(prefix="talentscout-sessions-")
+    sys.path.insert(0, ROOT)
+    os.chdir(workdir)
+    report = {"checkpoint": bench_checkpoint(args, workdir),
+              "writers": bench_writers(args, workdir),
+              "resume": bench_resume(workdir)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Memory of interview sessions: the old loose `st.session_state` keys vs the
+compact `InterviewSession`, before and after finished interviews are
+offloaded and idle ones are reaped.
+
+    python bench/bench_sessions.py --sessions 1000 --questions 5
+
+Each simulated session holds a submitted candidate, parsed questions, the
+answers and their background scores, and the final evaluation. The content
+is the same in every layout. Memory is traced with tracemalloc. Prints JSON.
+"""
+import argparse, gc, json, os, sys, tempfile, time, tracemalloc
+from concurrent.futures import Future
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTION = '{"question": "Q%d: How would you design and scale a %s service for %d users?", ' \
+           '"expected_answer_outline": "%s"}'
+OUTLINE = "Discuss data model, caching, horizontal scaling, failure handling and observability. " * 3
+ANSWER = "I would start from the access pattern, profile first, then add a cache in front of the store. " * 4
+FEEDBACK = "Solid structure; mention back-pressure and how you would measure the cache hit rate. " * 2
+
+
+def _candidate(i):
+    return {
+        "name": f"Candidate {i}", "email": f"candidate{i}@example.com", "phone": f"90000{i:05d}",
+        "years_exp": 3, "desired_positions": ["Backend Developer"], "location": "Pune",
+        "linkedin": f"https://linkedin.com/in/c{i}", "github": f"https://github.com/c{i}",
+        "preferred_location": "Remote", "tech_stack": ["Python", "SQL", "AWS"],
+        "last_company": "Acme", "years_in_company": 2, "position_in_company": "Engineer",
+    }
+
+
+def _questions(i, n):
+    # Parsed fresh per session, as from the LLM or the question bank
+    return [json.loads(QUESTION % (q, "Python", i, OUTLINE)) for q in range(n)]
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def _evaluation(answers):
+    results = [{"question": a["q"]["question"], "score": 7, "feedback": FEEDBACK} for a in answers]
+    return {"key": "0" * 64, "result": {"results": results, "final_average_score": 7.0}}
+
+
+def legacy_session(i, n) -> dict:
+    """What app.py kept per session before: loose keys, dicts everywhere"""
+    state = {"messages": [], "candidate": _candidate(i), "questions": _questions(i, n), "current_q": n}
+    state["answers"] = [{"q": q, "a": ANSWER + str(i)} for q in state["questions"]]
+    state["answer_evals"] = [_done(r) for r in _evaluation(state["answers"])["result"]["results"]]
+    state["evaluation"] = _evaluation(state["answers"])
+    return state
+
+
+def compact_session(registry, i, n, finish=True):
+    from core.session import Candidate
+
+    session = registry.new_session()
+    session.start(Candidate.from_dict(_candidate(i)))
+    session.set_questions(_questions(i, n))
+    for _ in range(n if finish else n - 1):
+        session.record_answer(ANSWER + str(i))
+    answers = session.answer_dicts()
+    session.answer_evals = [_done(r) for r in _evaluation(answers)["result"]["results"]]
+    if finish:
+        session.evaluation = _evaluation(answers)
+    return session
+
+
+def _traced(fn):
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=1000)
+    ap.add_argument("--questions", type=int, default=5)
+    args = ap.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(tempfile.mkdtemp(prefix="talentscout-sessions-"))  # the store writes under ./data
+    from core.session import SessionRegistry
+    from core.storage import get_store
+
+    n, count = args.questions, args.sessions
+    mb = lambda b: round(b / 2**20, 2)
+    report = {"sessions": count, "questions": n}
+
+    legacy, used = _traced(lambda: [legacy_session(i, n) for i in range(count)])
+    report["legacy_mb"] = mb(used)
+    del legacy
+
+    registry = SessionRegistry(idle_ttl=0.05, interval=0)
+    sessions, used = _traced(lambda: [compact_session(registry, i, n) for i in range(count)])
+    report["compact_mb"] = mb(used)
+    report["compact_accounted_per_session_b"] = registry.stats()["bytes_per_session"]
+
+    t0 = time.perf_counter()
+    for session in sessions:
+        session.archive()
+    report["archive_s"] = round(time.perf_counter() - t0, 3)
+    del sessions
+
+    # Same again, measuring what stays alive after archive()
+    def archived():
+        kept = [compact_session(registry, i, n) for i in range(count)]
+        for session in kept:
+            session.archive()
+        return kept
+
+    kept, used = _traced(archived)
+    report["archived_mb"] = mb(used)
+    report["archived_accounted_per_session_b"] = round(sum(s.nbytes() for s in kept) / count)
+    report["store_records"] = len(get_store())
+    del kept
+
+    # idle: half-finished interviews nobody comes back to
+    idle, used = _traced(lambda: [compact_session(registry, i, n, finish=False) for i in range(count)])
+    report["idle_unfinished_mb"] = mb(used)
+    time.sleep(0.06)
+    t0 = time.perf_counter()
+    report["reaped"] = registry.reap()
+    report["reap_s"] = round(time.perf_counter() - t0, 3)
+    gc.collect()
+    report["idle_after_reap_accounted_per_session_b"] = round(sum(s.nbytes() for s in idle) / count)
+    report["registry"] = registry.stats()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
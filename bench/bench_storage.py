@@ -0,0 +1,69 @@
+"""
+Per-insert cost of the candidate store backends vs the legacy full-file rewrite.
+
+    python bench/bench_storage.py --records 100000
+"""
+import argparse, json, os, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.storage import JsonlCandidateStore, SqliteCandidateStore
+
+
+def _record(i):
+    return {
+        "id": f"{i:016x}", "email_hash": f"{i * 7:016x}", "years_exp": i % 15,
+        "desired_positions": ["Backend Developer"], "location": "Pune",
+        "tech_stack": ["Python", "SQL"], "created_at": "2025-01-01T00:00:00Z",
+    }
+
+
+def _legacy_save(path, record):
+    records = []
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+    records.append(record)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+
+
+def _measure(insert, n, window=1000):
+    """Mean per-insert latency (µs) for each `window` records"""
+    out, t0 = [], time.perf_counter()
+    for i in range(n):
+        insert(_record(i))
+        if (i + 1) % window == 0:
+            t1 = time.perf_counter()
+            out.append((i + 1, (t1 - t0) / window * 1e6))
+            t0 = t1
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=100_000)
+    ap.add_argument("--legacy-records", type=int, default=2_000)
+    args = ap.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = JsonlCandidateStore(os.path.join(tmp, "c.jsonl"))
+        results["jsonl"] = _measure(jsonl.append, args.records)
+        jsonl.close()
+
+        sqlite = SqliteCandidateStore(os.path.join(tmp, "c.db"))
+        results["sqlite"] = _measure(sqlite.append, args.records)
+        sqlite.close()
+
+        legacy = os.path.join(tmp, "c.json")
+        results["legacy_json"] = _measure(lambda r: _legacy_save(legacy, r), args.legacy_records, window=250)
+
+    for name, series in results.items():
+        first, last = series[0][1], series[-1][1]
+        print(f"{name:12s} first={first:9.1f}µs  last={last:9.1f}µs  at n={series[-1][0]}")
+    print(json.dumps({k: v[-1][1] for k, v in results.items()}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Time to first question: incremental item parsing vs join-then-json.loads.
+
+Replays a realistic 5-question response through a fake token stream.
+
+    python bench/bench_ttfq.py --tps 250
+"""
+import argparse, json, os, re, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.json_stream import stream_json_items
+
+RESPONSE = json.dumps({"questions": [
+    {"question": f"Question {i}: explain how you would design and scale component {i}.",
+     "expected_answer_outline": "Discuss trade-offs, data model, caching, failure modes and monitoring. " * 2}
+    for i in range(1, 6)
+]}, indent=2)
+
+
+def fake_stream(text, tps):
+    delay = 1.0 / tps
+    for token in re.findall(r"\s+|\w+|[^\w\s]", text):
+        time.sleep(delay)
+        yield token
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tps", type=float, default=250, help="tokens per second")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    json.loads("".join(fake_stream(RESPONSE, args.tps)))
+    joined = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    first = None
+    for _ in stream_json_items(fake_stream(RESPONSE, args.tps)):
+        if first is None:
+            first = time.perf_counter() - t0
+    total = time.perf_counter() - t0
+
+    print(json.dumps({
+        "joined_first_question_s": round(joined, 3),
+        "streamed_first_question_s": round(first, 3),
+        "streamed_total_s": round(total, 3),
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Import-time budget for the Streamlit entry point.
+
+    python bench/check_importtime.py --budget-ms 100
+
+Imports the modules `app.py` imports at the top, in a fresh interpreter
+under `python -X importtime`, and checks that
+
+- none of the LLM dependencies (LangChain, provider SDKs) are loaded: they
+  are imported when the first chain is built, or by `warm_up()` once an API
+  key is typed
+- the project's own modules, with whatever they pull in beyond streamlit,
+  stay within `--budget-ms` (best of `--runs`)
+
+Prints a JSON report and exits non-zero on a violation.
+"""
+import argparse, ast, json, os, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN = ("langchain", "langchain_core", "langchain_groq", "langchain_openai", "groq", "openai")
+
+
+def app_imports(path=os.path.join(ROOT, "app.py")) -> list:
+    """Top-level modules imported at module level of app.py, in order"""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def measure(modules) -> dict:
+    """module -> (self_us, cumulative_us) from one `-X importtime` run"""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[12:]:
+            continue
+        self_us, cumulative, name = line[12:].split("|", 2)
+        if self_us.strip().isdigit():
+            timings[name.strip()] = (int(self_us), int(cumulative), len(name) - len(name.lstrip()))
+    return timings
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget-ms", type=float, default=100.0, help="for the project's own modules")
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    modules = app_imports()
+    own = {m.split(".")[0] for m in modules} - {"streamlit"}
+    best = None
+    for _ in range(args.runs):
+        timings = measure(modules)
+        # Depth-1 entries are what each `import` statement added on top of the ones before it
+        top = {name: cumulative for name, (_, cumulative, depth) in timings.items() if depth == 1}
+        own_ms = sum(us for name, us in top.items() if name.split(".")[0] in own) / 1e3
+        if best is None or own_ms < best[0]:
+            best = (own_ms, top, timings)
+
+    own_ms, top, timings = best
+    forbidden = sorted(name for name in timings if name.split(".")[0] in FORBIDDEN)
+    report = {
+        "modules": modules,
+        "own_ms": round(own_ms, 1),
+        "budget_ms": args.budget_ms,
+        "total_ms": round(sum(top.values()) / 1e3, 1),
+        "slowest": {name: round(us / 1e3, 1) for name, us in sorted(top.items(), key=lambda kv: -kv[1])[:8]},
+        "forbidden_loaded": forbidden[:20],
+    }
+    report["pass"] = not forbidden and own_ms <= args.budget_ms
+    print(json.dumps(report, indent=2))
+    return 0 if report["pass"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
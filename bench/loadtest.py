@@ -0,0 +1,194 @@
+"""
+Headless load test: N simulated candidates drive the full app through
+Streamlit's AppTest against the local fake provider. No network needed.
+
+    python bench/loadtest.py --candidates 20 --concurrency 10 --ttft 0.2 --tps 200 > result.json
+
+Reports p50/p95/p99 latency per stage, throughput and RSS as JSON on stdout.
+Runs in a temporary working directory so data/ in the repo is untouched.
+"""
+import argparse, json, logging, os, resource, sys, tempfile, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+STAGES = ["connect", "consent", "submit_form", "answer", "evaluation"]
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def run_candidate(i, args, timings, lock, retries):
+    from streamlit.testing.v1 import AppTest
+
+    def timed(stage, at, action=None, ready=None):
+        """
+        Apply `action` (widget input), run and record the stage. AppTest is not
+        thread-safe: under concurrency a run occasionally drops a click or
+        returns a stale tree. When the widget is missing or `ready` says the run
+        didn't take, the action is replayed (the extra time counts toward the
+        stage) and counted in `harness_retries`.
+        """
+        t0 = time.perf_counter()
+        for attempt in range(5):
+            if attempt:
+                with lock:
+                    retries[stage] = retries.get(stage, 0) + 1
+            try:
+                if action:
+                    action(at)
+            except (LookupError, StopIteration):
+                at.run()
+                continue
+            at.run()
+            if ready is None or ready(at):
+                break
+        elapsed = time.perf_counter() - t0
+        if at.exception:
+            raise RuntimeError(f"{stage}: {at.exception[0].message}")
+        if ready is not None and not ready(at):
+            raise RuntimeError(f"{stage}: app did not reach the expected state")
+        with lock:
+            timings[stage].append(elapsed)
+
+    def shows(key):
+        return lambda at: any(w.key == key for w in at.text_area)
+
+    at = AppTest.from_file(APP, default_timeout=args.timeout)
+    at.run()
+    at.sidebar.selectbox[0].set_value("Fake").run()  # provider change relabels the key input
+    timed("connect", at, lambda at: at.sidebar.text_input[0].input(f"bench-key-{i % args.keys}"),
+          ready=lambda at: len(at.radio) > 0)
+    timed("consent", at, lambda at: at.radio[0].set_value("Yes"),
+          ready=lambda at: any(w.label == "Full Name" for w in at.text_input))
+
+    # Vary profiles so the question bank sees a realistic mix of hits and misses
+    skills = ["Python", "Java", "SQL", "AWS", "Docker", "React"]
+
+    def fill_profile(at):
+        # Position and skill come first in the form; questions can start generating from here
+        next(w for w in at.selectbox if w.label == "Desired Position").set_value(
+            ["Backend Developer", "Data Scientist", "DevOps Engineer"][i % 3])
+        if args.cold:
+            at.text_input(key="skill_custom_0").input(f"bench-skill-{i}")
+        else:
+            at.selectbox(key="skill_dropdown_0").set_value(skills[i % len(skills)])
+
+    def fill_and_submit(at):
+        fill_profile(at)  # unchanged values; replays if the first run was dropped
+        for label, value in [("Full Name", f"Bench Candidate {i}"), ("Email", f"bench{i}@example.com"),
+                             ("Phone Number", f"90000{i:05d}"), ("Current Location", "Pune")]:
+            next(w for w in at.text_input if w.label == label).input(value)
+        next(b for b in at.button if b.label == "Save & Start Mini Interview").click()
+
+    fill_profile(at)
+    at.run()
+    time.sleep(args.fill_time)  # the rest of the form
+    timed("submit_form", at, fill_and_submit, ready=shows("ans_0"))
+
+    questions = at.session_state.interview.questions
+    if not questions:
+        raise RuntimeError("submit_form: no questions generated")
+
+    def answer(q):
+        def action(at):
+            at.text_area(key=f"ans_{q}").input(f"Answer {q} from candidate {i}: I would profile first, then cache.")
+            at.button(key=f"submit_{q}").click()
+        return action
+
+    for q in range(len(questions)):
+        time.sleep(args.think)
+        # Includes the st.rerun() into the next question; the last answer archives the session
+        timed("answer", at, answer(q),
+              ready=lambda at, q=q: at.session_state.interview.current_q > q or at.session_state.interview.archived)
+
+    timed("evaluation", at, ready=lambda at: at.session_state.interview.archived)
+    if not at.session_state.interview.archived or not at.session_state.interview.evaluation.get("result"):
+        raise RuntimeError("evaluation: no result")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--candidates", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=10)
+    ap.add_argument("--ttft", type=float, default=0.2, help="fake provider time to first token (s)")
+    ap.add_argument("--tps", type=float, default=200, help="fake provider tokens per second")
+    ap.add_argument("--think", type=float, default=0.0, help="seconds a candidate spends per answer")
+    ap.add_argument("--fill-time", type=float, default=0.0,
+                    help="seconds between choosing position/skills and submitting the form")
+    ap.add_argument("--keys", type=int, default=1, help="distinct API keys across candidates")
+    ap.add_argument("--cold", action="store_true", help="custom skill per candidate: no question cache hits")
+    ap.add_argument("--timeout", type=float, default=120)
+    args = ap.parse_args()
+
+    os.environ.update({
+        "ENABLE_FAKE_LLM": "1",
+        "FAKE_LLM_TTFT": str(args.ttft),
+        "FAKE_LLM_TPS": str(args.tps),
+    })
+    sys.path.insert(0, ROOT)
+    workdir = tempfile.mkdtemp(prefix="talentscout-bench-")
+    os.chdir(workdir)
+    logging.disable(logging.WARNING)
+
+    timings = {stage: [] for stage in STAGES}
+    lock = threading.Lock()
+    errors = []
+    retries = {}
+    rss_start = _rss_mb()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [pool.submit(run_candidate, i, args, timings, lock, retries) for i in range(args.candidates)]
+        for f in futures:
+            try:
+                f.result()
+            except Exception as e:
+                errors.append(str(e))
+    wall = time.perf_counter() - t0
+    completed = args.candidates - len(errors)
+
+    report = {
+        "config": vars(args),
+        "wall_s": round(wall, 3),
+        "completed": completed,
+        "errors": errors[:10],
+        "error_count": len(errors),
+        "harness_retries": retries,
+        "throughput_interviews_per_s": round(completed / wall, 3) if wall else None,
+        "rss_start_mb": rss_start,
+        "rss_end_mb": _rss_mb(),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stages": {
+            stage: {
+                "count": len(values),
+                "p50_s": _percentile(values, 50),
+                "p95_s": _percentile(values, 95),
+                "p99_s": _percentile(values, 99),
+            }
+            for stage, values in timings.items()
+        },
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
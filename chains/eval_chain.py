@@ -1,13 +1,13 @@
 # Uses same structure as question_chain, but for evaluation
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+from core.config import LLM_TEMPERATURE
+
 
 def get_eval_chain(api_key, model_name):
     if not api_key: return None
-    llm = ChatGroq(groq_api_key=api_key, model_name=model_name, temperature=0.2, streaming=True)
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are an interviewer evaluator. ONLY return valid JSON, no explanations."),
-        ("user", "{question}")
-    ])
+    # Imported on first use: LangChain is too heavy to load at app startup
+    from langchain_groq import ChatGroq
+    from langchain_core.output_parsers import StrOutputParser
+    from core.prompts import chat_prompt
+    llm = ChatGroq(groq_api_key=api_key, model_name=model_name, temperature=LLM_TEMPERATURE, streaming=True)
+    prompt = chat_prompt()  # shared system prefix
     return prompt | llm | StrOutputParser()
@@ -0,0 +1,39 @@
+import asyncio, threading
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Process-wide event loop running in a daemon thread. All async LLM I/O runs
+    here, so pooled async HTTP clients and rate limiters stay bound to one loop
+    no matter which Streamlit thread (or caller loop) issued the request.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def submit(coro):
+    """Schedule `coro` on the shared loop; returns a concurrent.futures.Future"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run(coro, timeout=None):
+    """Run `coro` on the shared loop and block until it finishes"""
+    return submit(coro).result(timeout)
+
+
+async def call(coro):
+    """Await `coro` on the shared loop from any other event loop"""
+    try:
+        if asyncio.get_running_loop() is get_loop():
+            return await coro
+    except RuntimeError:
+        pass
+    return await asyncio.wrap_future(submit(coro))
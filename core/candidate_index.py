@@ -0,0 +1,272 @@
+"""
+In-memory secondary indexes over the candidate store for recruiter search
+and dashboards.
+
+    index = get_candidate_index()
+    page = index.query(skills=["python"], location="pune", min_years=3, limit=20)
+    more = index.query(skills=["python"], location="pune", min_years=3, cursor=page["next_cursor"])
+
+- inverted index: skill / position / location -> sorted doc ids, plus
+  skill x location and skill x position pair postings so combined filters
+  start from a small candidate list
+- range index: years_exp -> doc ids per year (bucketed; experience is small)
+- hash lookup: `id` and `email_hash` -> latest doc
+
+Doc ids are positions in append order; only the latest record per candidate
+`id` is live. Records themselves stay in the store and are fetched by
+locator (byte offset or seq) for the returned page only. The index catches
+up with new appends incrementally on each query.
+"""
+import heapq, threading, time
+from array import array
+from bisect import bisect_left
+from .storage import get_store
+
+
+def _norm(value) -> str:
+    return str(value or "").strip().lower()
+
+
+def _hash_key(value):
+    """16-hex ids/hashes as ints: far smaller than str keys at 1M records"""
+    try:
+        return int(value, 16)
+    except (TypeError, ValueError):
+        return value
+
+
+class _Terms:
+    """Term -> sorted array of doc ids, plus a per-doc term code for O(1) filtering"""
+    def __init__(self):
+        self.codes = {}  # term -> code
+        self.postings = []  # code -> array('I')
+        self.by_doc = array("I")  # doc -> code + 1 (0 = none)
+
+    def add(self, doc, term):
+        code = self.codes.get(term)
+        if code is None and term:
+            code = self.codes[term] = len(self.postings)
+            self.postings.append(array("I"))
+        if code is None:
+            self.by_doc.append(0)
+            return
+        self.postings[code].append(doc)
+        self.by_doc.append(code + 1)
+
+    def code(self, term):
+        return self.codes.get(_norm(term))
+
+
+class CandidateIndex:
+    def __init__(self, store=None):
+        self.store = store or get_store()
+        self._lock = threading.Lock()
+        self._resume = 0
+        self.locators = array("Q")
+        self.live = bytearray()
+        self.years = array("H")
+        self.by_years = {}  # years -> array('I')
+        self.locations = _Terms()
+        self.positions = _Terms()
+        self.skills = {}  # skill -> array('I')
+        self.skill_codes = {}  # skill -> code
+        self.doc_skills = array("I")  # codes of each doc's skills, CSR-style ...
+        self.doc_skill_offsets = array("Q", [0])  # ... doc d owns [offsets[d], offsets[d + 1])
+        self.pairs = {}  # (skill, "location"|"position", term) -> array('I')
+        self.ids = {}  # id -> latest doc
+        self.email_hashes = {}  # email_hash -> latest doc
+        self.build_seconds = 0.0
+
+    def __len__(self):
+        return len(self.locators)
+
+    # ---- indexing ----
+    def _add(self, locator, record):
+        doc = len(self.locators)
+        self.locators.append(locator)
+        self.live.append(1)
+        if record.get("id"):  # records without an id can't be resubmissions of each other
+            key = _hash_key(record["id"])
+            previous = self.ids.get(key)
+            if previous is not None:
+                self.live[previous] = 0  # resubmission: the latest record wins
+            self.ids[key] = doc
+        if record.get("email_hash"):
+            self.email_hashes[_hash_key(record["email_hash"])] = doc
+
+        try:
+            years = min(max(int(record.get("years_exp") or 0), 0), 65535)
+        except (TypeError, ValueError):
+            years = 0
+        self.years.append(years)
+        self.by_years.setdefault(years, array("I")).append(doc)
+        location = _norm(record.get("location"))
+        position = _norm((record.get("desired_positions") or [""])[0])
+        self.locations.add(doc, location)
+        self.positions.add(doc, position)
+        for skill in {_norm(s) for s in record.get("tech_stack") or [] if _norm(s)}:
+            if skill not in self.skills:
+                self.skills[skill] = array("I")
+                self.skill_codes[skill] = len(self.skill_codes)
+            self.skills[skill].append(doc)
+            self.doc_skills.append(self.skill_codes[skill])
+            if location:
+                self.pairs.setdefault((skill, "location", location), array("I")).append(doc)
+            if position:
+                self.pairs.setdefault((skill, "position", position), array("I")).append(doc)
+        self.doc_skill_offsets.append(len(self.doc_skills))
+
+    def _catch_up(self) -> int:
+        t0 = time.perf_counter()
+        n = len(self.locators)
+        for locator, record, resume in self.store.scan(self._resume):
+            self._add(locator, record)
+            self._resume = resume
+        self.build_seconds += time.perf_counter() - t0
+        return len(self.locators) - n
+
+    def refresh(self) -> int:
+        """Index records appended since the last call; returns how many"""
+        with self._lock:
+            return self._catch_up()
+
+    # ---- lookups ----
+    def _fetch(self, docs) -> list:
+        return self.store.fetch([self.locators[d] for d in docs])
+
+    def _lookup(self, table, key):
+        with self._lock:
+            self._catch_up()
+            doc = table.get(_hash_key(key))
+        return self._fetch([doc])[0] if doc is not None else None
+
+    def get(self, candidate_id):
+        """Latest record for a candidate `id`, or None"""
+        return self._lookup(self.ids, candidate_id)
+
+    def by_email_hash(self, email_hash):
+        return self._lookup(self.email_hashes, email_hash)
+
+    def _plan(self, skills, location, position, min_years, max_years):
+        """
+        Returns (driver lists, filter) or None when a term is unknown. The
+        smallest candidate list drives the scan; everything else is an O(1)
+        per-doc check.
+        """
+        skills = [_norm(skill) for skill in skills]
+        if any(skill not in self.skills for skill in skills):
+            return None
+        location, position = _norm(location), _norm(position)
+        location_code = self.locations.codes.get(location) if location else None
+        position_code = self.positions.codes.get(position) if position else None
+        if (location and location_code is None) or (position and position_code is None):
+            return None
+
+        options = []  # (size, driver lists)
+        for skill in skills:
+            options.append((len(self.skills[skill]), [self.skills[skill]]))
+            for kind, term in (("location", location), ("position", position)):
+                if term:
+                    pair = self.pairs.get((skill, kind, term), array("I"))
+                    options.append((len(pair), [pair]))
+        if location:
+            posting = self.locations.postings[location_code]
+            options.append((len(posting), [posting]))
+        if position:
+            posting = self.positions.postings[position_code]
+            options.append((len(posting), [posting]))
+        lo = 0 if min_years is None else min_years
+        hi = 65535 if max_years is None else max_years
+        if min_years is not None or max_years is not None:
+            buckets = [a for y, a in self.by_years.items() if lo <= y <= hi]
+            options.append((sum(len(a) for a in buckets), buckets))
+        if not options:
+            return [None], lambda doc: self.live[doc]
+
+        _, drivers = min(options, key=lambda o: o[0])
+        years, live = self.years, self.live
+        locations, positions = self.locations.by_doc, self.positions.by_doc
+        doc_skills, offsets = self.doc_skills, self.doc_skill_offsets
+        wanted = [self.skill_codes[skill] for skill in skills]
+
+        def matches(doc):
+            if not live[doc] or not lo <= years[doc] <= hi:
+                return False
+            if location_code is not None and locations[doc] != location_code + 1:
+                return False
+            if position_code is not None and positions[doc] != position_code + 1:
+                return False
+            if wanted:
+                have = doc_skills[offsets[doc]:offsets[doc + 1]]
+                for code in wanted:
+                    if code not in have:
+                        return False
+            return True
+
+        return drivers, matches
+
+    def _newest_first(self, drivers, cursor):
+        """Doc ids below `cursor`, newest first, across one or more sorted lists"""
+        end = len(self.locators) if cursor is None else cursor
+        if drivers[0] is None:
+            return iter(range(end - 1, -1, -1))
+        iterators = []
+        for posting in drivers:
+            stop = bisect_left(posting, end)
+            iterators.append(posting[i] for i in range(stop - 1, -1, -1))
+        return iterators[0] if len(iterators) == 1 else heapq.merge(*iterators, reverse=True)
+
+    def query(self, skills=(), location=None, position=None, min_years=None, max_years=None,
+              limit=20, cursor=None) -> dict:
+        """
+        Live candidates matching every given filter (skills are ANDed), newest
+        first. Pass the returned `next_cursor` back to get the next page.
+        """
+        docs = []
+        with self._lock:
+            self._catch_up()
+            plan = self._plan(skills, location, position, min_years, max_years)
+            if plan is None:
+                return {"results": [], "next_cursor": None}
+            drivers, matches = plan
+            for doc in self._newest_first(drivers, cursor):
+                if matches(doc):
+                    docs.append(doc)
+                    if len(docs) == limit:
+                        break
+        next_cursor = docs[-1] if len(docs) == limit else None
+        return {"results": self._fetch(docs), "next_cursor": next_cursor}
+
+    def count(self, skills=(), location=None, position=None, min_years=None, max_years=None) -> int:
+        """Number of matches (walks the smallest candidate list; for dashboards, not per keystroke)"""
+        with self._lock:
+            self._catch_up()
+            plan = self._plan(skills, location, position, min_years, max_years)
+            if plan is None:
+                return 0
+            drivers, matches = plan
+            return sum(1 for doc in self._newest_first(drivers, None) if matches(doc))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "records": len(self.locators),
+                "live": sum(self.live),
+                "skills": len(self.skills),
+                "locations": len(self.locations.codes),
+                "positions": len(self.positions.codes),
+                "build_seconds": round(self.build_seconds, 3),
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index() -> CandidateIndex:
+    """Process-wide index over the configured candidate store"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = CandidateIndex()
+        return _index
@@ -0,0 +1,152 @@
+"""
+Process-wide pool of LLM chains shared by every Streamlit session.
+
+    lease = get_chain_pool().lease(provider, api_key, model_name, current=old_lease)
+    chain = lease.chain
+
+There is one chain per (provider, sha256(api_key), model). It is built on
+first use and reference counted by the leases that sessions keep in
+`st.session_state`. A lease is released when it is replaced (the user changed
+key or model) or when its session is garbage collected.
+
+Chains that no session holds are evicted after CHAIN_POOL_IDLE_TTL. When
+more than CHAIN_POOL_MAX_IDLE are idle, the least recently used go first.
+Evicting a chain also drops its rate limiter, router backend and cached
+validation, so memory stays bounded under key rotation. HTTP connection
+pools are per provider (`shared_http_clients`), so every chain of a provider
+reuses the same connections.
+"""
+import threading, time, weakref
+from collections import OrderedDict
+from . import metrics
+from .config import CHAIN_POOL_IDLE_TTL, CHAIN_POOL_MAX_IDLE
+from .llm_wrapper import LLMWrapper, ValidationCache, forget_shared_state, shared_state_stats
+from .router import get_router, forget_backend
+
+
+class _Entry:
+    __slots__ = ("chain", "refs", "last_used")
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.refs = 0
+        self.last_used = time.monotonic()
+
+
+class Lease:
+    """A session's hold on a pooled chain, released by `release()` or garbage collection"""
+    def __init__(self, pool, key, chain):
+        self.key = key
+        self.chain = chain
+        self._finalizer = weakref.finalize(self, pool._release, key)
+
+    def release(self):
+        self._finalizer()  # runs at most once
+
+    @property
+    def active(self) -> bool:
+        return self._finalizer.alive
+
+
+class ChainPool:
+    def __init__(self, idle_ttl=CHAIN_POOL_IDLE_TTL, max_idle=CHAIN_POOL_MAX_IDLE, build=None):
+        self.idle_ttl = idle_ttl
+        self.max_idle = max_idle
+        self._build = build or (lambda provider, api_key, model_name: get_router(
+            LLMWrapper(provider=provider, api_key=api_key, model_name=model_name)))
+        self._entries = OrderedDict()  # key -> _Entry; idle ones in least recently used order
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lease(self, provider, api_key, model_name, current=None) -> Lease:
+        """
+        A lease on the chain for these settings. Pass the session's `current`
+        lease: it is returned as is when the settings haven't changed, and
+        released when they have.
+        """
+        key = ValidationCache.make_key(provider, api_key, model_name)
+        if current is not None and current.active and current.key == key:
+            return current
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:  # one build per key; other keys are not blocked
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    metrics.CHAIN_POOL.inc(result="hit")
+                    entry.refs += 1
+            if entry is None:
+                built = _Entry(self._build(provider, api_key, model_name))
+                with self._lock:
+                    self.misses += 1
+                    metrics.CHAIN_POOL.inc(result="miss")
+                    entry = self._entries.setdefault(key, built)
+                    entry.refs += 1
+
+        if current is not None:
+            current.release()
+        self.evict_idle()
+        return Lease(self, key, entry.chain)
+
+    def _release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs = max(entry.refs - 1, 0)
+            entry.last_used = time.monotonic()
+            if not entry.refs:
+                self._entries.move_to_end(key)  # idle entries end up in release order
+        self.evict_idle()
+
+    def evict_idle(self) -> int:
+        """Drop idle chains past their TTL or beyond `max_idle`; returns how many"""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            idle = [key for key, entry in self._entries.items() if not entry.refs]
+            for n, key in enumerate(idle):
+                if len(idle) - n > self.max_idle or now - self._entries[key].last_used >= self.idle_ttl:
+                    del self._entries[key]
+                    self._key_locks.pop(key, None)
+                    evicted.append(key)
+            self.evictions += len(evicted)
+        for key in evicted:
+            forget_backend(key)
+            forget_shared_state(key)
+            metrics.CHAIN_POOL.inc(result="evicted")
+        return len(evicted)
+
+    def stats(self) -> dict:
+        self.evict_idle()
+        with self._lock:
+            in_use = sum(1 for entry in self._entries.values() if entry.refs)
+            stats = {
+                "chains": len(self._entries),
+                "in_use": in_use,
+                "idle": len(self._entries) - in_use,
+                "leases": sum(entry.refs for entry in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+        stats.update(shared_state_stats())
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_chain_pool() -> ChainPool:
+    """Process-wide chain pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ChainPool()
+        return _pool
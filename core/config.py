@@ -5,6 +5,7 @@ load_dotenv()
 
 # Keys
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 SALT = os.getenv("DATA_SALT", "replace_with_random_salt")
 
 # Data storage
@@ -13,3 +14,138 @@ os.makedirs(DATA_DIR, exist_ok=True)
 DATA_FILE = os.path.join(DATA_DIR, "candidates.json")
 
 EXIT_KEYWORDS = {"exit", "quit", "bye", "goodbye", "stop", "end"}
+
+# Candidate store backend: "jsonl" (append-only log) or "sqlite" (WAL)
+CANDIDATE_STORE = os.getenv("CANDIDATE_STORE", "jsonl").lower()
+CANDIDATES_LOG = os.path.join(DATA_DIR, "candidates.jsonl")
+CANDIDATES_DB = os.path.join(DATA_DIR, "candidates.db")
+FSYNC_BATCH = int(os.getenv("FSYNC_BATCH", "32"))
+FSYNC_INTERVAL = float(os.getenv("FSYNC_INTERVAL", "1.0"))
+
+# Credential validation cache (seconds)
+VALIDATION_TTL = float(os.getenv("VALIDATION_TTL", "600"))
+VALIDATION_NEGATIVE_TTL = float(os.getenv("VALIDATION_NEGATIVE_TTL", "30"))
+
+# Persistent cache for evaluation and other LLM results: entries expire after
+# RESULT_CACHE_TTL seconds and each namespace keeps at most RESULT_CACHE_MAX_ENTRIES
+RESULT_CACHE_DB = os.path.join(DATA_DIR, "results_cache.db")
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", str(30 * 24 * 3600)))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "50000"))
+
+# Evaluation mode: "incremental" scores each answer in the background as it is
+# submitted; "batch" sends all answers in one prompt after the last question
+EVAL_MODE = os.getenv("EVAL_MODE", "incremental").lower()
+EVAL_WORKERS = int(os.getenv("EVAL_WORKERS", "8"))
+
+# LLM client pool and rate limits: (requests per minute, tokens per minute)
+RATE_LIMITS = {
+    "groq": (int(os.getenv("GROQ_RPM", "30")), int(os.getenv("GROQ_TPM", "6000"))),
+    "openai": (int(os.getenv("OPENAI_RPM", "500")), int(os.getenv("OPENAI_TPM", "200000"))),
+    "fake": (int(os.getenv("FAKE_RPM", "100000")), int(os.getenv("FAKE_TPM", "100000000"))),
+    "default": (int(os.getenv("LLM_RPM", "60")), int(os.getenv("LLM_TPM", "100000"))),
+}
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_OUTPUT_TOKENS_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKENS_ESTIMATE", "512"))
+
+# Prompt token budgets (see core/prompts.py): per answer, for a whole batch
+# evaluation, and the number of skills sent for question generation
+PROMPT_ANSWER_TOKENS = int(os.getenv("PROMPT_ANSWER_TOKENS", "400"))
+PROMPT_EVAL_TOKENS = int(os.getenv("PROMPT_EVAL_TOKENS", "3000"))
+PROMPT_MAX_SKILLS = int(os.getenv("PROMPT_MAX_SKILLS", "12"))
+
+# Interview sessions idle longer than SESSION_IDLE_TTL seconds are archived (finished)
+# or cleared (unfinished) by a reaper that runs every SESSION_REAP_INTERVAL seconds
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+SESSION_REAP_INTERVAL = float(os.getenv("SESSION_REAP_INTERVAL", "60"))
+# Session checkpoints (core/session_store.py), resumable by any worker process from the
+# page's ?sid= token: "memory" (this process), "sqlite" (one host) or "redis" (SESSION_REDIS_URL)
+SESSION_STORE = os.getenv("SESSION_STORE", "sqlite").lower()
+SESSIONS_DB = os.path.join(DATA_DIR, "sessions.db")
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+SESSION_STORE_TTL = float(os.getenv("SESSION_STORE_TTL", "86400"))  # seconds a checkpoint is kept
+
+# Local pre-scoring (core/prescore.py): empty, "idk", copied-question and very short answers
+# get a score without an LLM call
+PRESCORE = os.getenv("PRESCORE", "1") == "1"
+PRESCORE_MIN_WORDS = int(os.getenv("PRESCORE_MIN_WORDS", "2"))  # content words, unless one is in the outline
+PRESCORE_MIN_NOVELTY = float(os.getenv("PRESCORE_MIN_NOVELTY", "0.2"))  # share of words not in the question
+
+# Background jobs (core/jobs.py): LLM work goes to `python -m core.jobs` worker processes
+# through a SQLite queue while one is alive; otherwise it runs inline in the app
+BACKGROUND_JOBS = os.getenv("BACKGROUND_JOBS", "1") == "1"
+JOBS_DB = os.path.join(DATA_DIR, "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # processes
+JOB_WORKER_THREADS = int(os.getenv("JOB_WORKER_THREADS", "8"))  # concurrent jobs per process
+JOB_LEASE = float(os.getenv("JOB_LEASE", "300"))  # seconds before a silent worker's job is retried
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_HEARTBEAT = float(os.getenv("JOB_HEARTBEAT", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "0.5"))  # UI refresh while a job runs
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", "86400"))  # finished jobs kept for reloads
+
+# Shared chain pool: chains no session holds are dropped after CHAIN_POOL_IDLE_TTL
+# seconds, or sooner (least recently used first) once more than CHAIN_POOL_MAX_IDLE are idle
+CHAIN_POOL_IDLE_TTL = float(os.getenv("CHAIN_POOL_IDLE_TTL", "900"))
+CHAIN_POOL_MAX_IDLE = int(os.getenv("CHAIN_POOL_MAX_IDLE", "32"))
+
+# Question bank: cached question sets per normalized profile
+QUESTION_BANK_SIZE = int(os.getenv("QUESTION_BANK_SIZE", "512"))  # keys kept in memory
+QUESTION_BANK_SETS = int(os.getenv("QUESTION_BANK_SETS", "3"))  # sets per key before refills stop
+QUESTION_BANK_WORKERS = int(os.getenv("QUESTION_BANK_WORKERS", "2"))
+# Speculative generation: questions start generating as soon as the form has a position,
+# experience and a skill, and are used on submit if those still match
+QUESTION_PREFETCH = os.getenv("QUESTION_PREFETCH", "1") == "1"
+QUESTION_PREFETCH_WORKERS = int(os.getenv("QUESTION_PREFETCH_WORKERS", "8"))
+
+# Roles and skills offered by the candidate form; the offline question pool covers these
+JOB_ROLES = [
+    "Software Engineer", "Data Scientist", "Machine Learning Engineer",
+    "Full Stack Developer", "Backend Developer", "Frontend Developer",
+    "DevOps Engineer", "Cloud Engineer", "QA Engineer", "Product Manager"
+]
+COMMON_SKILLS = ["Python", "Java", "JavaScript", "C++", "React", "Node.js", "Django", "SQL", "AWS", "Docker"]
+QUESTION_POOL_FILE = os.path.join(DATA_DIR, "question_pool.bin")
+
+# Local fake provider (benchmarks / offline runs); shown in the sidebar only when enabled
+ENABLE_FAKE_LLM = os.getenv("ENABLE_FAKE_LLM", "").lower() in ("1", "true", "yes")
+FAKE_LLM_TTFT = float(os.getenv("FAKE_LLM_TTFT", "0.2"))
+FAKE_LLM_TPS = float(os.getenv("FAKE_LLM_TPS", "200"))
+
+# Metrics: Prometheus text on 127.0.0.1:METRICS_PORT/metrics (0 disables) and/or a file
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_FILE = os.getenv("METRICS_FILE", "")
+METRICS_FILE_INTERVAL = float(os.getenv("METRICS_FILE_INTERVAL", "5"))
+
+# Sampling temperature for every chain. At 0 the same prompt gets the same reply, so
+# replies are also kept in an exact-match response cache (memory LRU + RESULT_CACHE_DB)
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "1") == "1"
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))  # replies kept in memory
+# Providers sent a prompt_cache_key (the system prefix id) so requests sharing the
+# prefix are routed to the same prompt cache; Groq caches prefixes without one
+PROMPT_CACHE_KEY_PROVIDERS = {p.strip() for p in os.getenv("PROMPT_CACHE_KEY_PROVIDERS", "openai").split(",") if p.strip()}
+
+# Providers whose JSON mode (response_format=json_object) is used; comma separated
+JSON_MODE_PROVIDERS = {p.strip() for p in os.getenv("LLM_JSON_MODE_PROVIDERS", "openai").split(",") if p.strip()}
+
+# LLM call resilience (seconds). Retries cover 429/5xx/connection errors and
+# timeouts before the first token; a stream that stalls mid-way is not retried.
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))  # whole call, including retries
+LLM_FIRST_TOKEN_TIMEOUT = float(os.getenv("LLM_FIRST_TOKEN_TIMEOUT", "30"))
+LLM_IDLE_TIMEOUT = float(os.getenv("LLM_IDLE_TIMEOUT", "20"))  # max gap between chunks
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+# Hedging: when the first token is later than LLM_HEDGE_AFTER, race a second request
+# to LLM_HEDGE_MODEL and keep whichever answers first (0 disables)
+LLM_HEDGE_AFTER = float(os.getenv("LLM_HEDGE_AFTER", "0"))
+LLM_HEDGE_MODEL = os.getenv("LLM_HEDGE_MODEL", "llama-3.1-8b-instant")
+# OpenAI-compatible base URL overrides (proxies, local test servers)
+LLM_BASE_URLS = {"groq": os.getenv("GROQ_BASE_URL"), "openai": os.getenv("OPENAI_BASE_URL")}
+
+# Routing/failover: extra "provider:model" backends, comma separated, tried alongside
+# the sidebar's choice. Keys come from GROQ_API_KEY / OPENAI_API_KEY.
+LLM_BACKENDS = [b.strip() for b in os.getenv("LLM_BACKENDS", "").split(",") if b.strip()]
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))  # consecutive failures to open
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))  # seconds before a probe
+LLM_ROUTER_PRIOR_LATENCY = float(os.getenv("LLM_ROUTER_PRIOR_LATENCY", "1.0"))  # unmeasured backends
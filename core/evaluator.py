@@ -0,0 +1,125 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .config import EVAL_WORKERS
+from . import metrics
+from .parsing import AnswerScore, Evaluation, ParseError, parse_or_repair, to_dict
+from .prompts import answer_prompt, evaluation_prompt
+from .prescore import prescore
+
+
+def _prescore(answer: dict):
+    local = prescore(answer)
+    metrics.PRESCORE.inc(result=local["prescored"] if local else "llm")
+    return local
+
+
+def score_answer(chain, answer: dict) -> dict:
+    """
+    Score a single {"q": question, "a": answer} pair; trivial answers are
+    scored locally (core/prescore.py). Returns {"question", "score", "feedback"}.
+    """
+    local = _prescore(answer)
+    if local is not None:
+        metrics.LLM_CALLS_SAVED.inc(stage="answer")
+        return local
+    question = answer["q"].get("question", "")
+    prompt = answer_prompt(answer)
+    with metrics.STAGE_SECONDS.time(stage="score_answer"):
+        raw = "".join([c for c in chain.stream(prompt)])
+        try:
+            result = parse_or_repair(chain, raw, AnswerScore, kind="answer")
+        except ParseError:
+            # One unparseable answer shouldn't sink the whole evaluation; it's left out of the average
+            return {"question": question, "score": None, "feedback": "⚠️ Could not evaluate this answer."}
+    return {"question": question, "score": result.score, "feedback": result.feedback}
+
+
+def aggregate_results(results) -> dict:
+    """Build the final evaluation locally; the average is computed here, not by the model"""
+    scores = []
+    for item in results:
+        try:
+            scores.append(float(item.get("score")))
+        except (TypeError, ValueError):
+            pass
+    average = round(sum(scores) / len(scores), 1) if scores else None
+    return {"results": list(results), "final_average_score": average}
+
+
+def _question_text(text) -> str:
+    return " ".join(str(text or "").lower().replace("…", " ").split()).rstrip(" ?.!:")
+
+
+def _match_results(answers: list, results: list) -> list:
+    """
+    The model's result for each answer, matched on the question text it echoes
+    (the prompt may have cut long questions, so a prefix counts). When some
+    echoes don't match but there is exactly one result per answer, the rest are
+    taken in order. Unmatched answers get None.
+    """
+    unclaimed = list(results)
+    matched = []
+    for answer in answers:
+        question = _question_text(answer["q"].get("question", ""))
+        found = None
+        for item in unclaimed:
+            echoed = _question_text(item.get("question"))
+            if echoed and (question.startswith(echoed) or echoed.startswith(question)):
+                found = item
+                break
+        if found is not None:
+            unclaimed.remove(found)
+        matched.append(found)
+    if len(results) == len(answers):
+        leftovers = iter(unclaimed)
+        matched = [item if item is not None else next(leftovers) for item in matched]
+    return matched
+
+
+def incomplete(evaluation) -> bool:
+    """True when some answer could not be scored: shown, but never cached or archived"""
+    return any(item.get("score") is None for item in (evaluation or {}).get("results", []))
+
+
+def evaluate_batch(chain, answers: list) -> dict:
+    """
+    Score every {"q", "a"} pair in one call (EVAL_MODE=batch). Trivial answers
+    are scored locally and left out of the prompt; no call when all are.
+    """
+    local = [_prescore(answer) for answer in answers]
+    pending = [answer for answer, result in zip(answers, local) if result is None]
+    if not pending:
+        metrics.LLM_CALLS_SAVED.inc(stage="evaluation")
+        return aggregate_results(local)
+    raw = "".join([c for c in chain.stream(evaluation_prompt(pending))])
+    evaluation = to_dict(parse_or_repair(chain, raw, Evaluation, kind="evaluation"))
+    scored = iter(_match_results(pending, evaluation.get("results", [])))
+    results = []
+    for answer, result in zip(answers, local):
+        if result is None:
+            item = next(scored)
+            result = {"question": answer["q"].get("question", ""), "score": None,
+                      "feedback": "⚠️ Could not evaluate this answer."}
+            if item is not None:
+                result.update(score=item.get("score"), feedback=item.get("feedback", ""))
+        results.append(result)
+    # The model's own final_average_score is ignored: the average always comes from the scores above
+    return aggregate_results(results)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def evaluation_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool shared by all sessions for background scoring"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EVAL_WORKERS, thread_name_prefix="eval")
+        return _executor
+
+
+def submit_answer(chain, answer: dict):
+    """Start scoring `answer` in the background and return its Future"""
+    return evaluation_executor().submit(score_answer, chain, answer)
@@ -0,0 +1,88 @@
+"""
+Deterministic local chat model for benchmarks and offline runs.
+
+Registered as the "fake" provider in LLMWrapper.SUPPORTED_PROVIDERS. It answers
+question-generation and evaluation prompts with valid JSON, streamed at a
+configurable time-to-first-token and tokens-per-second. No network access.
+"""
+import asyncio, hashlib, json, re, time
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+TASK_SHAPES = {"QUESTIONS": '"questions"', "EVALUATION": '"results"', "ANSWER": '"score"'}
+
+
+def _shape(prompt: str):
+    """The reply shape asked for: the task line (core/prompts.py), else the first format quoted"""
+    if prompt.startswith("Task: "):
+        words = prompt[6:].split(None, 1)
+        if words and words[0] in TASK_SHAPES:
+            return TASK_SHAPES[words[0]]
+    return next((shape for shape in ('"questions"', '"results"', '"score"') if shape in prompt), None)
+
+
+def fake_response(prompt: str) -> str:
+    """Deterministic JSON reply matching the shape the prompt asks for"""
+    seed = _seed(prompt)
+    shape = _shape(prompt)
+    if shape == '"questions"':
+        n = 3 + seed % 3
+        return json.dumps({"questions": [
+            {"question": f"Question {i + 1} ({seed % 997}): explain a design trade-off you made recently.",
+             "expected_answer_outline": "Context, options considered, decision, outcome and what you would change."}
+            for i in range(n)
+        ]})
+    if shape == '"results"':
+        n = max(1, prompt.count('"a":'))
+        scores = [4 + (seed >> i) % 6 for i in range(n)]
+        return json.dumps({
+            "results": [{"question": f"Question {i + 1}", "score": s, "feedback": "Reasonable answer; add concrete examples."}
+                        for i, s in enumerate(scores)],
+            "final_average_score": round(sum(scores) / n, 1),
+        })
+    if shape == '"score"':
+        return json.dumps({"score": 4 + seed % 6, "feedback": "Reasonable answer; add concrete examples."})
+    return json.dumps({"ok": True})
+
+
+def _tokens(text: str):
+    return re.findall(r"\s+|\w+|[^\w\s]", text)
+
+
+class FakeChatModel(BaseChatModel):
+    model_name: str = "fake"
+    ttft: float = 0.2
+    tokens_per_second: float = 200.0
+    temperature: float = 0.0
+    streaming: bool = True
+
+    @property
+    def _llm_type(self) -> str:
+        return "talentscout-fake"
+
+    def _reply(self, messages, max_tokens=None):
+        tokens = _tokens(fake_response(messages[-1].content))
+        return tokens[:max_tokens] if max_tokens else tokens
+
+    def _generate(self, messages, stop=None, run_manager=None, max_tokens=None, **kwargs):
+        tokens = self._reply(messages, max_tokens)
+        time.sleep(self.ttft + len(tokens) / self.tokens_per_second)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, max_tokens=None, **kwargs):
+        time.sleep(self.ttft)
+        for token in self._reply(messages, max_tokens):
+            time.sleep(1.0 / self.tokens_per_second)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages, stop=None, run_manager=None, max_tokens=None, **kwargs):
+        await asyncio.sleep(self.ttft)
+        for token in self._reply(messages, max_tokens):
+            await asyncio.sleep(1.0 / self.tokens_per_second)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
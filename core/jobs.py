@@ -0,0 +1,417 @@
+"""
+Durable background jobs for question generation and answer evaluation.
+
+    python -m core.jobs --workers 4 --threads 8
+
+starts worker processes that take jobs from a SQLite queue (JOBS_DB, WAL)
+shared with every Streamlit worker on the host. The app enqueues LLM work
+and polls for its result instead of running it in the script thread, so a
+browser refresh, a rerun or an app restart does not lose it:
+
+- every job has an idempotent key per candidate and stage (`job_key`):
+  enqueueing the same work again returns the existing job, or its result
+- a worker holds a job for JOB_LEASE seconds, extended while it reports
+  progress; a crashed worker's jobs are picked up again after the lease,
+  up to JOB_MAX_ATTEMPTS times
+- workers send heartbeats; the app only enqueues while one is alive, and
+  otherwise runs the work inline as before
+
+Workers call the LLM with the server's keys (GROQ_API_KEY / OPENAI_API_KEY),
+so a session is only offloaded when its key is that key. API keys are never
+written to the queue.
+"""
+import argparse, json, multiprocessing, os, signal, socket, sqlite3, sys, threading, time
+from concurrent.futures import CancelledError
+from dataclasses import dataclass
+from .config import (BACKGROUND_JOBS, JOBS_DB, JOB_LEASE, JOB_MAX_ATTEMPTS, JOB_WORKERS, JOB_WORKER_THREADS,
+                     JOB_HEARTBEAT, JOB_RETENTION)
+from .utils import fingerprint
+from . import metrics
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+@dataclass
+class Job:
+    key: str
+    kind: str
+    status: str  # queued | running | done | failed | cancelled
+    payload: dict
+    result: object = None
+    error: str = None
+    attempts: int = 0
+    progress: object = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+
+def job_key(kind: str, *parts) -> str:
+    return f"{kind}:{fingerprint(kind, *parts)}"
+
+
+class JobQueue:
+    """
+    One row per job key. Claiming is a single UPDATE ... RETURNING, so two
+    workers never run the same job at once.
+    """
+    COLUMNS = "key, kind, status, payload, result, error, attempts, progress"
+
+    def __init__(self, path=JOBS_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "key TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, payload TEXT NOT NULL, "
+            "result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, progress TEXT, worker TEXT, "
+            "lease_until REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);"
+            "CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, heartbeat REAL NOT NULL);"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _job(row) -> Job:
+        key, kind, status, payload, result, error, attempts, progress = row
+        return Job(key, kind, status, json.loads(payload), json.loads(result) if result else None, error,
+                   attempts, json.loads(progress) if progress else None)
+
+    def enqueue(self, kind: str, key: str, payload: dict, retry=False) -> Job:
+        """
+        Queue `payload` under `key` unless that job already exists; failed and
+        cancelled jobs are queued again, and with retry=True finished ones too.
+        Returns the job as stored.
+        """
+        statuses = "('failed', 'cancelled', 'done')" if retry else "('failed', 'cancelled')"
+        now = time.time()
+        with self._lock, self._conn:
+            queued = self._conn.execute(
+                "INSERT INTO jobs (key, kind, status, payload, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET status = 'queued', payload = excluded.payload, attempts = 0, "
+                "error = NULL, progress = NULL, updated_at = excluded.updated_at "
+                f"WHERE jobs.status IN {statuses}",
+                (key, kind, json.dumps(payload, separators=(",", ":")), now, now),
+            ).rowcount
+            row = self._conn.execute(f"SELECT {self.COLUMNS} FROM jobs WHERE key = ?", (key,)).fetchone()
+        metrics.JOBS.inc(kind=kind, event="enqueued" if queued else "deduplicated")
+        return self._job(row)
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self.COLUMNS} FROM jobs WHERE key = ?", (key,)).fetchone()
+        return self._job(row) if row else None
+
+    def claim(self, worker: str, lease=JOB_LEASE):
+        """The oldest queued job (or one whose worker's lease ran out), now running on `worker`; None if idle"""
+        now = time.time()
+        with self._lock:
+            # A read first: idle workers polling must not queue up for the write lock
+            if self._conn.execute("SELECT 1 FROM jobs WHERE status = 'queued' "
+                                  "OR (status = 'running' AND lease_until < ?) LIMIT 1", (now,)).fetchone() is None:
+                return None
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, lease_until = ?, "
+                "updated_at = ? WHERE key = (SELECT key FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND lease_until < ?) ORDER BY created_at LIMIT 1) "
+                f"RETURNING {self.COLUMNS}",
+                (worker, now + lease, now, now),
+            ).fetchone()
+        return self._job(row) if row else None
+
+    def progress(self, key: str, worker: str, progress, lease=JOB_LEASE) -> bool:
+        """Store partial output and extend the lease; False when the job is no longer this worker's"""
+        now = time.time()
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET progress = ?, lease_until = ?, updated_at = ? "
+                "WHERE key = ? AND worker = ? AND status = 'running'",
+                (json.dumps(progress, separators=(",", ":")), now + lease, now, key, worker),
+            ).rowcount > 0
+
+    def complete(self, key: str, worker: str, result) -> bool:
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, progress = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE key = ? AND worker = ? AND status = 'running'",
+                (json.dumps(result, separators=(",", ":")), time.time(), key, worker),
+            ).rowcount > 0
+
+    def fail(self, key: str, worker: str, error: str, max_attempts=JOB_MAX_ATTEMPTS) -> str:
+        """Queue the job again, or mark it failed after `max_attempts`; returns the new status"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, error = ?, "
+                "lease_until = NULL, updated_at = ? WHERE key = ? AND worker = ? AND status = 'running' "
+                "RETURNING status",
+                (max_attempts, error[:1000], time.time(), key, worker),
+            ).fetchone()
+        return row[0] if row else "lost"
+
+    def cancel(self, key: str, running=True) -> bool:
+        """
+        Stop a job that hasn't finished; a running one stops at its next progress
+        report. With running=False only a job no worker has claimed yet.
+        """
+        statuses = "('queued', 'running')" if running else "('queued')"
+        with self._lock, self._conn:
+            return self._conn.execute(
+                f"UPDATE jobs SET status = 'cancelled', updated_at = ? WHERE key = ? AND status IN {statuses}",
+                (time.time(), key),
+            ).rowcount > 0
+
+    def heartbeat(self, worker: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO workers (id, heartbeat) VALUES (?, ?)", (worker, time.time()))
+
+    def retire(self, worker: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM workers WHERE id = ?", (worker,))
+
+    def workers_alive(self, within=3 * JOB_HEARTBEAT) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM workers WHERE heartbeat >= ?",
+                                      (time.time() - within,)).fetchone()[0]
+
+    def purge(self, retention=JOB_RETENTION) -> int:
+        """Drop finished jobs older than `retention` seconds and long-dead workers"""
+        cutoff = time.time() - retention
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM workers WHERE heartbeat < ?", (cutoff,))
+            return self._conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') "
+                                      "AND updated_at < ?", (cutoff,)).rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {"jobs": dict(rows), "workers_alive": self.workers_alive()}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide handle on the shared job queue"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+
+# ---------------- Enqueueing (app side) ----------------
+def offload_available(provider: str, api_key: str) -> bool:
+    """Whether this session's LLM work can go to the workers: they are running and use the same key"""
+    from .router import ENV_KEYS
+
+    if not (BACKGROUND_JOBS and api_key and ENV_KEYS.get(provider) == api_key):
+        return False
+    try:
+        return get_job_queue().workers_alive() > 0
+    except sqlite3.Error:
+        return False
+
+
+def submit_questions(provider, model_name, profile: dict) -> Job:
+    """Questions for a normalize_profile() dict; shared by every candidate with that profile"""
+    from .question_bank import profile_key
+
+    key = job_key("questions", provider, model_name, profile_key(profile))
+    return get_job_queue().enqueue("questions", key, {"provider": provider, "model_name": model_name,
+                                                      "profile": profile})
+
+
+def answer_job_key(provider, model_name, candidate_id, answer: dict) -> str:
+    return job_key("answer", provider, model_name, candidate_id, answer)
+
+
+def submit_answer_score(provider, model_name, candidate_id, answer: dict) -> Job:
+    """One {"q", "a"} pair, scored while the candidate works on the next question (EVAL_MODE=incremental)"""
+    return get_job_queue().enqueue("answer", answer_job_key(provider, model_name, candidate_id, answer),
+                                   {"provider": provider, "model_name": model_name, "answer": answer})
+
+
+def evaluation_job_key(provider, model_name, candidate_id, mode, answers: list) -> str:
+    return job_key("evaluation", provider, model_name, candidate_id, mode, answers)
+
+
+def submit_evaluation(provider, model_name, candidate_id, mode, answers: list, retry=False) -> Job:
+    """
+    The final evaluation of one candidate's answers, in either EVAL_MODE; a
+    failed one is queued again, and with retry=True a done one too.
+    """
+    key = evaluation_job_key(provider, model_name, candidate_id, mode, answers)
+    return get_job_queue().enqueue("evaluation", key, {"provider": provider, "model_name": model_name,
+                                                       "candidate_id": candidate_id, "mode": mode,
+                                                       "answers": answers}, retry=retry)
+
+
+# ---------------- Handlers (worker side) ----------------
+def _run_questions(chain, job, report):
+    from .question_bank import questions_for
+
+    stop = threading.Event()
+
+    def on_question(questions):
+        if not report(list(questions)):
+            stop.set()
+
+    questions, source = questions_for(chain, job.payload["profile"], on_question=on_question, stop=stop)
+    return {"questions": questions, "source": source}
+
+
+def _run_answer(chain, job, report):
+    from .evaluator import score_answer
+
+    return score_answer(chain, job.payload["answer"])
+
+
+def _run_evaluation(chain, job, report):
+    from .evaluator import aggregate_results, evaluate_batch, score_answer
+
+    payload = job.payload
+    if payload["mode"] != "incremental":
+        return evaluate_batch(chain, payload["answers"])
+    # Answers scored by their own jobs are reused (unless the score is missing) and running
+    # ones waited for; a job no worker has claimed yet is withdrawn and scored here, so
+    # nothing is scored twice
+    queue, results = get_job_queue(), []
+    progress = lambda: {"scored": len(results), "total": len(payload["answers"])}
+    for answer in payload["answers"]:
+        key = answer_job_key(payload["provider"], payload["model_name"], payload["candidate_id"], answer)
+        while True:
+            scored = queue.get(key)
+            if scored is not None and scored.status == "done" and scored.result.get("score") is not None:
+                results.append(scored.result)
+                break
+            if scored is None or scored.finished or (scored.status == "queued" and queue.cancel(key, running=False)):
+                results.append(score_answer(chain, answer))
+                break
+            if not report(progress()):  # also extends this job's lease while waiting
+                raise CancelledError("evaluation cancelled")
+            time.sleep(0.2)
+        if not report(progress()):
+            raise CancelledError("evaluation cancelled")
+    return aggregate_results(results)
+
+
+HANDLERS = {
+    "questions": _run_questions,
+    "answer": _run_answer,
+    "evaluation": _run_evaluation,
+}
+
+
+class Worker:
+    """Runs claimed jobs on `threads` threads; one per process started by `main`"""
+    def __init__(self, threads=JOB_WORKER_THREADS, queue=None):
+        self.id = f"{socket.gethostname()}:{os.getpid()}"
+        self.threads = threads
+        self.queue = queue or get_job_queue()
+        self.stop = threading.Event()
+        self._leases = {}
+        self._leases_lock = threading.Lock()
+
+    def _chain(self, provider, model_name):
+        from .chain_pool import get_chain_pool
+        from .router import ENV_KEYS
+
+        with self._leases_lock:
+            key = (provider, model_name)
+            lease = self._leases.get(key)
+            self._leases[key] = get_chain_pool().lease(provider, ENV_KEYS.get(provider), model_name, current=lease)
+            return self._leases[key].chain
+
+    def run_one(self, job: Job):
+        report = lambda progress: self.queue.progress(job.key, self.id, progress)
+        try:
+            if job.attempts > JOB_MAX_ATTEMPTS:
+                raise RuntimeError(f"gave up after {job.attempts - 1} attempts")
+            chain = self._chain(job.payload["provider"], job.payload["model_name"])
+            with metrics.STAGE_SECONDS.time(stage=f"job_{job.kind}"):
+                result = HANDLERS[job.kind](chain, job, report)
+        except CancelledError:
+            # Cancelled, or another worker took it over after this one's lease ran out
+            metrics.JOBS.inc(kind=job.kind, event="cancelled")
+            return
+        except Exception as e:
+            status = self.queue.fail(job.key, self.id, f"{type(e).__name__}: {e}")
+            metrics.JOBS.inc(kind=job.kind, event="retried" if status == "queued" else "failed")
+            return
+        self.queue.complete(job.key, self.id, result)
+        metrics.JOBS.inc(kind=job.kind, event="done")
+
+    def _loop(self):
+        while not self.stop.is_set():
+            try:
+                job = self.queue.claim(self.id)
+            except sqlite3.OperationalError:
+                job = None  # database busy; try again
+            if job is None:
+                self.stop.wait(0.1)
+                continue
+            self.run_one(job)
+
+    def _heartbeat(self):
+        while not self.stop.is_set():
+            try:
+                self.queue.heartbeat(self.id)
+                self.queue.purge()
+            except sqlite3.Error:
+                pass
+            self.stop.wait(JOB_HEARTBEAT)
+
+    def run(self):
+        threads = [threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)]
+        threads += [threading.Thread(target=self._loop, name=f"job-{n}", daemon=True) for n in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads[1:]):
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            self.stop.set()
+        finally:
+            self.queue.retire(self.id)
+
+
+def _worker_process(threads):
+    Worker(threads).run()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m core.jobs")
+    ap.add_argument("--workers", type=int, default=JOB_WORKERS, help="processes")
+    ap.add_argument("--threads", type=int, default=JOB_WORKER_THREADS, help="concurrent jobs per process")
+    args = ap.parse_args(argv)
+
+    print(f"✅ {args.workers} job workers × {args.threads} threads on {JOBS_DB}", file=sys.stderr)
+    JobQueue().close()  # create the schema before the workers race for it
+    signal.signal(signal.SIGTERM, signal.default_int_handler)  # stop the workers on SIGTERM too
+    ctx = multiprocessing.get_context("spawn")
+    procs = {}
+    try:
+        while True:
+            # Replace workers that died; their running jobs are taken over when the lease runs out
+            for n in range(args.workers):
+                if n not in procs or not procs[n].is_alive():
+                    procs[n] = ctx.Process(target=_worker_process, args=(args.threads,), daemon=True)
+                    procs[n].start()
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for proc in procs.values():
+            proc.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
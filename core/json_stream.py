@@ -0,0 +1,68 @@
+import json
+
+
+class JsonItemStream:
+    """
+    Incremental parser for `{"questions": [{...}, {...}]}`-shaped LLM output.
+
+    Feed it chunks as they stream in; it returns each object of the top-level
+    array as soon as its closing brace arrives. Prose before the first `{` and
+    after the top-level object is ignored; braces inside strings are handled.
+    """
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+        self._done = False
+
+    def feed(self, chunk: str) -> list:
+        self.text += chunk
+        items = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            if self._done:
+                break
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if not self._stack:
+                if ch == "{":
+                    self._stack.append("{")
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if ch == "{" and self._stack == ["{", "["]:
+                    self._item_start = i
+                self._stack.append(ch)
+            elif ch in "}]":
+                self._stack.pop()
+                if ch == "}" and self._stack == ["{", "["] and self._item_start is not None:
+                    try:
+                        items.append(json.loads(text[self._item_start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = None
+                if not self._stack:
+                    self._done = True
+        self._pos = len(text)
+        return items
+
+
+def stream_json_items(chunks, parser=None):
+    """
+    Generator stage: turns a stream of text chunks into a stream of parsed
+    array items. Pass your own `parser` to inspect `parser.text` afterwards.
+    """
+    parser = parser or JsonItemStream()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
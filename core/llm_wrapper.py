@@ -1,22 +1,405 @@
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+import asyncio, hashlib, importlib, queue, random, threading, time
+from collections import OrderedDict
+from . import aio, metrics
+from .rate_limit import FairRateLimiter
+from .config import (
+    VALIDATION_TTL, VALIDATION_NEGATIVE_TTL, RATE_LIMITS, LLM_MAX_CONCURRENCY,
+    LLM_MAX_CONNECTIONS, LLM_OUTPUT_TOKENS_ESTIMATE, FAKE_LLM_TTFT, FAKE_LLM_TPS,
+    JSON_MODE_PROVIDERS, LLM_TIMEOUT, LLM_FIRST_TOKEN_TIMEOUT, LLM_IDLE_TIMEOUT, LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE, LLM_BACKOFF_MAX, LLM_HEDGE_AFTER, LLM_HEDGE_MODEL, LLM_BASE_URLS,
+    LLM_TEMPERATURE, RESPONSE_CACHE, RESPONSE_CACHE_SIZE, PROMPT_CACHE_KEY_PROVIDERS,
+)
+from .prompts import PREFIX_ID
 
 
-class LLMWrapper:
+class ValidationCache:
+    """
+    Process-wide, thread-safe cache of credential checks keyed by
+    (provider, sha256(api_key), model). Failures are cached too, for a shorter
+    TTL; a check that couldn't tell (None: network error, 5xx, 429) is not.
+    Concurrent sessions checking the same key wait on a single in-flight check.
+    """
+    def __init__(self, ttl=VALIDATION_TTL, negative_ttl=VALIDATION_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = {}  # key -> (ok, expires_at)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(provider, api_key, model_name):
+        return (provider, hashlib.sha256((api_key or "").encode("utf-8")).hexdigest(), model_name)
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def get_or_check(self, key, check):
+        with self._lock:
+            ok = self._lookup(key)
+            if ok is not None:
+                self.hits += 1
+                return ok
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                ok = self._lookup(key)
+                if ok is not None:  # filled while we waited
+                    self.hits += 1
+                    return ok
+                self.misses += 1
+            ok = check()
+            if ok is None:
+                return None
+            ok = bool(ok)
+            with self._lock:
+                self._entries[key] = (ok, time.monotonic() + (self.ttl if ok else self.negative_ttl))
+            return ok
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+                self._key_locks.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+validation_cache = ValidationCache()
+
+
+class ResponseCache:
+    """
+    Exact-match cache of complete replies, for temperature 0 only: the same
+    provider, model, system prefix and prompt give the same reply. An in-memory
+    LRU sits in front of the persistent result cache, so replays survive restarts.
+    """
+    def __init__(self, size=RESPONSE_CACHE_SIZE, namespace="llm_response"):
+        self.size = size
+        self.namespace = namespace
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(provider, model_name, prompt) -> str:
+        raw = f"{provider}|{model_name}|{PREFIX_ID}|{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _store(self):
+        from .result_cache import get_result_cache
+        return get_result_cache(self.namespace)
+
+    def get(self, key: str):
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+        if text is None:
+            text = self._store().get(key)
+            if text is not None:
+                self._remember(key, text)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        metrics.RESPONSE_CACHE.inc(result="miss" if text is None else "hit")
+        return text
+
+    def set(self, key: str, text: str):
+        self._remember(key, text)
+        self._store().set(key, text)
+
+    def _remember(self, key, text):
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.size:
+                self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "in_memory": len(self._memory),
+                    "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+response_cache = ResponseCache()
+
+
+_http_clients = {}
+_limiters = {}
+_shared_lock = threading.Lock()
+
+
+def shared_http_clients(provider):
+    """One pooled (httpx.Client, httpx.AsyncClient) pair per provider, shared by every wrapper"""
+    with _shared_lock:
+        if provider not in _http_clients:
+            import httpx
+            limits = httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS)
+            _http_clients[provider] = (httpx.Client(limits=limits), httpx.AsyncClient(limits=limits))
+        return _http_clients[provider]
+
+
+def shared_limiter(provider, api_key=None, model_name=None) -> FairRateLimiter:
+    """
+    RPM/TPM limiter with fair per-session queueing, one per (provider, key, model):
+    providers meter each model of an account separately.
+    """
+    key = ValidationCache.make_key(provider, api_key, model_name)
+    with _shared_lock:
+        if key not in _limiters:
+            rpm, tpm = RATE_LIMITS.get(provider, RATE_LIMITS["default"])
+            _limiters[key] = FairRateLimiter(rpm, tpm, LLM_MAX_CONCURRENCY)
+        return _limiters[key]
+
+
+def forget_shared_state(key):
+    """
+    Drop the limiter and cached validation of a (provider, key hash, model)
+    nobody uses any more. A limiter with calls in flight or queued is kept.
+    """
+    with _shared_lock:
+        limiter = _limiters.get(key)
+        if limiter is not None and not limiter.in_flight and not limiter.queued():
+            del _limiters[key]
+    validation_cache.invalidate(key)
+
+
+def shared_state_stats() -> dict:
+    with _shared_lock:
+        return {"http_pools": len(_http_clients), "limiters": len(_limiters),
+                "validations": validation_cache.stats()["entries"]}
+
+
+def import_class(path: str):
+    """Class from a "module.Class" path, importing the module on first use"""
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token), good enough for rate limiting"""
+    return max(1, len(text) // 4)
+
+
+_DONE = object()
+_ADMITTED = object()
+
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+
+def _status_code(exc):
+    for obj in (exc, getattr(exc, "response", None)):
+        code = getattr(obj, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def _retry_after(exc):
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Deadlines, retries and hedging for one LLM call.
+
+    - `timeout` bounds the whole call, retries included
+    - `first_token_timeout` runs from admission by the rate limiter, so time
+      spent queueing behind RPM/TPM limits doesn't count as a stall
+    - `idle_timeout` is the longest allowed gap between streamed chunks
+    - 429, 5xx, connection errors and first-token timeouts are retried with
+      exponential backoff and full jitter (honouring Retry-After); nothing is
+      retried once chunks have been handed to the caller
+    - with `hedge_after` > 0, a second request to `hedge_model` is raced
+      against a late first token
+    """
+    def __init__(self, timeout=LLM_TIMEOUT, first_token_timeout=LLM_FIRST_TOKEN_TIMEOUT,
+                 idle_timeout=LLM_IDLE_TIMEOUT, max_retries=LLM_MAX_RETRIES, backoff_base=LLM_BACKOFF_BASE,
+                 backoff_max=LLM_BACKOFF_MAX, hedge_after=LLM_HEDGE_AFTER, hedge_model=LLM_HEDGE_MODEL):
+        self.timeout = timeout
+        self.first_token_timeout = first_token_timeout
+        self.idle_timeout = idle_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after = hedge_after
+        self.hedge_model = hedge_model
+
+    @staticmethod
+    def retry_reason(exc):
+        """Short label when `exc` is worth retrying, else None"""
+        if isinstance(exc, LLMTimeoutError):
+            return "timeout"
+        code = _status_code(exc)
+        if code is not None:
+            return str(code) if code == 429 or code >= 500 else None
+        import httpx
+        if isinstance(exc, (httpx.TransportError, ConnectionError)) or type(exc).__name__ in (
+                "APIConnectionError", "APITimeoutError"):
+            return "connection"
+        return None
+
+    def backoff(self, attempt, exc=None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        retry_after = _retry_after(exc) if exc is not None else None
+        return max(delay, retry_after) if retry_after else delay
+
+
+default_policy = RetryPolicy()
+
+
+async def _next(agen):
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _DONE
+
+
+async def _admit_and_first(agen):
+    await _next(agen)  # _ADMITTED
+    return await _next(agen)
+
+
+class StreamingLLM:
+    """
+    Sync and async entry points over `_astream(question, session)`, which
+    subclasses implement on the shared loop (core/aio.py).
+    """
+    def _require_chain(self):
+        pass
+
+    async def _ainvoke(self, question: str, session) -> str:
+        return "".join([c async for c in self._astream(question, session)])
+
+    def stream(self, question: str, session_id=None):
+        """
+        Synchronous streaming for Streamlit scripts. The request itself runs on
+        the shared loop, so it goes through the same connection pool and limiter.
+        `session_id` defaults to the calling thread (one script thread per session).
+        """
+        self._require_chain()
+        session = session_id or threading.get_ident()
+        chunks = queue.Queue()
+
+        async def pump():
+            try:
+                async for chunk in self._astream(question, session):
+                    chunks.put((chunk, None))
+                chunks.put((_DONE, None))
+            except BaseException as e:
+                chunks.put((_DONE, e))
+
+        future = aio.submit(pump())
+        try:
+            while True:
+                chunk, error = chunks.get()
+                if chunk is _DONE:
+                    if error:
+                        raise error
+                    return
+                yield chunk
+        finally:
+            if not future.done():
+                future.cancel()
+
+    async def astream(self, question: str, session_id=None):
+        """Async streaming usable from any event loop"""
+        self._require_chain()
+        session = session_id or threading.get_ident()
+        caller_loop = asyncio.get_running_loop()
+        if caller_loop is aio.get_loop():
+            async for chunk in self._astream(question, session):
+                yield chunk
+            return
+
+        chunks = asyncio.Queue()
+
+        async def pump():
+            try:
+                async for chunk in self._astream(question, session):
+                    caller_loop.call_soon_threadsafe(chunks.put_nowait, (chunk, None))
+                caller_loop.call_soon_threadsafe(chunks.put_nowait, (_DONE, None))
+            except BaseException as e:
+                caller_loop.call_soon_threadsafe(chunks.put_nowait, (_DONE, e))
+
+        future = aio.submit(pump())
+        try:
+            while True:
+                chunk, error = await chunks.get()
+                if chunk is _DONE:
+                    if error:
+                        raise error
+                    return
+                yield chunk
+        finally:
+            if not future.done():
+                future.cancel()
+
+    async def ainvoke(self, question: str, session_id=None) -> str:
+        self._require_chain()
+        return await aio.call(self._ainvoke(question, session_id or threading.get_ident()))
+
+    async def abatch(self, questions, session_id=None, return_exceptions=False) -> list:
+        """
+        Run several prompts concurrently; the limiter still interleaves them fairly with other sessions.
+        With return_exceptions=True a failed prompt gives its exception in place of the reply.
+        """
+        self._require_chain()
+        session = session_id or threading.get_ident()
+
+        async def run_all():
+            return await asyncio.gather(*[self._ainvoke(q, session) for q in questions],
+                                        return_exceptions=return_exceptions)
+
+        return await aio.call(run_all())
+
+
+class LLMWrapper(StreamingLLM):
     """
     Universal LLM wrapper to support multiple providers & models
     """
     SUPPORTED_PROVIDERS = {
         "groq": "langchain_groq.ChatGroq",
         "openai": "langchain_openai.ChatOpenAI",
+        "fake": "core.fake_llm.FakeChatModel",  # local, deterministic; benchmarks only
         # Add future providers here
     }
 
-    def __init__(self, provider="groq", api_key=None, model_name=None, temperature=0.2):
+    # OpenAI-compatible "retrieve model" endpoints used as a cheap credential check
+    DEFAULT_BASE_URLS = {"groq": "https://api.groq.com", "openai": "https://api.openai.com/v1"}
+    MODEL_ENDPOINTS = {
+        "groq": "{base}/openai/v1/models/{model}",
+        "openai": "{base}/models/{model}",
+    }
+
+    def __init__(self, provider="groq", api_key=None, model_name=None, temperature=LLM_TEMPERATURE, policy=None):
         self.provider = provider.lower()
         self.api_key = api_key
         self.model_name = model_name
         self.temperature = temperature
+        self.policy = policy or default_policy
+        self.llm = None
+        self._hedge = None
         self.chain = None  # delay init until credentials are valid
 
         if self.api_key and self.model_name:
@@ -24,27 +407,35 @@ class LLMWrapper:
 
     def _import_class(self, path: str):
         """Dynamically import class from a string path"""
-        module_name, class_name = path.rsplit(".", 1)
-        mod = __import__(module_name, fromlist=[class_name])
-        return getattr(mod, class_name)
+        return import_class(path)
 
     def _init_chain(self):
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are TalentScout Assistant. ONLY return valid JSON, no explanations."),
-            ("user", "{question}")
-        ])
+        # LangChain and the provider SDKs are imported here, not at module load (see warm_up)
+        from langchain_core.output_parsers import StrOutputParser
+        from .prompts import chat_prompt
+
+        prompt = chat_prompt()  # static system prefix, identical on every call
 
         if self.provider not in self.SUPPORTED_PROVIDERS:
             raise ValueError(f"❌ Unsupported provider: {self.provider}")
 
         LLMClass = self._import_class(self.SUPPORTED_PROVIDERS[self.provider])
 
+        http_client, http_async_client = shared_http_clients(self.provider)
+        # Retries and timeouts are handled by RetryPolicy, not by the SDK
+        extra = {"max_retries": 0, "timeout": self.policy.timeout}
+        if LLM_BASE_URLS.get(self.provider):
+            extra["base_url"] = LLM_BASE_URLS[self.provider]
+
         if self.provider == "groq":
             llm = LLMClass(
                 groq_api_key=self.api_key,
                 model_name=self.model_name,
                 temperature=self.temperature,
                 streaming=True,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                **extra,
             )
         elif self.provider == "openai":
             llm = LLMClass(
@@ -52,26 +443,271 @@ class LLMWrapper:
                 model_name=self.model_name,
                 temperature=self.temperature,
                 streaming=True,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                **extra,
+            )
+        elif self.provider == "fake":
+            llm = LLMClass(
+                model_name=self.model_name,
+                temperature=self.temperature,
+                ttft=FAKE_LLM_TTFT,
+                tokens_per_second=FAKE_LLM_TPS,
             )
 
+        if self.provider in JSON_MODE_PROVIDERS:
+            # Provider-side JSON mode: replies are guaranteed to be a single JSON object
+            llm = llm.bind(response_format={"type": "json_object"})
+        if self.provider in PROMPT_CACHE_KEY_PROVIDERS:
+            # Requests with the same key share the provider's cache of the system prefix
+            llm = llm.bind(extra_body={"prompt_cache_key": f"talentscout-{PREFIX_ID}"})
+
+        self.llm = llm
         return prompt | llm | StrOutputParser()
 
-    def stream(self, question: str):
+    def limiter(self) -> FairRateLimiter:
+        return shared_limiter(self.provider, self.api_key, self.model_name)
+
+    def _require_chain(self):
         if not self.chain:
             raise RuntimeError("⚠️ Chain not initialized. Please provide API key and model.")
-        return self.chain.stream({"question": question})
 
-    def validate(self) -> bool:
+    def _hedge_wrapper(self):
+        """Same provider and key, `policy.hedge_model`; built on first use"""
+        if self._hedge is None:
+            self._hedge = LLMWrapper(self.provider, self.api_key, self.policy.hedge_model or self.model_name,
+                                     self.temperature, policy=RetryPolicy(hedge_after=0))
+        return self._hedge
+
+    async def _attempt(self, question: str, session):
         """
-        Check if the API key and model are valid by making a tiny test call.
-        Returns True if it works, False otherwise.
+        One rate-limited request. Yields _ADMITTED once the limiter lets it
+        through, then the streamed chunks. Closing it early releases the slot.
         """
-        if not self.chain:
-            return False
+        prompt_tokens = estimate_tokens(question)
+        limiter = self.limiter()
+        t_queued = time.perf_counter()
+        async with limiter.slot(session, prompt_tokens + LLM_OUTPUT_TOKENS_ESTIMATE) as settle:
+            t0 = time.perf_counter()
+            metrics.STAGE_SECONDS.observe(t0 - t_queued, stage="llm_queue")
+            yield _ADMITTED
+            output_chars = 0
+            outcome = "error"
+            try:
+                async for chunk in self.chain.astream({"question": question}):
+                    if not output_chars and chunk:
+                        metrics.LLM_TTFT_SECONDS.observe(time.perf_counter() - t0, provider=self.provider)
+                    output_chars += len(chunk)
+                    yield chunk
+                outcome = "ok"
+            except (asyncio.CancelledError, GeneratorExit):
+                outcome = "cancelled"
+                raise
+            finally:
+                settle(prompt_tokens + output_chars // 4)
+                metrics.STAGE_SECONDS.observe(time.perf_counter() - t0, stage="llm_stream")
+                metrics.LLM_REQUESTS.inc(provider=self.provider, outcome=outcome)
+                metrics.LLM_TOKENS.inc(prompt_tokens, direction="prompt")
+                metrics.LLM_TOKENS.inc(output_chars // 4, direction="completion")
 
+    async def _first_token(self, question: str, session, deadline):
+        """
+        Start a request and wait for its first chunk, hedging if it is late.
+        Returns (stream, first_chunk, model that answered); the losing request is cancelled.
+        """
+        policy = self.policy
+        primary = self._attempt(question, session)
+        try:
+            await asyncio.wait_for(_next(primary), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError(f"⚠️ The model did not respond within {policy.timeout:g}s")
+        first_deadline = min(deadline, time.monotonic() + policy.first_token_timeout)
+        racers = {asyncio.ensure_future(_next(primary)): primary}
         try:
-            # Just send a simple ping
-            resp = "".join([c for c in self.chain.stream({"question": "ping"})])
-            return bool(resp.strip())
+            hedge_at = time.monotonic() + policy.hedge_after
+            if policy.hedge_after > 0 and hedge_at < first_deadline:
+                done, _ = await asyncio.wait(racers, timeout=policy.hedge_after)
+                if not done:
+                    hedge = self._hedge_wrapper()._attempt(question, session)
+                    racers[asyncio.ensure_future(_admit_and_first(hedge))] = hedge
+            error = None
+            while racers:
+                remaining = first_deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(racers, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    stream = racers.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        await stream.aclose()
+                        continue
+                    if stream is not primary:
+                        metrics.LLM_HEDGES.inc(provider=self.provider, winner="hedge")
+                        return stream, task.result(), self._hedge_wrapper().model_name
+                    if len(racers):
+                        metrics.LLM_HEDGES.inc(provider=self.provider, winner="primary")
+                    return stream, task.result(), self.model_name
+            if error is not None:
+                raise error
+            raise LLMTimeoutError(f"⚠️ No response from the model within {policy.first_token_timeout:g}s")
+        finally:
+            for task, stream in racers.items():
+                task.cancel()
+                try:
+                    await task
+                except BaseException:
+                    pass
+                await stream.aclose()
+
+    async def _astream(self, question: str, session):
+        """Replays from the response cache at temperature 0, otherwise streams from the provider"""
+        if not RESPONSE_CACHE or self.temperature != 0:
+            async for chunk in self._astream_live(question, session):
+                yield chunk
+            return
+
+        key = response_cache.make_key(self.provider, self.model_name, question)
+        cached = await asyncio.to_thread(response_cache.get, key)
+        if cached is not None:
+            yield cached
+            return
+        parts, served = [], []
+        async for chunk in self._astream_live(question, session, served):
+            parts.append(chunk)
+            yield chunk
+        # A hedged reply came from the hedge model: it is cached under that model, not this one
+        key = response_cache.make_key(self.provider, served[0], question)
+        await asyncio.to_thread(response_cache.set, key, "".join(parts))
+
+    async def _astream_live(self, question: str, session, served=None):
+        """
+        Rate-limited streaming with deadlines, retries and hedging; runs on the shared loop (core/aio.py).
+        The model that answered is appended to `served`.
+        """
+        policy = self.policy
+        deadline = time.monotonic() + policy.timeout
+        for attempt in range(policy.max_retries + 1):
+            try:
+                stream, chunk, model_name = await self._first_token(question, session, deadline)
+                break
+            except Exception as e:
+                reason = policy.retry_reason(e)
+                delay = policy.backoff(attempt, e)
+                if reason == "429":
+                    # Throttled: hold every session's requests to this provider, not just ours
+                    self.limiter().pause(_retry_after(e) or delay)
+                if reason is None or attempt == policy.max_retries or time.monotonic() + delay >= deadline:
+                    raise
+                metrics.LLM_RETRIES.inc(provider=self.provider, reason=reason)
+                await asyncio.sleep(delay)
+
+        if served is not None:
+            served.append(model_name)
+        try:
+            while chunk is not _DONE:
+                yield chunk
+                timeout = min(policy.idle_timeout, deadline - time.monotonic())
+                try:
+                    chunk = await asyncio.wait_for(_next(stream), max(0.0, timeout))
+                except asyncio.TimeoutError:
+                    raise LLMTimeoutError("⚠️ The model stopped responding mid-answer")
+        finally:
+            await stream.aclose()
+
+    @staticmethod
+    def limiter_stats() -> dict:
+        with _shared_lock:
+            limiters = dict(_limiters)
+        return {f"{provider}:{model}:{key[:8]}": limiter.stats() for (provider, key, model), limiter in limiters.items()}
+
+    def _check_model_endpoint(self):
+        """
+        GET the provider's model endpoint. Returns True/False when the answer is
+        conclusive (200 vs 401/403/404), None otherwise.
+        """
+        url = self.MODEL_ENDPOINTS.get(self.provider)
+        if not url:
+            return None
+        base = LLM_BASE_URLS.get(self.provider) or self.DEFAULT_BASE_URLS[self.provider]
+        try:
+            import httpx
+            resp = httpx.get(
+                url.format(base=base.rstrip("/"), model=self.model_name),
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=10,
+            )
         except Exception:
+            return None
+        if resp.status_code == 200:
+            return True
+        if resp.status_code in (401, 403, 404):
             return False
+        return None
+
+    def _check_completion(self):
+        """
+        Fallback: a single-token completion, bypassing the JSON-only prompt.
+        False only when the provider rejects the key; None when it can't be reached.
+        """
+        try:
+            resp = self.llm.bind(max_tokens=1).invoke("ping")
+            return resp is not None
+        except Exception as e:
+            return False if _status_code(e) in (401, 403) else None
+
+    def _check(self):
+        ok = self._check_model_endpoint()
+        if ok is None:
+            ok = self._check_completion()
+        return ok
+
+    def validate(self):
+        """
+        Check if the API key and model are valid: True, False, or None when the
+        provider couldn't be reached to tell. Results are shared across sessions
+        through `validation_cache`.
+        """
+        if not self.chain:
+            return False
+        key = ValidationCache.make_key(self.provider, self.api_key, self.model_name)
+        with metrics.STAGE_SECONDS.time(stage="validate"):
+            return validation_cache.get_or_check(key, self._check)
+
+    @staticmethod
+    def validation_stats() -> dict:
+        return validation_cache.stats()
+
+    @staticmethod
+    def response_cache_stats() -> dict:
+        return response_cache.stats()
+
+
+_warmed = set()
+
+
+def warm_up(provider: str):
+    """
+    Import LangChain and the provider's SDK and open its pooled HTTP clients in a
+    background thread, once per provider per process. Call it as soon as the
+    user has typed an API key, so the first chain build doesn't pay for it.
+    """
+    provider = (provider or "").lower()
+    with _shared_lock:
+        if provider in _warmed or provider not in LLMWrapper.SUPPORTED_PROVIDERS:
+            return
+        _warmed.add(provider)
+
+    def run():
+        with metrics.STAGE_SECONDS.time(stage="warm_up"):
+            try:
+                import langchain_core.prompts, langchain_core.output_parsers  # noqa: F401
+                import_class(LLMWrapper.SUPPORTED_PROVIDERS[provider])
+                if provider != "fake":
+                    shared_http_clients(provider)
+            except Exception:
+                pass  # the real build reports it
+
+    threading.Thread(target=run, name=f"warm-up-{provider}", daemon=True).start()
@@ -0,0 +1,191 @@
+"""
+Lightweight Prometheus-style metrics for the interview pipeline.
+
+Counters and histograms are process-wide. Exposed in the Prometheus text
+format on http://127.0.0.1:METRICS_PORT/metrics and/or written to
+METRICS_FILE every few seconds. No extra dependencies.
+"""
+import bisect, os, sys, threading, time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .config import METRICS_PORT, METRICS_FILE, METRICS_FILE_INTERVAL
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_lock = threading.Lock()
+_metrics = {}
+
+
+def _label_key(labels: dict):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with _lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels):
+        with _lock:
+            series = self._series.get(_label_key(labels))
+            return series[-1] if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+def counter(name, help_text) -> Counter:
+    with _lock:
+        return _metrics.setdefault(name, Counter(name, help_text))
+
+
+def histogram(name, help_text, buckets=DEFAULT_BUCKETS) -> Histogram:
+    with _lock:
+        return _metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+
+def render() -> str:
+    with _lock:
+        metrics = list(_metrics.values())
+    lines = []
+    for metric in metrics:
+        with _lock:
+            lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---- Pipeline metrics ----
+STAGE_SECONDS = histogram("talentscout_stage_seconds", "Duration of pipeline stages")
+LLM_TTFT_SECONDS = histogram("talentscout_llm_ttft_seconds", "Time to first streamed chunk")
+PROMPT_TOKENS = histogram("talentscout_prompt_tokens", "Prompt size in tokens by kind",
+                          buckets=(32, 64, 128, 256, 512, 1024, 2048, 4096, 8192))
+LLM_TOKENS = counter("talentscout_llm_tokens_total", "Estimated LLM tokens by direction")
+LLM_REQUESTS = counter("talentscout_llm_requests_total", "LLM calls by provider and outcome")
+LLM_RETRIES = counter("talentscout_llm_retries_total", "LLM call retries by reason")
+LLM_HEDGES = counter("talentscout_llm_hedges_total", "Hedged LLM requests by winner")
+LLM_FAILOVERS = counter("talentscout_llm_failovers_total", "Calls moved to another backend after an error")
+LLM_BREAKER_TRIPS = counter("talentscout_llm_breaker_trips_total", "Circuit breaker openings by backend")
+CHAIN_POOL = counter("talentscout_chain_pool_total", "Chain pool leases (hit/miss) and evictions")
+QUESTION_PREFETCH = counter("talentscout_question_prefetch_total",
+                            "Speculative question generations started, used, discarded, cancelled, failed")
+SESSIONS = counter("talentscout_sessions_total", "Interview sessions created, resumed, archived and expired")
+SESSION_STORE = counter("talentscout_session_store_total", "Session checkpoint saves and loads by result")
+PRESCORE = counter("talentscout_prescore_total", "Answers scored locally (by reason) or sent to the LLM")
+LLM_CALLS_SAVED = counter("talentscout_llm_calls_saved_total", "LLM calls avoided by local pre-scoring, by stage")
+JOBS = counter("talentscout_jobs_total", "Background jobs by kind: enqueued, deduplicated, done, retried, failed, cancelled")
+RESPONSE_CACHE = counter("talentscout_response_cache_total", "Exact-match LLM response cache lookups by result")
+JSON_PARSE = counter("talentscout_json_parse_total", "Structured-output parse path taken")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_started = False
+
+
+def _write_file_forever(path, interval):
+    last_error = None
+    while True:
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(render())
+            os.replace(tmp, path)
+            last_error = None
+        except OSError as e:
+            # A full disk or a missing directory shouldn't stop the exporter for good; log each new error once
+            if str(e) != last_error:
+                print(f"⚠️ Could not write metrics to {path}: {e}", file=sys.stderr)
+            last_error = str(e)
+        time.sleep(interval)
+
+
+def start_exporters():
+    """Start the HTTP endpoint and/or file writer once per process (no-op when not configured)"""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    if METRICS_PORT:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", METRICS_PORT), _Handler)
+        except OSError:
+            server = None  # another worker on this host already serves the port
+        if server:
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    if METRICS_FILE:
+        threading.Thread(
+            target=_write_file_forever, args=(METRICS_FILE, METRICS_FILE_INTERVAL), name="metrics-file", daemon=True
+        ).start()
@@ -0,0 +1,230 @@
+"""
+Shared structured-output parsing for LLM replies.
+
+`parse_structured(raw, schema)` does a single brace-balanced pass over the
+text (string- and escape-aware), collects the balanced `{...}` spans,
+outermost first, and returns the first one that decodes and validates
+against a typed schema. Unlike the old greedy first-`{`-to-last-`}` regex
+it is not fooled by chatty output, trailing prose or several JSON objects
+in one reply.
+
+`parse_or_repair(chain, raw, schema)` adds one targeted repair call when
+parsing fails and raises `ParseError` instead of silently returning `{}`.
+"""
+import json, re
+from dataclasses import dataclass, field, asdict
+from . import metrics
+
+
+_OBJECT_START = re.compile(r'\{\s*"')
+_decoder = json.JSONDecoder()
+
+
+class ParseError(ValueError):
+    pass
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def _str(data, key, required=True):
+    value = data.get(key)
+    if value is None:
+        if required:
+            raise SchemaError(f"missing '{key}'")
+        return ""
+    if not isinstance(value, str):
+        value = str(value)
+    return value.strip()
+
+
+def _score(data, key="score"):
+    value = data.get(key)
+    if isinstance(value, bool):
+        raise SchemaError(f"'{key}' is not a number")
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        text = value.strip().split("/")[0]  # "7/10"
+        try:
+            number = float(text)
+        except ValueError:
+            raise SchemaError(f"'{key}' is not a number: {value!r}")
+        return int(number) if number.is_integer() else number
+    raise SchemaError(f"missing '{key}'")
+
+
+@dataclass
+class Question:
+    question: str
+    expected_answer_outline: str = ""
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise SchemaError("question is not an object")
+        question = _str(data, "question")
+        if not question:
+            raise SchemaError("empty 'question'")
+        return cls(question, _str(data, "expected_answer_outline", required=False))
+
+
+@dataclass
+class QuestionSet:
+    FORMAT = '{"questions": [{"question": "string", "expected_answer_outline": "string"}]}'
+    questions: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data):
+        items = data.get("questions") if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            raise SchemaError("'questions' must be a non-empty list")
+        return cls([Question.from_dict(q) for q in items])
+
+
+@dataclass
+class AnswerScore:
+    FORMAT = '{"score": 7, "feedback": "..."}'
+    score: float
+    feedback: str = ""
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise SchemaError("not an object")
+        return cls(_score(data), _str(data, "feedback", required=False))
+
+
+@dataclass
+class EvaluationItem:
+    question: str
+    score: float
+    feedback: str = ""
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise SchemaError("result is not an object")
+        return cls(_str(data, "question", required=False), _score(data), _str(data, "feedback", required=False))
+
+
+@dataclass
+class Evaluation:
+    FORMAT = '{"results": [{"question": "...", "score": 7, "feedback": "..."}], "final_average_score": 8}'
+    results: list = field(default_factory=list)
+    final_average_score: float = None
+
+    @classmethod
+    def from_dict(cls, data):
+        items = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            raise SchemaError("'results' must be a non-empty list")
+        results = [EvaluationItem.from_dict(r) for r in items]
+        try:
+            average = _score(data, "final_average_score")
+        except SchemaError:
+            average = round(sum(r.score for r in results) / len(results), 1)
+        return cls(results, average)
+
+
+def to_dict(obj) -> dict:
+    return asdict(obj)
+
+
+def json_spans(text: str):
+    """
+    Balanced `{...}` spans of `text` as (start, end) pairs: outermost spans
+    first, then nested ones, each group in order of appearance.
+    One pass; quotes only count inside braces, so apostrophes in prose are
+    harmless. Unmatched braces in prose are skipped.
+    """
+    spans = []  # (depth, start, end)
+    starts = []
+    in_string = escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            if starts:
+                in_string = True
+        elif ch == "{":
+            starts.append(i)
+        elif ch == "}" and starts:
+            start = starts.pop()
+            spans.append((len(starts), start, i + 1))
+    # Depth is relative to unmatched prose braces still open; sort shallowest first
+    spans.sort()
+    return [(start, end) for _, start, end in spans]
+
+
+def parse_structured(raw: str, schema, kind=None):
+    """Return the first object in `raw` that validates against `schema`, or raise ParseError"""
+    kind = kind or schema.__name__
+    text = (raw or "").strip()
+    try:
+        result = schema.from_dict(json.loads(text))
+        metrics.JSON_PARSE.inc(kind=kind, path="json")
+        return result
+    except (ValueError, SchemaError):
+        pass
+    # Decode budget keeps the total work linear even for deeply nested replies
+    budget = 2 * len(text) + 1024
+    for start, end in json_spans(text):
+        if not _OBJECT_START.match(text, start):
+            continue  # "{x}" in prose can't be a JSON object with keys
+        budget -= end - start
+        if budget < 0:
+            break
+        try:
+            result = schema.from_dict(json.loads(text[start:end]))
+        except (ValueError, SchemaError):
+            continue
+        metrics.JSON_PARSE.inc(kind=kind, path="scan")
+        return result
+    # A stray quote after an unmatched "{" in prose flips the scanner's string
+    # state; decode directly from each '{"' instead, within the same budget
+    budget = 2 * len(text) + 1024
+    for match in _OBJECT_START.finditer(text):
+        start = match.start()
+        try:
+            data, end = _decoder.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            budget -= e.pos - start
+        else:
+            budget -= end - start
+            try:
+                result = schema.from_dict(data)
+            except SchemaError:
+                result = None
+            if result is not None:
+                metrics.JSON_PARSE.inc(kind=kind, path="decode")
+                return result
+        if budget < 0:
+            break
+    metrics.JSON_PARSE.inc(kind=kind, path="failed")
+    raise ParseError(f"No valid {schema.__name__} JSON in model output")
+
+
+def repair_prompt(raw: str, schema) -> str:
+    # Task layout of core/prompts.py: the instructions are in the shared system prefix
+    return f"Task: REPAIR\nFormat: {schema.FORMAT}\n{raw[:4000]}"
+
+
+def parse_or_repair(chain, raw: str, schema, kind=None):
+    """parse_structured, plus one repair round-trip through `chain` if that fails"""
+    kind = kind or schema.__name__
+    try:
+        return parse_structured(raw, schema, kind)
+    except ParseError:
+        if chain is None:
+            raise
+    repaired = "".join([c for c in chain.stream(repair_prompt(raw, schema))])
+    result = parse_structured(repaired, schema, kind)
+    metrics.JSON_PARSE.inc(kind=kind, path="repair")
+    return result
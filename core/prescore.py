@@ -0,0 +1,94 @@
+"""
+Local pre-scoring: answers that are clearly not answers get a score without
+an LLM call.
+
+    result = prescore({"q": {"question", "expected_answer_outline"}, "a": text})
+
+returns {"question", "score", "feedback", "prescored": reason} for a trivial
+answer and None for anything that deserves the model:
+
+- empty:           nothing but whitespace and punctuation
+- non_answer:      only "idk", "no idea", "pass", "skip" and the like
+- copied_question: fewer than PRESCORE_MIN_NOVELTY of its words and word
+                   pairs are new compared with the question
+- too_short:       fewer than PRESCORE_MIN_WORDS content words (i.e. one),
+                   none of them in the expected answer outline
+
+Overlap is computed on bags of stemmed word 1- and 2-grams (stop words
+dropped) with set intersections. A short answer that names a keyword of the
+outline ("caching") still goes to the model. The checks are conservative on
+purpose: a real answer the heuristics miss costs one LLM call, while a real
+answer scored locally would be wrong.
+"""
+import re
+from .config import PRESCORE, PRESCORE_MIN_WORDS, PRESCORE_MIN_NOVELTY
+
+_WORDS = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+STOP_WORDS = frozenset(
+    "a an the and or but if then so of to in on at by for with from as is are was were be been being it its "
+    "this that these those i you he she we they me my your our their do does did can could would should will "
+    "what how why when where which who whom there here not no yes".split()
+)
+NON_ANSWERS = frozenset(_WORDS.findall(
+    "idk dunno no idea not sure don't know i do not know pass skip next none n/a na nothing "
+    "sorry unknown no clue no comment"
+))
+SCORES = {
+    "empty": (1, "⚠️ No answer was given."),
+    "non_answer": (1, "⚠️ The candidate did not attempt this question."),
+    "copied_question": (1, "⚠️ The answer repeats the question instead of answering it."),
+    "too_short": (2, "⚠️ The answer is too short to show understanding of the topic."),
+}
+
+
+def _words(text) -> list:
+    return [w.rstrip(".") for w in _WORDS.findall(str(text or "").lower())]
+
+
+def _stem(word: str) -> str:
+    # Just enough for "caching" to meet "cache" and "indexes" to meet "index"
+    for suffix in ("ing", "es", "ed", "e", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def ngrams(words: list) -> set:
+    """Stemmed content words and adjacent content-word pairs"""
+    content = [_stem(w) for w in words if w not in STOP_WORDS]
+    return set(content) | set(zip(content, content[1:]))
+
+
+def overlap(answer: set, reference: set) -> float:
+    """Share of the answer's n-grams that also occur in `reference`"""
+    return len(answer & reference) / len(answer) if answer else 0.0
+
+
+def trivial_reason(question: str, outline: str, text: str):
+    """Why `text` is not a real answer to `question`, or None"""
+    words = _words(text)
+    if not words:
+        return "empty"
+    if all(w in NON_ANSWERS for w in words) and len(words) <= 6:
+        return "non_answer"
+    grams = ngrams(words)
+    if not grams:
+        return "non_answer"  # only stop words: "no", "what?", "I do not"
+    if 1 - overlap(grams, ngrams(_words(question))) < PRESCORE_MIN_NOVELTY:
+        return "copied_question"
+    content = [w for w in words if w not in STOP_WORDS]
+    if len(content) < PRESCORE_MIN_WORDS and not grams & ngrams(_words(outline)):
+        return "too_short"
+    return None
+
+
+def prescore(answer: dict):
+    """A local score for a trivial {"q", "a"} pair, or None when the LLM should score it"""
+    if not PRESCORE:
+        return None
+    q = answer.get("q") or {}
+    reason = trivial_reason(q.get("question", ""), q.get("expected_answer_outline", ""), answer.get("a", ""))
+    if reason is None:
+        return None
+    score, feedback = SCORES[reason]
+    return {"question": q.get("question", ""), "score": score, "feedback": feedback, "prescored": reason}
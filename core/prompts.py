@@ -0,0 +1,132 @@
+"""
+Prompt construction with a local token budget.
+
+Every chain sends the same system message, `SYSTEM_PREFIX`: the role, the
+rules and every response schema. It is byte-identical across calls, so
+providers with prompt caching reuse it (see `PREFIX_ID`). The user message
+carries only a task line and that call's input:
+
+    Task: ANSWER
+    {"q":"...","ref":"...","a":"..."}
+
+Every prompt the interview pipeline sends is built here:
+
+- question generation sees only the normalized profile (position, experience
+  bucket, skills), never names, contacts or profile links
+- answers go out as compact JSON (`{"q", "ref", "a"}`), whitespace collapsed
+  and truncated to their share of the budget
+- response formats are one-line JSON, in the system prefix
+
+`count_tokens` uses tiktoken's cl100k_base when it is installed and a local
+approximation of it otherwise. Prompt sizes are recorded in the
+talentscout_prompt_tokens histogram by kind.
+"""
+import hashlib, json, math, re
+from .config import PROMPT_ANSWER_TOKENS, PROMPT_EVAL_TOKENS, PROMPT_MAX_SKILLS
+from .parsing import AnswerScore, Evaluation, QuestionSet
+from . import metrics
+
+SYSTEM_PREFIX = f"""You are TalentScout Assistant, a technical interviewer. Reply with ONE JSON object and nothing else: no prose, no code fences.
+Each request starts with a task line, followed by its input as compact JSON.
+Task QUESTIONS <count>: generate that many technical interview questions for the candidate profile (position, experience in years, skills). Output: {QuestionSet.FORMAT}
+Task ANSWER: score the answer "a" to question "q" from 1 to 10 against the reference outline "ref" and give brief feedback. Output: {AnswerScore.FORMAT}
+Task EVALUATION: score each answer in the list the same way, with feedback, and give the average. Output: {Evaluation.FORMAT}
+Task REPAIR: the input was supposed to be JSON in the given format. Output only the corrected JSON."""
+
+# Changes whenever the prefix does; used as the provider-side prompt cache key
+PREFIX_ID = hashlib.sha256(SYSTEM_PREFIX.encode("utf-8")).hexdigest()[:12]
+
+# Roughly how BPE vocabularies pre-split text: contractions, words with their
+# leading space, up to 3 digits, punctuation runs, whitespace
+_PIECES = re.compile(r"'(?:s|t|re|ve|m|ll|d)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+")
+_encoder = None
+
+
+def _tiktoken():
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoder = False
+    return _encoder
+
+
+def _approx(piece: str) -> int:
+    body = piece.strip()
+    if not body:
+        return 1
+    if body[0].isalpha():
+        return max(1, math.ceil(len(body) / 6))  # common words are one token, long ones split
+    return max(1, math.ceil(len(body) / 2))
+
+
+def count_tokens(text: str) -> int:
+    encoder = _tiktoken()
+    if encoder:
+        return len(encoder.encode(text, disallowed_special=()))
+    return sum(_approx(piece) for piece in _PIECES.findall(text))
+
+
+def truncate(text, max_tokens: int) -> str:
+    """Collapse whitespace and cut to about `max_tokens`, marking the cut with …"""
+    text = " ".join(str(text or "").split())
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoder = _tiktoken()
+    if encoder:
+        return encoder.decode(encoder.encode(text, disallowed_special=())[:max_tokens - 1]) + "…"
+    kept, used = [], 1
+    for match in _PIECES.finditer(text):
+        used += _approx(match.group())
+        if used > max_tokens:
+            break
+        kept.append(match.group())
+    return "".join(kept).rstrip() + "…"
+
+
+def compact_json(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _record(kind: str, prompt: str) -> str:
+    metrics.PROMPT_TOKENS.observe(count_tokens(prompt), kind=kind)
+    return prompt
+
+
+def chat_prompt():
+    """(system prefix, user) prompt template shared by every chain"""
+    from langchain_core.messages import SystemMessage
+    from langchain_core.prompts import ChatPromptTemplate
+
+    # A message object, not a template: the schemas' braces stay literal
+    return ChatPromptTemplate.from_messages([SystemMessage(content=SYSTEM_PREFIX), ("user", "{question}")])
+
+
+def question_prompt(profile: dict, count="3 to 5") -> str:
+    """Question generation from a normalize_profile() dict"""
+    item = {"position": profile["position"], "experience": profile["experience"],
+            "skills": profile["tech_stack"][:PROMPT_MAX_SKILLS]}
+    return _record("questions", f"Task: QUESTIONS {count}\n{compact_json(item)}")
+
+
+def _answer_item(answer: dict, answer_tokens: int) -> dict:
+    q = answer.get("q") or {}
+    return {
+        "q": truncate(q.get("question", ""), 120),
+        "ref": truncate(q.get("expected_answer_outline", ""), max(answer_tokens // 4, 40)),
+        "a": truncate(answer.get("a", ""), answer_tokens),
+    }
+
+
+def answer_prompt(answer: dict) -> str:
+    """Score one {"q": question, "a": answer} pair; "ref" is the expected answer outline"""
+    return _record("answer", f"Task: ANSWER\n{compact_json(_answer_item(answer, PROMPT_ANSWER_TOKENS))}")
+
+
+def evaluation_prompt(answers: list) -> str:
+    """Score all answers in one call; the budget is shared evenly between them"""
+    share = max(PROMPT_EVAL_TOKENS // max(len(answers), 1), 40)
+    items = [_answer_item(answer, min(share, PROMPT_ANSWER_TOKENS)) for answer in answers]
+    return _record("evaluation", f"Task: EVALUATION\n{compact_json(items)}")
@@ -0,0 +1,275 @@
+import threading, time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from .config import (
+    QUESTION_BANK_SIZE, QUESTION_BANK_SETS, QUESTION_BANK_WORKERS, QUESTION_PREFETCH, QUESTION_PREFETCH_WORKERS,
+)
+from .json_stream import JsonItemStream, stream_json_items
+from .parsing import Question, QuestionSet, SchemaError, parse_or_repair, to_dict
+from .prompts import question_prompt
+from .result_cache import get_result_cache
+from . import metrics
+
+EXPERIENCE_BUCKETS = [(0, "fresher"), (2, "1-2"), (5, "3-5"), (10, "6-10")]
+
+
+def experience_bucket(years) -> str:
+    try:
+        years = int(years or 0)
+    except (TypeError, ValueError):
+        years = 0
+    for limit, label in EXPERIENCE_BUCKETS:
+        if years <= limit:
+            return label
+    return "10+"
+
+
+def normalize_profile(candidate: dict) -> dict:
+    """The only candidate fields that reach the question prompt: no PII"""
+    positions = candidate.get("desired_positions") or [""]
+    return {
+        "position": (positions[0] or "").strip().lower(),
+        "experience": experience_bucket(candidate.get("years_exp")),
+        "tech_stack": sorted({s.strip().lower() for s in candidate.get("tech_stack", []) if s.strip()}),
+    }
+
+
+def profile_key(profile: dict) -> str:
+    return f"{profile['position']}|{profile['experience']}|{','.join(profile['tech_stack'])}"
+
+
+def _unless_stopped(chunks, stop):
+    for chunk in chunks:
+        if stop.is_set():
+            raise CancelledError("question generation cancelled")
+        yield chunk
+
+
+def generate_questions(chain, profile: dict, on_question=None, stop=None) -> list:
+    """
+    Stream question generation for `profile`. `on_question(questions)` is called
+    each time a new question object closes, so callers can render incrementally.
+    Setting the `stop` event abandons the stream (CancelledError).
+    """
+    parser = JsonItemStream()
+    questions = []
+    t0 = time.perf_counter()
+    chunks = chain.stream(question_prompt(profile))
+    if stop is not None:
+        chunks = _unless_stopped(chunks, stop)
+    for item in stream_json_items(chunks, parser):
+        try:
+            question = to_dict(Question.from_dict(item))
+        except SchemaError:
+            continue
+        if len(questions) < 5:
+            if not questions:
+                metrics.STAGE_SECONDS.observe(time.perf_counter() - t0, stage="first_question")
+            questions.append(question)
+            if on_question:
+                on_question(questions)
+    metrics.STAGE_SECONDS.observe(time.perf_counter() - t0, stage="generate_questions")
+    if questions:
+        metrics.JSON_PARSE.inc(kind="questions", path="stream")
+        return questions
+    with metrics.STAGE_SECONDS.time(stage="json_parse"):
+        question_set = parse_or_repair(chain, parser.text, QuestionSet, kind="questions")
+    return [to_dict(q) for q in question_set.questions[:5]]
+
+
+class QuestionBank:
+    """
+    Question sets cached by normalized profile. Each key holds a small pool of
+    sets (QUESTION_BANK_SETS) served round-robin; a hit schedules a background
+    refill until the pool is full. Hot keys live in a size-bounded in-memory LRU
+    backed by the persistent result cache.
+    """
+    def __init__(self, max_keys=QUESTION_BANK_SIZE, sets_per_key=QUESTION_BANK_SETS):
+        self.max_keys = max_keys
+        self.sets_per_key = sets_per_key
+        self._lru = OrderedDict()  # key -> {"sets": [...], "next": int}
+        self._lock = threading.Lock()
+        self._disk = get_result_cache("question_bank")
+        self._executor = ThreadPoolExecutor(max_workers=QUESTION_BANK_WORKERS, thread_name_prefix="qbank")
+        self._refilling = set()
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+
+    def _entry(self, key):
+        entry = self._lru.get(key)
+        if entry is None:
+            entry = self._disk.get(key)
+            if entry is None:
+                return None
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_keys:
+            self._lru.popitem(last=False)
+        return entry
+
+    def get(self, profile: dict, chain=None):
+        """Return a cached question set for `profile` or None; refills in the background when `chain` is given"""
+        key = profile_key(profile)
+        with self._lock:
+            entry = self._entry(key)
+            if not entry or not entry["sets"]:
+                self.misses += 1
+                return None
+            self.hits += 1
+            questions = [dict(q) for q in entry["sets"][entry["next"] % len(entry["sets"])]]
+            entry["next"] = (entry["next"] + 1) % len(entry["sets"])
+            needs_refill = len(entry["sets"]) < self.sets_per_key
+        if chain and needs_refill:
+            self.refill(profile, chain)
+        return questions
+
+    def put(self, profile: dict, questions: list):
+        if not questions:
+            return
+        key = profile_key(profile)
+        with self._lock:
+            entry = self._entry(key) or {"sets": [], "next": 0}
+            if questions not in entry["sets"]:
+                entry["sets"] = (entry["sets"] + [questions])[-self.sets_per_key:]
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_keys:
+                self._lru.popitem(last=False)
+            self._disk.set(key, entry)
+
+    def refill(self, profile: dict, chain):
+        key = profile_key(profile)
+        with self._lock:
+            if key in self._refilling:
+                return
+            self._refilling.add(key)
+
+        def run():
+            try:
+                self.put(profile, generate_questions(chain, profile))
+                self.refills += 1
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refilling.discard(key)
+
+        self._executor.submit(run)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "refills": self.refills, "keys": len(self._lru)}
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = QuestionBank()
+        return _bank
+
+
+def questions_for(chain, profile: dict, on_question=None, stop=None):
+    """
+    Questions for `profile` from the cheapest source: the offline pool (built-in
+    roles/skills), then the bank, then the LLM. Returns (questions, source).
+    """
+    from .question_pool import get_question_pool
+
+    pool = get_question_pool()
+    questions = pool.select(profile) if pool else None
+    if questions is not None:
+        return questions, "pool"
+    bank = get_question_bank()
+    questions = bank.get(profile, chain)
+    if questions is not None:
+        return questions, "bank"
+    questions = generate_questions(chain, profile, on_question=on_question, stop=stop)
+    bank.put(profile, questions)
+    return questions, "llm"
+
+
+_prefetch_executor = None
+_prefetch_lock = threading.Lock()
+
+
+def prefetch_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for speculative question generation"""
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=QUESTION_PREFETCH_WORKERS,
+                                                    thread_name_prefix="qprefetch")
+        return _prefetch_executor
+
+
+class QuestionPrefetch:
+    """
+    `questions_for` started in the background from the form's partial profile,
+    before the candidate submits. `questions` fills in as the stream arrives.
+    """
+    __slots__ = ("key", "future", "questions", "stop")
+
+    def __init__(self, chain, profile: dict):
+        self.key = profile_key(profile)
+        self.questions = []
+        self.stop = threading.Event()
+        self.future = prefetch_executor().submit(questions_for, chain, profile, self._progress, self.stop)
+        metrics.QUESTION_PREFETCH.inc(event="started")
+
+    def _progress(self, questions):
+        self.questions = list(questions)
+
+    def cancel(self):
+        if not self.future.done():
+            self.stop.set()
+            self.future.cancel()
+            metrics.QUESTION_PREFETCH.inc(event="cancelled")
+
+    def result(self, profile: dict, on_question=None):
+        """
+        The questions if they were generated for `profile`, waiting for them if
+        needed and passing progress to `on_question`. None when the profile no
+        longer matches (the prefetch is cancelled) or generation failed.
+        """
+        if profile_key(profile) != self.key:
+            self.cancel()
+            metrics.QUESTION_PREFETCH.inc(event="discarded")
+            return None
+        ready, shown = self.future.done(), 0
+        while True:
+            try:
+                questions, _ = self.future.result(timeout=0.05)
+                break
+            except FutureTimeout:
+                if on_question and len(self.questions) > shown:
+                    shown = len(self.questions)
+                    on_question(self.questions)
+            except Exception:
+                metrics.QUESTION_PREFETCH.inc(event="failed")
+                return None
+        metrics.QUESTION_PREFETCH.inc(event="used", ready=str(ready).lower())
+        return questions
+
+
+def prefetch_questions(chain, candidate: dict, current=None):
+    """
+    Keep one prefetch running for the form's current position, experience and
+    skills: `current` is kept while they match, cancelled when they change or
+    are incomplete. Returns the prefetch to hold on to (or None).
+    """
+    profile = normalize_profile(candidate)
+    if not (QUESTION_PREFETCH and chain and profile["position"] and profile["tech_stack"]):
+        if current is not None:
+            current.cancel()
+        return None
+    if current is not None:
+        if current.key == profile_key(profile):
+            return current
+        current.cancel()
+    return QuestionPrefetch(chain, profile)
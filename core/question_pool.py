@@ -0,0 +1,271 @@
+"""
+Offline question pool with a memory-mapped skill/role index.
+
+Build once (needs an API key):
+
+    python -m core.question_pool build --per-combo 5 --experience fresher 1-2 3-5
+
+At runtime `get_question_pool().select(profile)` picks questions for profiles
+whose experience bucket, role and skills are all covered, without calling the
+LLM.
+
+File layout (little-endian):
+    magic b"TSQPOOL1" | u32 header length | header JSON
+    | postings (u32 question ids, grouped by tag)
+    | offsets (u64, n + 1 entries, relative to the data section)
+    | data (one compact JSON object per question)
+The header maps each tag ("skill:3-5|python", "role:3-5|backend developer",
+"pair:3-5|backend developer|python") to (first posting, count). Tags are keyed
+by experience bucket, so a fresher never gets questions written for 6-10 years.
+"""
+import argparse, asyncio, json, mmap, os, random, struct, sys, threading
+from array import array
+from bisect import bisect_left
+from .config import QUESTION_POOL_FILE, JOB_ROLES, COMMON_SKILLS, GROQ_API_KEY
+
+MAGIC = b"TSQPOOL1"
+ROLE_WEIGHT = 1.0
+SKILL_WEIGHT = 2.0
+SAMPLE_SIZE = 8
+
+
+def _contains(ids, qid) -> bool:
+    i = bisect_left(ids, qid)
+    return i < len(ids) and ids[i] == qid
+
+
+def skill_tag(experience: str, skill: str) -> str:
+    return f"skill:{experience}|{skill.strip().lower()}"
+
+
+def role_tag(experience: str, role: str) -> str:
+    return f"role:{experience}|{role.strip().lower()}"
+
+
+def pair_tag(experience: str, role: str, skill: str) -> str:
+    """Precomputed role ∩ skill posting list"""
+    return f"pair:{experience}|{role.strip().lower()}|{skill.strip().lower()}"
+
+
+def write_pool(path: str, questions: list):
+    """
+    Write `questions` ({"question", "expected_answer_outline", "skills", "roles",
+    "experience"}) in the pool format. Questions with identical text are merged.
+    """
+    merged = {}
+    for q in questions:
+        text = q.get("question", "").strip()
+        if not text:
+            continue
+        entry = merged.setdefault(text, {
+            "question": text,
+            "expected_answer_outline": q.get("expected_answer_outline", ""),
+            "skills": [], "roles": [], "experience": [],
+        })
+        for field in ("skills", "roles", "experience"):
+            for value in q.get(field, []):
+                if value not in entry[field]:
+                    entry[field].append(value)
+    records = list(merged.values())
+
+    postings_by_tag = {}
+    for qid, q in enumerate(records):
+        tags = []
+        for e in q["experience"]:
+            tags += [skill_tag(e, s) for s in q["skills"]] + [role_tag(e, r) for r in q["roles"]]
+            tags += [pair_tag(e, r, s) for r in q["roles"] for s in q["skills"]]
+        for tag in tags:
+            postings_by_tag.setdefault(tag, array("I")).append(qid)
+
+    tags, postings = {}, array("I")
+    for tag, ids in sorted(postings_by_tag.items()):
+        tags[tag] = [len(postings), len(ids)]
+        postings.extend(ids)
+
+    data, offsets = bytearray(), array("Q", [0])
+    for q in records:
+        data += json.dumps(q, separators=(",", ":")).encode("utf-8")
+        offsets.append(len(data))
+
+    if sys.byteorder != "little":
+        postings.byteswap()
+        offsets.byteswap()
+
+    header = {"n": len(records), "tags": tags}
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    # Pad so the u32/u64 sections are aligned
+    prefix = len(MAGIC) + 4 + len(header_bytes)
+    header_bytes += b" " * (-prefix % 8)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(postings.tobytes())
+        if len(postings) % 2:
+            f.write(b"\0" * 4)
+        f.write(offsets.tobytes())
+        f.write(bytes(data))
+    os.replace(tmp, path)
+    return len(records)
+
+
+class QuestionPool:
+    """
+    Read-only view over a pool file. Only the small tag directory is parsed at
+    open; postings and question bodies are read from the mmap on demand.
+    """
+    def __init__(self, path=QUESTION_POOL_FILE):
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"❌ Not a question pool file: {path}")
+        (header_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self._mm[start:start + header_len])
+        self.n = header["n"]
+        self.tags = header["tags"]
+        n_postings = sum(count for _, count in self.tags.values())
+        postings_at = start + header_len
+        offsets_at = postings_at + 4 * (n_postings + n_postings % 2)
+        self._data_at = offsets_at + 8 * (self.n + 1)
+        view = memoryview(self._mm)
+        self._postings = view[postings_at:postings_at + 4 * n_postings].cast("I")
+        self._offsets = view[offsets_at:self._data_at].cast("Q")
+
+    def postings(self, tag: str):
+        first, count = self.tags.get(tag, (0, 0))
+        return self._postings[first:first + count]
+
+    def question(self, qid: int) -> dict:
+        a = self._data_at + self._offsets[qid]
+        b = self._data_at + self._offsets[qid + 1]
+        q = json.loads(self._mm[a:b])
+        return {"question": q["question"], "expected_answer_outline": q["expected_answer_outline"]}
+
+    def covers(self, profile: dict) -> bool:
+        """True when the role and every skill in `profile` have questions in the pool at its experience"""
+        if not profile["tech_stack"]:
+            return False
+        experience = profile["experience"]
+        tags = [skill_tag(experience, s) for s in profile["tech_stack"]]
+        if profile["position"]:
+            tags.append(role_tag(experience, profile["position"]))
+        return all(tag in self.tags for tag in tags)
+
+    def select(self, profile: dict, k_min=3, k_max=5, rng=random):
+        """
+        Pick 3–5 questions by weighted set intersection over the role and skill
+        postings. Skills take turns; each turn scores a random sample of that
+        skill's postings (binary search membership, postings are sorted) and
+        keeps the best, so cost does not grow with the pool.
+        Returns None when the profile has a skill, role or experience bucket the
+        pool doesn't cover, or when fewer than `k_min` distinct questions turn up.
+        """
+        if not self.covers(profile):
+            return None
+        experience, position = profile["experience"], profile["position"]
+        skill_postings = [self.postings(skill_tag(experience, s)) for s in profile["tech_stack"]]
+        role_postings = self.postings(role_tag(experience, position)) if position else None
+        # Draw from role ∩ skill where the pool has it, otherwise from the skill alone
+        sources = []
+        for skill, ids in zip(profile["tech_stack"], skill_postings):
+            pair = self.postings(pair_tag(experience, position, skill)) if position else None
+            sources.append(pair if pair is not None and len(pair) else ids)
+
+        def score(qid):
+            total = sum(SKILL_WEIGHT for ids in skill_postings if _contains(ids, qid))
+            if role_postings is not None and _contains(role_postings, qid):
+                total += ROLE_WEIGHT
+            return total
+
+        k = max(k_min, min(k_max, len(profile["tech_stack"])))
+        chosen = []
+        for turn in range(k * len(sources)):
+            if len(chosen) >= k:
+                break
+            ids = sources[turn % len(sources)]
+            if len(ids) <= SAMPLE_SIZE:
+                sample = list(ids)
+            else:
+                sample = [ids[rng.randrange(len(ids))] for _ in range(SAMPLE_SIZE)]
+            sample = [qid for qid in sample if qid not in chosen]
+            if sample:
+                rng.shuffle(sample)  # variety among equal scores
+                chosen.append(max(sample, key=score))
+        if len(chosen) < k_min:
+            return None  # too few for an interview; the bank or the LLM fills it instead
+        return [self.question(qid) for qid in chosen]
+
+    def close(self):
+        self._postings.release()
+        self._offsets.release()
+        self._mm.close()
+        self._f.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_question_pool():
+    """Process-wide pool, or None if no pool file has been built"""
+    global _pool
+    with _pool_lock:
+        if _pool is None and os.path.exists(QUESTION_POOL_FILE):
+            _pool = QuestionPool(QUESTION_POOL_FILE)
+        return _pool
+
+
+async def _generate(wrapper, roles, skills, per_combo, experiences):
+    """Questions for every experience × role × skill, and the combos whose call failed"""
+    from .prompts import question_prompt
+    from .json_stream import JsonItemStream
+
+    combos = [(experience, role, skill) for experience in experiences for role in roles for skill in skills]
+    prompts = [
+        question_prompt({"position": role.lower(), "experience": experience, "tech_stack": [skill.lower()]}, count=per_combo)
+        for experience, role, skill in combos
+    ]
+    # abatch goes through the shared rate limiter, so this paces itself to the provider's limits
+    responses = await wrapper.abatch(prompts, session_id="question-pool-build", return_exceptions=True)
+    questions, failed = [], []
+    for (experience, role, skill), raw in zip(combos, responses):
+        if isinstance(raw, Exception):
+            # One failed call shouldn't throw away the rest of the build
+            failed.append((experience, role, skill))
+            print(f"⚠️ {experience} / {role} / {skill}: {raw}", file=sys.stderr)
+            continue
+        for item in JsonItemStream().feed(raw):
+            if isinstance(item, dict) and item.get("question"):
+                item["skills"], item["roles"], item["experience"] = [skill], [role], [experience]
+                questions.append(item)
+    return questions, failed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m core.question_pool")
+    sub = ap.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="generate questions for every role x skill and write the pool")
+    build.add_argument("--provider", default="groq")
+    build.add_argument("--model", default="llama-3.1-8b-instant")
+    build.add_argument("--api-key", default=GROQ_API_KEY)
+    build.add_argument("--per-combo", type=int, default=5)
+    build.add_argument("--experience", nargs="+", default=["3-5"], choices=["fresher", "1-2", "3-5", "6-10", "10+"],
+                       help="experience buckets to build questions for")
+    build.add_argument("--out", default=QUESTION_POOL_FILE)
+    args = ap.parse_args(argv)
+
+    from .llm_wrapper import LLMWrapper
+    wrapper = LLMWrapper(provider=args.provider, api_key=args.api_key, model_name=args.model)
+    questions, failed = asyncio.run(_generate(wrapper, JOB_ROLES, COMMON_SKILLS, args.per_combo, args.experience))
+    n = write_pool(args.out, questions)
+    print(f"✅ Wrote {n} questions to {args.out}")
+    if failed:
+        print(f"⚠️ {len(failed)} combinations failed and were left out of the pool.", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import asyncio, time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+
+class TokenBucket:
+    """Continuous-refill bucket holding up to `capacity` units, refilled at capacity per `period` seconds"""
+    def __init__(self, capacity, period=60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        self._stamp = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def wait_time(self, amount) -> float:
+        """Seconds until `amount` is available (requests larger than capacity wait for a full bucket)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount):
+        self._refill()
+        self.level -= amount  # may go negative when settling actual usage; it refills back
+
+    def give(self, amount):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class FairRateLimiter:
+    """
+    Per-provider admission control for LLM calls. Must be used from a single
+    event loop (see core/aio.py).
+
+    - `max_concurrency` caps in-flight requests
+    - request and token buckets enforce per-minute limits (RPM / TPM)
+    - waiters are queued per session and admitted round-robin, so one busy
+      session cannot starve the others under a load spike
+    """
+    def __init__(self, rpm, tpm, max_concurrency):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._queues = OrderedDict()  # session -> deque[(future, tokens)]
+        self._timer = None
+        self.paused_until = 0.0
+        self.admitted = 0
+        self.queued_peak = 0
+
+    def queued(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _dispatch(self):
+        self._timer = None
+        while self._queues and self.in_flight < self.max_concurrency:
+            session, queue = next(iter(self._queues.items()))
+            future, tokens = queue[0]
+            if future.cancelled():
+                queue.popleft()
+                if not queue:
+                    del self._queues[session]
+                continue
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens),
+                       self.paused_until - time.monotonic())
+            if wait > 0:
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(wait, self._dispatch)
+                return
+            queue.popleft()
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            self.admitted += 1
+            future.set_result(None)
+            # Round-robin: the session goes to the back of the line
+            del self._queues[session]
+            if queue:
+                self._queues[session] = queue
+
+    @asynccontextmanager
+    async def slot(self, session, tokens):
+        """
+        Wait for admission, then hold a concurrency slot. The context value is a
+        callable to report actual token usage once known.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(session, deque()).append((future, tokens))
+        self.queued_peak = max(self.queued_peak, self.queued())
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+        def settle(actual):
+            if actual > tokens:
+                self.tokens.take(actual - tokens)
+            else:
+                self.tokens.give(tokens - actual)
+
+        try:
+            yield settle
+        finally:
+            self._release()
+
+    def pause(self, seconds):
+        """Hold admissions for `seconds`, e.g. after the provider answered 429"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def estimated_wait(self, tokens) -> float:
+        """Rough seconds before a new request of `tokens` would be admitted"""
+        wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens), self.paused_until - time.monotonic(), 0.0)
+        backlog = self.queued() + (self.in_flight >= self.max_concurrency)
+        return wait + backlog * 60.0 / self.requests.capacity
+
+    def _release(self):
+        self.in_flight -= 1
+        if self._timer is None:
+            self._dispatch()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued(),
+            "queued_peak": self.queued_peak,
+            "admitted": self.admitted,
+            "requests_available": round(self.requests.level, 2),
+            "tokens_available": round(self.tokens.level, 1),
+        }
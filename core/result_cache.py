@@ -0,0 +1,83 @@
+import json, sqlite3, threading, time
+from .config import RESULT_CACHE_DB, RESULT_CACHE_TTL, RESULT_CACHE_MAX_ENTRIES
+
+
+class ResultCache:
+    """
+    Small persistent key/value cache (SQLite, WAL) for LLM results that should
+    survive reruns, page reloads and restarts. Values are stored as JSON.
+    Entries expire after `ttl` seconds; every PRUNE_EVERY writes, expired rows
+    are deleted and the namespace is cut back to its `max_entries` newest.
+    """
+    PRUNE_EVERY = 256
+
+    def __init__(self, path=RESULT_CACHE_DB, namespace="default", ttl=RESULT_CACHE_TTL,
+                 max_entries=RESULT_CACHE_MAX_ENTRIES):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        if "expires_at" not in columns:  # caches written before entries expired
+            self._conn.execute("ALTER TABLE results ADD COLUMN expires_at REAL")
+        self._conn.execute("UPDATE results SET expires_at = ? WHERE expires_at IS NULL", (time.time() + ttl,))
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_expiry ON results(namespace, expires_at)")
+        self._conn.commit()
+        self.prune()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.namespace, key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value, separators=(",", ":")), time.time() + self.ttl),
+            )
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def prune(self) -> int:
+        """Delete this namespace's expired entries and all but its `max_entries` newest; returns how many"""
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM results WHERE namespace = ? AND expires_at <= ?", (self.namespace, time.time())
+            ).rowcount
+            # The same TTL for every entry, so the latest expiry is the latest write
+            deleted += self._conn.execute(
+                "DELETE FROM results WHERE namespace = ? AND key IN (SELECT key FROM results WHERE namespace = ? "
+                "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries),
+            ).rowcount
+        return deleted
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(namespace: str) -> ResultCache:
+    """Process-wide cache instance per namespace"""
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = ResultCache(namespace=namespace)
+        return _caches[namespace]
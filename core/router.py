@@ -0,0 +1,242 @@
+"""
+Routing and failover across several (provider, model, key) backends.
+
+`LLMRouter` sends each call to the backend with the lowest expected latency:
+its measured time to first chunk plus its rate limiter's estimated queue
+wait, inflated by the recent error rate. Each backend has a circuit breaker.
+A call that fails before its first chunk moves on to the next backend.
+Backend state is process-wide, so every session benefits from what the
+others have observed.
+"""
+import asyncio, threading, time
+from . import metrics
+from .config import (
+    GROQ_API_KEY, OPENAI_API_KEY, LLM_BACKENDS, LLM_BREAKER_FAILURES, LLM_BREAKER_COOLDOWN,
+    LLM_ROUTER_PRIOR_LATENCY, LLM_OUTPUT_TOKENS_ESTIMATE,
+)
+from .llm_wrapper import LLMWrapper, RetryPolicy, StreamingLLM, ValidationCache, estimate_tokens, _status_code
+
+ENV_KEYS = {"groq": GROQ_API_KEY, "openai": OPENAI_API_KEY, "fake": "fake"}
+
+# The request itself is at fault; another backend would reject it too
+NO_FAILOVER_STATUS = {400, 413, 422}
+
+
+class CircuitBreaker:
+    """
+    closed → open after `threshold` consecutive failures → half-open once
+    `cooldown` has passed (a single probe call) → closed again on success.
+    """
+    def __init__(self, threshold=LLM_BREAKER_FAILURES, cooldown=LLM_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def available(self) -> bool:
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self.probing)
+
+    def allow(self) -> bool:
+        """Like `available`, but claims the half-open probe"""
+        if not self.available():
+            return False
+        if self.state == "half_open":
+            self.probing = True
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> bool:
+        """Returns True when this failure opened the breaker"""
+        self.failures += 1
+        if self.probing or (self.opened_at is None and self.failures >= self.threshold):
+            self.opened_at = time.monotonic()
+            self.probing = False
+            return True
+        return False
+
+    def abandon(self):
+        """The probe call was cancelled before it could tell us anything"""
+        self.probing = False
+
+
+class Backend:
+    """One (provider, model, key) with its breaker and latency / error-rate estimates"""
+    ALPHA = 0.2  # EWMA weight of the newest sample
+
+    def __init__(self, provider, model_name, api_key, wrapper=None):
+        self.wrapper = None
+        self.use(wrapper or LLMWrapper(provider, api_key, model_name))
+        self.key = ValidationCache.make_key(provider, api_key, model_name)
+        self.name = f"{provider}:{model_name}"
+        self.breaker = CircuitBreaker()
+        self.latency = None  # seconds to first chunk
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+
+    def use(self, wrapper: LLMWrapper):
+        """Send this backend's calls through `wrapper` (e.g. the pooled chain a session leased)"""
+        # Failover replaces per-backend retries and hedging; deadlines still apply
+        wrapper.policy = RetryPolicy(max_retries=0, hedge_after=0)
+        self.wrapper = wrapper
+
+    def expected_latency(self, tokens) -> float:
+        latency = LLM_ROUTER_PRIOR_LATENCY if self.latency is None else self.latency
+        wait = self.wrapper.limiter().estimated_wait(tokens)
+        return (latency + wait) * (1 + 4 * self.error_rate)
+
+    def record_latency(self, seconds):
+        self.latency = seconds if self.latency is None else (1 - self.ALPHA) * self.latency + self.ALPHA * seconds
+
+    def record_success(self):
+        self.calls += 1
+        self.error_rate *= 1 - self.ALPHA
+        self.breaker.record_success()
+
+    def record_failure(self):
+        self.calls += 1
+        self.errors += 1
+        self.error_rate = (1 - self.ALPHA) * self.error_rate + self.ALPHA
+        if self.breaker.record_failure():
+            metrics.LLM_BREAKER_TRIPS.inc(backend=self.name)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "state": self.breaker.state,
+            "latency_s": round(self.latency, 3) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "calls": self.calls,
+            "errors": self.errors,
+        }
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def shared_backend(provider, model_name, api_key, wrapper=None) -> Backend:
+    """The process-wide backend for these settings; a given `wrapper` is used rather than building another"""
+    key = ValidationCache.make_key(provider, api_key, model_name)
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = _backends[key] = Backend(provider, model_name, api_key, wrapper)
+        elif wrapper is not None and backend.wrapper is not wrapper:
+            backend.use(wrapper)
+        return backend
+
+
+def forget_backend(key):
+    """Drop the backend for a key no session uses any more; LLM_BACKENDS entries stay"""
+    if key in {b.key for b in configured_backends()}:
+        return
+    with _backends_lock:
+        _backends.pop(key, None)
+
+
+def configured_backends() -> list:
+    """LLM_BACKENDS entries ("provider:model") that have a key available"""
+    backends = []
+    for entry in LLM_BACKENDS:
+        provider, _, model_name = entry.partition(":")
+        provider = provider.strip().lower()
+        api_key = ENV_KEYS.get(provider)
+        if provider in LLMWrapper.SUPPORTED_PROVIDERS and model_name and api_key:
+            backends.append(shared_backend(provider, model_name.strip(), api_key))
+    return backends
+
+
+class LLMRouter(StreamingLLM):
+    """Drop-in for LLMWrapper (stream / astream / ainvoke / abatch / validate) over several backends"""
+    def __init__(self, backends, max_attempts=None, policy=None):
+        self.backends = list(dict.fromkeys(backends))
+        self.policy = policy or RetryPolicy()
+        self.max_attempts = max_attempts or len(self.backends) + self.policy.max_retries
+        self.provider = "router"
+        self.model_name = ",".join(b.name for b in self.backends)
+
+    def pick(self, tokens, exclude=()):
+        """Available backend with the lowest expected latency, or None"""
+        candidates = [b for b in self.backends if b not in exclude and b.breaker.available()]
+        for backend in sorted(candidates, key=lambda b: b.expected_latency(tokens)):
+            if backend.breaker.allow():
+                return backend
+        return None
+
+    async def _astream(self, question: str, session):
+        tokens = estimate_tokens(question) + LLM_OUTPUT_TOKENS_ESTIMATE
+        tried = []
+        error = None
+        for attempt in range(self.max_attempts):
+            backend = self.pick(tokens, exclude=tried) or self.pick(tokens)
+            if backend is None:
+                break
+            if backend in tried:
+                # Every available backend has failed once already; back off before going round again
+                await asyncio.sleep(self.policy.backoff(attempt, error))
+            tried.append(backend)
+            started = False
+            outcome = None
+            t0 = time.monotonic()
+            try:
+                async for chunk in backend.wrapper._astream(question, session):
+                    if not started:
+                        started = True
+                        backend.record_latency(time.monotonic() - t0)
+                    yield chunk
+                outcome = "ok"
+            except Exception as e:
+                outcome = "error"
+                if _status_code(e) in NO_FAILOVER_STATUS:
+                    # The backend answered; the request was bad, so it doesn't count against the breaker
+                    backend.breaker.abandon()
+                    raise
+                backend.record_failure()
+                if started:
+                    raise
+                error = e
+                metrics.LLM_FAILOVERS.inc(backend=backend.name)
+                continue
+            finally:
+                if outcome is None:  # cancelled by the caller
+                    backend.breaker.abandon()
+            backend.record_success()
+            return
+        raise error or RuntimeError("❌ No LLM backend is available right now. Please try again shortly.")
+
+    def validate(self):
+        """The first backend is the one the user configured; the others are checked by use"""
+        return self.backends[0].wrapper.validate()
+
+    def stats(self) -> list:
+        return [b.stats() for b in self.backends]
+
+
+def get_router(primary: LLMWrapper):
+    """`primary` itself when no extra backends are configured, else a router over it and LLM_BACKENDS"""
+    extra = configured_backends()
+    if not extra:
+        return primary
+    # The primary keeps its own wrapper (the pooled chain), so no second client is built for it
+    return LLMRouter([shared_backend(primary.provider, primary.model_name, primary.api_key, primary)] + extra)
+
+
+def router_stats() -> list:
+    with _backends_lock:
+        backends = list(_backends.values())
+    return [b.stats() for b in backends]
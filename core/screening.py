@@ -0,0 +1,192 @@
+"""
+Headless bulk screening: run the question pipeline over a file of candidate
+profiles (e.g. an ATS export) without the Streamlit form.
+
+    python -m core.screening applicants.csv --out screened.jsonl --concurrency 16
+
+Input is CSV or JSONL with the fields `ui/candidate_form.py` collects
+(name, email, phone, years_exp, desired_position(s), location, tech_stack, ...).
+In CSV, list fields are separated by ";", "|" or ",". Each valid candidate
+gets questions from the pool, the bank or the LLM and is then anonymized and
+saved like a form submission. Results are appended to `--out` as they
+complete, with the candidate's line number in the input; a JSONL line that
+doesn't parse is reported as invalid.
+
+Completed candidate ids go to a checkpoint file, so an interrupted run picks
+up where it stopped. Delivery is at-least-once: a crash between the two
+writes can repeat one line in `--out`. Concurrency only bounds the number of
+in-flight candidates. The shared rate limiter paces the LLM calls to the
+provider's limits.
+"""
+import argparse, csv, json, os, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .config import GROQ_API_KEY, LLM_MAX_CONCURRENCY
+from .utils import anonymize_candidate, candidate_errors, save_candidate
+
+FRESHER_FIELDS = ("degree", "domain", "cgpa", "marks_12th", "marks_10th")
+EXPERIENCE_FIELDS = ("last_company", "years_in_company", "position_in_company")
+TEXT_FIELDS = ("name", "email", "phone", "location", "linkedin", "github", "preferred_location")
+
+
+def _split(value):
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    text = str(value or "")
+    for sep in ("|", ","):
+        text = text.replace(sep, ";")
+    return [v.strip() for v in text.split(";") if v.strip()]
+
+
+def build_candidate(row: dict) -> dict:
+    """A raw CSV/JSONL row in the shape candidate_form() builds"""
+    row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+    try:
+        years_exp = int(float(row.get("years_exp") or 0))
+    except (TypeError, ValueError):
+        years_exp = 0
+    candidate = {field: str(row.get(field) or "").strip() for field in TEXT_FIELDS}
+    candidate["years_exp"] = years_exp
+    positions = _split(row.get("desired_positions") or row.get("desired_position"))
+    candidate["desired_positions"] = positions[:1] or [""]
+    candidate["tech_stack"] = _split(row.get("tech_stack") or row.get("skills"))
+    for field in FRESHER_FIELDS if years_exp == 0 else EXPERIENCE_FIELDS:
+        candidate[field] = str(row.get(field) or "").strip()
+    return candidate
+
+
+def read_profiles(path):
+    """
+    Yield (line number, raw row) from a .csv or .jsonl file without loading it
+    whole. A line that isn't valid JSON gives {"_error": reason} instead.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for n, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    row = {"_error": f"invalid JSON: {e.msg} (column {e.colno})"}
+                if not isinstance(row, dict):
+                    row = {"_error": "invalid JSON: expected an object"}
+                yield n, row
+
+
+def load_checkpoint(path) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def screen_candidate(chain, candidate: dict) -> dict:
+    from .question_bank import normalize_profile, questions_for
+
+    profile = normalize_profile(candidate)
+    questions, source = questions_for(chain, profile)
+    # Saved only once questions exist: a failed candidate is retried on the next run, not stored twice
+    record = anonymize_candidate(candidate)
+    save_candidate(record)
+    return {"id": record["id"], "profile": profile, "source": source, "questions": questions}
+
+
+def run(chain, rows, out_path, checkpoint_path, concurrency=LLM_MAX_CONCURRENCY, progress=None) -> dict:
+    """
+    Screen (line, row) pairs from read_profiles() with at most `concurrency` candidates in flight, appending one
+    JSON line per candidate to `out_path`. Returns counters.
+    """
+    done = load_checkpoint(checkpoint_path)
+    counts = {"screened": 0, "skipped": 0, "invalid": 0, "errors": 0}
+    lock = threading.Lock()
+    t0 = time.perf_counter()
+
+    with open(out_path, "a", encoding="utf-8") as out, open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        def emit(result, outcome, completed_id=None):
+            with lock:
+                counts[outcome] += 1
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                if completed_id:
+                    checkpoint.write(completed_id + "\n")
+                    checkpoint.flush()
+
+        def work(n, candidate, candidate_id):
+            try:
+                result = screen_candidate(chain, candidate)
+            except Exception as e:
+                emit({"row": n, "id": candidate_id, "status": "error", "error": str(e)}, "errors")
+                return
+            emit({"row": n, "status": "ok", **result}, "screened", completed_id=candidate_id)
+
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="screen") as executor:
+            for n, row in rows:
+                if "_error" in row:
+                    emit({"row": n, "status": "invalid", "errors": [row["_error"]]}, "invalid")
+                    continue
+                candidate = build_candidate(row)
+                candidate_id = anonymize_candidate(candidate)["id"]
+                if candidate_id in done:
+                    with lock:
+                        counts["skipped"] += 1
+                    continue
+                errors = candidate_errors(candidate)
+                if errors:
+                    emit({"row": n, "id": candidate_id, "status": "invalid", "errors": errors}, "invalid")
+                    continue
+                done.add(candidate_id)  # duplicate rows in one file are screened once
+                # Bounded read-ahead: never more than 2x concurrency rows in memory
+                if len(in_flight) >= 2 * concurrency:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    if progress:
+                        progress(counts, time.perf_counter() - t0)
+                in_flight.add(executor.submit(work, n, candidate, candidate_id))
+            wait(in_flight)
+    counts["seconds"] = round(time.perf_counter() - t0, 3)
+    if progress:
+        progress(counts, counts["seconds"])
+    return counts
+
+
+def _print_progress(counts, elapsed):
+    rate = counts["screened"] / elapsed if elapsed else 0.0
+    print(f"\r✅ {counts['screened']} screened, {counts['skipped']} skipped, {counts['invalid']} invalid, "
+          f"{counts['errors']} errors ({rate:.1f}/s)", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m core.screening")
+    ap.add_argument("input", help="candidate profiles (.csv or .jsonl)")
+    ap.add_argument("--out", default="screened.jsonl")
+    ap.add_argument("--checkpoint", help="completed ids (default: <out>.checkpoint)")
+    ap.add_argument("--concurrency", type=int, default=LLM_MAX_CONCURRENCY)
+    ap.add_argument("--provider", default="groq")
+    ap.add_argument("--model", default="llama3-8b-8192")
+    ap.add_argument("--api-key", default=GROQ_API_KEY)
+    args = ap.parse_args(argv)
+
+    from .llm_wrapper import LLMWrapper
+    from .router import get_router
+
+    chain = get_router(LLMWrapper(provider=args.provider, api_key=args.api_key, model_name=args.model))
+    valid = chain.validate()
+    if valid is None:
+        print("⚠️ Could not reach the provider to check the API key.", file=sys.stderr)
+        return 1
+    if not valid:
+        print("❌ Invalid API key or model.", file=sys.stderr)
+        return 1
+    counts = run(chain, read_profiles(args.input), args.out, args.checkpoint or args.out + ".checkpoint",
+                 args.concurrency, progress=_print_progress)
+    print(file=sys.stderr)
+    print(json.dumps(counts))
+    return 1 if counts["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
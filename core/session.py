@@ -0,0 +1,403 @@
+"""
+Compact per-session interview state.
+
+Each Streamlit session keeps one `InterviewSession` in
+`st.session_state.interview` instead of loose keys. The candidate, questions
+and answers are `__slots__` dataclasses. Strings returned by the question
+pool / bank are referenced, not copied.
+
+- A finished interview is offloaded right away: the candidate's record is
+  appended to the candidate store again with an `interview` field (latest
+  record per id wins), and the session keeps only the evaluation it shows.
+- A reaper thread handles sessions idle for longer than SESSION_IDLE_TTL:
+  finished ones are archived, unfinished ones are cleared except for the
+  flag the UI uses to say so.
+- `nbytes()` / `get_session_registry().stats()` account per-session memory.
+- Every step is checkpointed to the session store (core/session_store.py)
+  under the session's token, so another worker process, or this one after
+  a restart or an idle expiry, can `resume()` it.
+"""
+import secrets, sys, threading, time, weakref
+from concurrent.futures import Future
+from dataclasses import dataclass, fields
+from datetime import datetime
+from .config import SESSION_IDLE_TTL, SESSION_REAP_INTERVAL
+from .session_store import get_session_store
+from .utils import anonymize_candidate, save_candidate
+from . import metrics
+
+FRESHER_FIELDS = ("degree", "domain", "cgpa", "marks_12th", "marks_10th")
+EXPERIENCE_FIELDS = ("last_company", "years_in_company", "position_in_company")
+
+
+@dataclass(slots=True)
+class Candidate:
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    years_exp: int = 0
+    desired_position: str = ""
+    location: str = ""
+    linkedin: str = ""
+    github: str = ""
+    preferred_location: str = ""
+    tech_stack: tuple = ()
+    degree: str = ""
+    domain: str = ""
+    cgpa: str = ""
+    marks_12th: str = ""
+    marks_10th: str = ""
+    last_company: str = ""
+    years_in_company: int = 0
+    position_in_company: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """From the dict candidate_form() / build_candidate() produce"""
+        positions = data.get("desired_positions") or [""]
+        values = {f.name: data[f.name] for f in fields(cls) if f.name in data}
+        values["desired_position"] = positions[0] or ""
+        values["tech_stack"] = tuple(data.get("tech_stack") or ())
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        """The form's dict shape: fresher or experience details depending on years_exp"""
+        data = {
+            "name": self.name, "email": self.email, "phone": self.phone, "years_exp": self.years_exp,
+            "desired_positions": [self.desired_position], "location": self.location,
+            "linkedin": self.linkedin, "github": self.github, "preferred_location": self.preferred_location,
+            "tech_stack": list(self.tech_stack),
+        }
+        for name in FRESHER_FIELDS if self.years_exp == 0 else EXPERIENCE_FIELDS:
+            data[name] = getattr(self, name)
+        return data
+
+
+@dataclass(slots=True)
+class InterviewQuestion:
+    question: str
+    expected_answer_outline: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data.get("question", ""), data.get("expected_answer_outline", ""))
+
+    def to_dict(self) -> dict:
+        return {"question": self.question, "expected_answer_outline": self.expected_answer_outline}
+
+
+@dataclass(slots=True)
+class Answer:
+    question: InterviewQuestion
+    text: str
+
+    def to_dict(self) -> dict:
+        """{"q": question, "a": answer}, the shape the evaluator and cache keys use"""
+        return {"q": self.question.to_dict(), "a": self.text}
+
+
+def _done(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class InterviewSession:
+    __slots__ = ("token", "version", "flags", "candidate", "questions", "answers", "current_q", "answer_evals",
+                 "evaluation", "prefetch", "archived", "expired", "last_seen", "lock", "__weakref__")
+
+    def __init__(self, token=None):
+        self.token = token or secrets.token_urlsafe(16)  # the page's ?sid=
+        self.version = 0  # of the last checkpoint written or loaded
+        self.flags = {}  # UI progress outside the interview itself: consent, bot_intro
+        self.candidate = None  # Candidate
+        self.questions = ()  # InterviewQuestion, ...
+        self.answers = []  # Answer
+        self.current_q = 0
+        self.answer_evals = []  # Futures from submit_answer
+        self.evaluation = None  # {"key", "result"}
+        self.prefetch = None  # QuestionPrefetch started from the form (core/question_bank.py)
+        self.archived = False  # finished and offloaded to the candidate store
+        self.expired = False  # cleared by the idle reaper
+        self.last_seen = time.monotonic()
+        self.lock = threading.Lock()
+
+    def touch(self):
+        self.last_seen = time.monotonic()
+
+    def reset(self):
+        with self.lock:
+            self._clear()
+            self.drop_prefetch()
+            self.flags = {}
+            self.archived = self.expired = False
+        self.checkpoint()
+
+    def set_flags(self, **flags):
+        with self.lock:
+            if self.expired:
+                return  # reaped: its last checkpoint stays as it was for resume()
+            self.flags = {**self.flags, **flags}
+        self.checkpoint()
+
+    def start(self, candidate: Candidate):
+        """A new candidate was submitted: reset the interview, keeping questions prefetched from the form"""
+        with self.lock:
+            self._clear()
+            self.archived = self.expired = False
+            self.candidate = candidate
+        self.checkpoint()
+
+    def take_prefetch(self):
+        prefetch, self.prefetch = self.prefetch, None
+        return prefetch
+
+    def drop_prefetch(self):
+        prefetch = self.take_prefetch()
+        if prefetch is not None:
+            prefetch.cancel()
+
+    def set_questions(self, questions):
+        with self.lock:
+            if self.expired:
+                return
+            self.questions = tuple(InterviewQuestion.from_dict(q) for q in questions)
+        self.checkpoint()
+
+    @property
+    def current_question(self):
+        return self.questions[self.current_q] if self.current_q < len(self.questions) else None
+
+    def record_answer(self, text: str):
+        """The recorded Answer, or None when the session was reaped or has no open question"""
+        with self.lock:
+            if self.expired or self.current_q >= len(self.questions):
+                return None
+            answer = Answer(self.questions[self.current_q], text)
+            self.answers.append(answer)
+            self.current_q += 1
+        self.checkpoint()
+        return answer
+
+    def answer_dicts(self) -> list:
+        return [answer.to_dict() for answer in self.answers]
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.questions) and self.current_q >= len(self.questions) and bool(self.answers)
+
+    def _clear(self):
+        for future in self.answer_evals:
+            future.cancel()
+        self.candidate = None
+        self.questions = ()
+        self.answers = []
+        self.current_q = 0
+        self.answer_evals = []
+        self.evaluation = None
+
+    def archive(self):
+        """Offload a finished interview to the candidate store and keep only its evaluation"""
+        with self.lock:
+            if self.archived or self.candidate is None or not self.evaluation:
+                return
+            record = anonymize_candidate(self.candidate.to_dict())
+            record["interview"] = {
+                "answers": self.answer_dicts(),
+                "evaluation": self.evaluation["result"],
+                "completed_at": datetime.utcnow().isoformat() + "Z",
+            }
+            save_candidate(record)
+            evaluation = self.evaluation
+            self._clear()
+            self.drop_prefetch()
+            self.evaluation = evaluation
+            self.archived = True
+        self.checkpoint()
+        metrics.SESSIONS.inc(event="archived")
+
+    def expire(self):
+        """Free an idle session's memory; its last checkpoint stays in the store for resume()"""
+        with self.lock:
+            self._clear()
+            self.drop_prefetch()
+            self.expired = True
+        metrics.SESSIONS.inc(event="expired")
+
+    def to_state(self) -> dict:
+        """JSON checkpoint. Scores still running are left out and redone on resume"""
+        scores = []
+        for future in self.answer_evals:
+            if not future.done() or future.cancelled() or future.exception() is not None:
+                break
+            scores.append(future.result())
+        return {
+            "candidate": self.candidate.to_dict() if self.candidate else None,
+            "questions": [q.to_dict() for q in self.questions],
+            "answers": [answer.text for answer in self.answers],
+            "scores": scores,
+            "current_q": self.current_q,
+            "evaluation": self.evaluation,
+            "archived": self.archived,
+            "flags": self.flags,
+        }
+
+    def _restore(self, version: int, state: dict):
+        with self.lock:
+            self._clear()
+            self.drop_prefetch()
+            self.version = version
+            self.flags = dict(state.get("flags") or {})
+            self.candidate = Candidate.from_dict(state["candidate"]) if state.get("candidate") else None
+            self.questions = tuple(InterviewQuestion.from_dict(q) for q in state.get("questions", ()))
+            self.answers = [Answer(q, text) for q, text in zip(self.questions, state.get("answers", ()))]
+            self.current_q = state.get("current_q", len(self.answers))
+            self.answer_evals = [_done(score) for score in state.get("scores", ())]
+            self.evaluation = state.get("evaluation")
+            self.archived = bool(state.get("archived"))
+            self.expired = False
+
+    def checkpoint(self):
+        """Save the current state to the session store; a failed save never interrupts the interview"""
+        # The snapshot and its version are taken together, so the reaper can't clear the session in between
+        with self.lock:
+            if self.expired:
+                return  # reaped since the change: the store keeps the checkpoint resume() needs
+            self.version += 1
+            version, state = self.version, self.to_state()
+        try:
+            with metrics.STAGE_SECONDS.time(stage="session_checkpoint"):
+                saved = get_session_store().save(self.token, version, state)
+        except Exception:
+            metrics.SESSION_STORE.inc(op="save", result="error")
+            return
+        if saved:
+            metrics.SESSION_STORE.inc(op="save", result="ok")
+        else:
+            # Another worker has a newer checkpoint of this session: continue from it
+            metrics.SESSION_STORE.inc(op="save", result="conflict")
+            self.resume()
+
+    def resume(self) -> bool:
+        """Load the latest checkpoint for this token; False when the store has none"""
+        try:
+            entry = get_session_store().load(self.token)
+        except Exception:
+            metrics.SESSION_STORE.inc(op="load", result="error")
+            return False
+        metrics.SESSION_STORE.inc(op="load", result="miss" if entry is None else "hit")
+        if entry is None:
+            return False
+        self._restore(*entry)
+        return True
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this session (shared interned strings included)"""
+        return deep_sizeof(self)
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """sys.getsizeof over containers, slotted objects and their contents; other objects count shallow"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(type(obj), "__slots__") and not isinstance(obj, (str, bytes, int, float)):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in type(obj).__slots__ if hasattr(obj, name))
+    return size
+
+
+class SessionRegistry:
+    """Weak set of live sessions, with an idle reaper and memory accounting"""
+    def __init__(self, idle_ttl=SESSION_IDLE_TTL, interval=SESSION_REAP_INTERVAL):
+        self.idle_ttl = idle_ttl
+        self.interval = interval
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._reaper = None
+        self.created = 0
+        self.reaped = 0
+
+    def _register(self, session: InterviewSession, event: str) -> InterviewSession:
+        with self._lock:
+            self._sessions.add(session)
+            self.created += 1
+            if self._reaper is None and self.interval > 0:
+                self._reaper = threading.Thread(target=self._reap_forever, name="session-reaper", daemon=True)
+                self._reaper.start()
+        metrics.SESSIONS.inc(event=event)
+        return session
+
+    def new_session(self) -> InterviewSession:
+        return self._register(InterviewSession(), "created")
+
+    def open_session(self, token=None) -> InterviewSession:
+        """The checkpointed session for `token` (a page's ?sid=), or a new one with a new token"""
+        if token:
+            session = InterviewSession(token)
+            if session.resume():
+                return self._register(session, "resumed")
+        return self.new_session()
+
+    def sessions(self) -> list:
+        with self._lock:
+            return list(self._sessions)
+
+    def reap(self, now=None) -> int:
+        """Archive finished and expire unfinished sessions idle past the TTL; returns how many"""
+        now = time.monotonic() if now is None else now
+        reaped = 0
+        for session in self.sessions():
+            if session.archived or session.expired or now - session.last_seen < self.idle_ttl:
+                continue
+            if session.candidate is None and not session.evaluation:
+                continue  # nothing to drop
+            if session.finished and session.evaluation:
+                session.archive()
+            else:
+                session.expire()
+            reaped += 1
+        with self._lock:
+            self.reaped += reaped
+        return reaped
+
+    def _reap_forever(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.reap()
+                get_session_store().purge()
+            except Exception:
+                pass  # next round
+
+    def stats(self) -> dict:
+        sessions = self.sessions()
+        sizes = [session.nbytes() for session in sessions]
+        return {
+            "sessions": len(sessions),
+            "in_interview": sum(1 for s in sessions if s.candidate is not None),
+            "archived": sum(1 for s in sessions if s.archived),
+            "expired": sum(1 for s in sessions if s.expired),
+            "bytes": sum(sizes),
+            "bytes_per_session": round(sum(sizes) / len(sizes)) if sizes else 0,
+            "created": self.created,
+            "reaped": self.reaped,
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_session_registry() -> SessionRegistry:
+    """Process-wide session registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SessionRegistry()
+        return _registry
@@ -0,0 +1,190 @@
+"""
+Interview session checkpoints shared by every worker process.
+
+Each `InterviewSession` (core/session.py) has a token, carried in the page URL
+as `?sid=`. The session's state is saved here after every step: a new
+candidate, the questions, each answer, the evaluation. Any worker process
+that gets a request with that token can then resume it, so the app runs behind
+a load balancer without sticky sessions and survives worker restarts.
+
+Saves are versioned: a write with a version not newer than the stored one is
+rejected (another worker got further), and the writer reloads instead.
+
+Backends, chosen by SESSION_STORE:
+
+- memory: this process only; the stand-in for Redis in benchmarks and tests
+- sqlite: processes on one host (WAL), in SESSIONS_DB
+- redis: any number of hosts, at SESSION_REDIS_URL (needs the redis package)
+"""
+import atexit, json, sqlite3, threading, time
+from .config import SESSION_STORE, SESSIONS_DB, SESSION_REDIS_URL, SESSION_STORE_TTL
+from . import metrics
+
+
+class SessionStore:
+    """
+    Base class for session checkpoint backends
+    """
+    def load(self, token: str):
+        """(version, state dict) or None"""
+        raise NotImplementedError
+
+    def save(self, token: str, version: int, state: dict) -> bool:
+        """Store `state` unless a newer or equal version is already stored; returns whether it was"""
+        raise NotImplementedError
+
+    def delete(self, token: str):
+        raise NotImplementedError
+
+    def purge(self, ttl=SESSION_STORE_TTL) -> int:
+        """Drop checkpoints not updated for `ttl` seconds; returns how many"""
+        return 0
+
+    def close(self):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # token -> (version, json text, updated_at)
+
+    def load(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+        return (entry[0], json.loads(entry[1])) if entry else None
+
+    def save(self, token: str, version: int, state: dict) -> bool:
+        data = json.dumps(state, separators=(",", ":"))
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry and entry[0] >= version:
+                return False
+            self._entries[token] = (version, data, time.time())
+            return True
+
+    def delete(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def purge(self, ttl=SESSION_STORE_TTL) -> int:
+        cutoff = time.time() - ttl
+        with self._lock:
+            stale = [token for token, entry in self._entries.items() if entry[2] < cutoff]
+            for token in stale:
+                del self._entries[token]
+        return len(stale)
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    SQLite in WAL mode: one row per token. Every worker process on the host
+    opens the same file.
+    """
+    def __init__(self, path=SESSIONS_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "token TEXT PRIMARY KEY, version INTEGER NOT NULL, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at)")
+        self._conn.commit()
+
+    def load(self, token: str):
+        with self._lock:
+            row = self._conn.execute("SELECT version, state FROM sessions WHERE token = ?", (token,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def save(self, token: str, version: int, state: dict) -> bool:
+        data = json.dumps(state, separators=(",", ":"))
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO sessions (token, version, state, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(token) DO UPDATE SET version = excluded.version, state = excluded.state, "
+                "updated_at = excluded.updated_at WHERE excluded.version > sessions.version",
+                (token, version, data, time.time()),
+            )
+            return cursor.rowcount > 0
+
+    def delete(self, token: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def purge(self, ttl=SESSION_STORE_TTL) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - ttl,)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisSessionStore(SessionStore):
+    """
+    One hash per token ({v: version, s: state}) with a TTL; the version check
+    and write run as one Lua script, so concurrent workers can't interleave.
+    """
+    SAVE = """
+local current = redis.call('HGET', KEYS[1], 'v')
+if current and tonumber(current) >= tonumber(ARGV[1]) then return 0 end
+redis.call('HSET', KEYS[1], 'v', ARGV[1], 's', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+    def __init__(self, url=SESSION_REDIS_URL, ttl=SESSION_STORE_TTL):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("❌ SESSION_STORE=redis needs the redis package (pip install redis)")
+        self.ttl = int(ttl)
+        self._client = redis.Redis.from_url(url)
+        self._save = self._client.register_script(self.SAVE)
+
+    @staticmethod
+    def _key(token):
+        return f"talentscout:session:{token}"
+
+    def load(self, token: str):
+        entry = self._client.hgetall(self._key(token))
+        if not entry:
+            return None
+        return int(entry[b"v"]), json.loads(entry[b"s"])
+
+    def save(self, token: str, version: int, state: dict) -> bool:
+        data = json.dumps(state, separators=(",", ":"))
+        return bool(self._save(keys=[self._key(token)], args=[version, data, self.ttl]))
+
+    def delete(self, token: str):
+        self._client.delete(self._key(token))
+
+    def close(self):
+        self._client.close()
+
+
+BACKENDS = {
+    "memory": MemorySessionStore,
+    "sqlite": SqliteSessionStore,
+    "redis": RedisSessionStore,
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Process-wide session store selected by SESSION_STORE (memory | sqlite | redis)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if SESSION_STORE not in BACKENDS:
+                    raise ValueError(f"❌ Unsupported session store: {SESSION_STORE}")
+                store = BACKENDS[SESSION_STORE]()
+                atexit.register(store.close)
+                _store = store
+    return _store
@@ -0,0 +1,318 @@
+import atexit, json, os, sqlite3, sys, threading, time
+from abc import ABC, abstractmethod
+from .config import DATA_FILE, CANDIDATE_STORE, CANDIDATES_LOG, CANDIDATES_DB, FSYNC_BATCH, FSYNC_INTERVAL
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class _FileLock:
+    """
+    Cross-process advisory lock on an open file (flock on POSIX, msvcrt on Windows)
+    """
+    def __init__(self, f):
+        self.f = f
+
+    def __enter__(self):
+        if fcntl:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX)
+        else:
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+        else:
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class CandidateStore(ABC):
+    """
+    Base class for candidate storage backends
+    """
+    @abstractmethod
+    def append(self, record: dict):
+        ...
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    @abstractmethod
+    def __iter__(self):
+        ...
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    @abstractmethod
+    def scan(self, start=0):
+        """
+        Yield (locator, record, next_start) for records stored after `start`.
+        `locator` is passed to `fetch`; `next_start` resumes a later scan.
+        """
+
+    @abstractmethod
+    def fetch(self, locators) -> list:
+        """Records at `locators`, in the same order"""
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class JsonlCandidateStore(CandidateStore):
+    """
+    Append-only JSON Lines log. Each record is one line written under an
+    exclusive file lock, so concurrent sessions/processes never clobber each
+    other. fsync is batched: every `fsync_batch` records or `fsync_interval` seconds.
+    """
+    def __init__(self, path=CANDIDATES_LOG, fsync_batch=FSYNC_BATCH, fsync_interval=FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._f = open(path, "a+b")
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _write(self, data: bytes):
+        with self._lock:
+            with _FileLock(self._f):
+                self._f.seek(0, os.SEEK_END)
+                self._f.write(data)
+                self._f.flush()
+            self._pending += data.count(b"\n")
+            if self._pending >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self):
+        os.fsync(self._f.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, record: dict):
+        self._write((json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8"))
+
+    def extend(self, records):
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        if data:
+            self._write(data.encode("utf-8"))
+
+    def __iter__(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+
+    def scan(self, start=0):
+        """Locators are byte offsets; a torn (unterminated) last line is left for the next scan"""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                next_offset = offset + len(line)
+                if line.strip():
+                    try:
+                        yield offset, json.loads(line), next_offset
+                    except json.JSONDecodeError:
+                        pass
+                offset = next_offset
+
+    def fetch(self, locators) -> list:
+        records = []
+        with open(self.path, "rb") as f:
+            for offset in locators:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+
+    def flush(self):
+        with self._lock:
+            if self._pending:
+                self._sync()
+
+    def close(self):
+        self.flush()
+        self._f.close()
+
+
+class SqliteCandidateStore(CandidateStore):
+    """
+    SQLite backend in WAL mode. Records are stored as JSON text with a few
+    indexed columns pulled out for lookups.
+    """
+    def __init__(self, path=CANDIDATES_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT, email_hash TEXT, "
+            "created_at TEXT, record TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_candidates_id ON candidates(id)")
+        self._conn.commit()
+
+    @staticmethod
+    def _row(record: dict):
+        return (record.get("id"), record.get("email_hash"), record.get("created_at"),
+                json.dumps(record, separators=(",", ":")))
+
+    def append(self, record: dict):
+        self.extend([record])
+
+    def extend(self, records):
+        rows = [self._row(r) for r in records]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO candidates (id, email_hash, created_at, record) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def __iter__(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT record FROM candidates ORDER BY seq").fetchall()
+        for (record,) in rows:
+            yield json.loads(record)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def scan(self, start=0, batch=10000):
+        """Locators are `seq` values"""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, record FROM candidates WHERE seq > ? ORDER BY seq LIMIT ?", (start, batch)
+                ).fetchall()
+            for seq, record in rows:
+                yield seq, json.loads(record), seq
+            if len(rows) < batch:
+                return
+            start = rows[-1][0]
+
+    def fetch(self, locators) -> list:
+        locators = list(locators)
+        if not locators:
+            return []
+        with self._lock:
+            rows = dict(self._conn.execute(
+                f"SELECT seq, record FROM candidates WHERE seq IN ({','.join('?' * len(locators))})", locators
+            ).fetchall())
+        return [json.loads(rows[seq]) for seq in locators]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+BACKENDS = {
+    "jsonl": JsonlCandidateStore,
+    "sqlite": SqliteCandidateStore,
+}
+
+
+def _record_key(record) -> str:
+    """Candidates are deduplicated on `id`; a record without one on its whole content"""
+    if isinstance(record, dict) and record.get("id"):
+        return record["id"]
+    return json.dumps(record, sort_keys=True)
+
+
+def _load_legacy(path) -> list:
+    """The legacy array; raises ValueError when the file is unreadable or not a JSON array"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"{path}: {e}") from e
+    if not isinstance(records, list):
+        raise ValueError(f"{path}: expected a JSON array of candidates")
+    return records
+
+
+def migrate_legacy_json(store: CandidateStore, legacy_path=DATA_FILE) -> int:
+    """
+    One-time migration of the old `candidates.json` array into `store`.
+    The legacy file is renamed to `*.migrating` under a lock file, and to
+    `*.migrated` once its records are stored, so it is never imported twice.
+    A `*.migrating` file left by a crash is finished on the next start:
+    records whose id the store already holds are skipped, so a partial import
+    is completed rather than duplicated.
+    A legacy file that can't be read is left where it was and reported.
+    Returns the number of migrated records.
+    """
+    claimed = legacy_path + ".migrating"
+    if not os.path.exists(legacy_path) and not os.path.exists(claimed):
+        return 0
+    with open(legacy_path + ".lock", "a+b") as lock_file, _FileLock(lock_file):
+        if not os.path.exists(claimed):
+            try:
+                os.replace(legacy_path, claimed)
+            except FileNotFoundError:
+                return 0  # another process migrated it while we waited for the lock
+        try:
+            records = _load_legacy(claimed)
+        except ValueError as e:
+            # Never mark a file we couldn't read as migrated: put it back for a fix and the next start
+            if not os.path.exists(legacy_path):
+                os.replace(claimed, legacy_path)
+            print(f"⚠️ Legacy candidates not migrated: {e}", file=sys.stderr)
+            return 0
+        # The same candidate can appear more than once (resubmissions), so ids are counted, not just seen
+        stored = {}
+        for record in store:
+            key = _record_key(record)
+            stored[key] = stored.get(key, 0) + 1
+        missing = []
+        for record in records:
+            key = _record_key(record)
+            if stored.get(key):
+                stored[key] -= 1
+            else:
+                missing.append(record)
+        store.extend(missing)
+        store.flush()
+        os.replace(claimed, legacy_path + ".migrated")
+    try:
+        os.remove(legacy_path + ".lock")  # a process still waiting on it finds nothing left to migrate
+    except OSError:
+        pass
+    return len(missing)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> CandidateStore:
+    """Process-wide candidate store selected by CANDIDATE_STORE (jsonl | sqlite)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if CANDIDATE_STORE not in BACKENDS:
+                    raise ValueError(f"❌ Unsupported candidate store: {CANDIDATE_STORE}")
+                store = BACKENDS[CANDIDATE_STORE]()
+                migrate_legacy_json(store)
+                atexit.register(store.close)
+                _store = store
+    return _store
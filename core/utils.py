@@ -1,6 +1,8 @@
-import json, os, hashlib
+import hashlib, json, re
 from datetime import datetime
-from .config import SALT, DATA_FILE
+from .config import SALT
+from .storage import get_store
+from . import metrics
 
 def _hash(value: str) -> str:
     return hashlib.sha256((SALT + str(value)).encode("utf-8")).hexdigest()[:16]
@@ -37,14 +39,31 @@ def anonymize_candidate(candidate: dict) -> dict:
     return record
 
 
+def candidate_errors(candidate: dict) -> list:
+    """Validation messages for a candidate dict as built by the form (empty when valid)"""
+    errors = []
+    email = candidate.get("email", "")
+    phone = candidate.get("phone", "")
+    positions = candidate.get("desired_positions") or [""]
+    if not candidate.get("name", "").strip(): errors.append("Name is required.")
+    if not email.strip(): errors.append("Email is required.")
+    elif not re.match(r"[^@]+@[^@]+\.[^@]+", email.strip()):
+        errors.append("Email format is invalid.")
+    if not phone.strip(): errors.append("Phone number is required.")
+    elif not phone.strip().isdigit(): errors.append("Phone number must be numeric.")
+    if not (positions[0] or "").strip(): errors.append("Please select a desired position.")
+    if not (candidate.get("location") or "").strip(): errors.append("Location is required.")
+    if not candidate.get("tech_stack"): errors.append("At least one skill must be added.")
+    return errors
+
+
 def save_candidate(candidate: dict):
-    records = []
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                records = json.load(f)
-        except Exception:
-            records = []
-    records.append(candidate)
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(records, f, indent=2)
+    # O(1) append to the configured store (see core/storage.py)
+    with metrics.STAGE_SECONDS.time(stage="save_candidate"):
+        get_store().append(candidate)
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of JSON-serializable parts, used as a cache key"""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,29 +1,35 @@
 
 import streamlit as st
-from core.utils import save_candidate, anonymize_candidate
-import re
+from core.utils import save_candidate, anonymize_candidate, candidate_errors
+from core.config import JOB_ROLES, COMMON_SKILLS
+from core.session import Candidate
+from core.question_bank import prefetch_questions
+
+
+@st.fragment
 def candidate_form():
+    """
+    Runs as a fragment: editing a field reruns only the form. A valid submit
+    starts the interview, sets `questions_requested` and reruns the app, where
+    app.py generates the questions.
+    """
     st.subheader("Candidate Information")
+    previous = st.session_state.interview.candidate or Candidate()
 
     # --- Basic Info ---
-    name = st.text_input("Full Name", st.session_state.candidate.get("name", ""))
-    email = st.text_input("Email", st.session_state.candidate.get("email", ""))
-    phone = st.text_input("Phone Number", st.session_state.candidate.get("phone", ""))
+    name = st.text_input("Full Name", previous.name)
+    email = st.text_input("Email", previous.email)
+    phone = st.text_input("Phone Number", previous.phone)
     years_exp = st.number_input(
         "Years of Experience",
         min_value=0, max_value=80,
-        value=int(st.session_state.candidate.get("years_exp", 0)),
+        value=int(previous.years_exp),
         key="years_exp"
     )
 
     # Desired Position (single select)
-    job_roles = ["Select Position..."] + [
-        "Software Engineer", "Data Scientist", "Machine Learning Engineer",
-        "Full Stack Developer", "Backend Developer", "Frontend Developer",
-        "DevOps Engineer", "Cloud Engineer", "QA Engineer", "Product Manager"
-    ]
-    desired_positions_list = st.session_state.candidate.get("desired_positions", [])
-    default_index = job_roles.index(desired_positions_list[0]) if desired_positions_list and desired_positions_list[0] in job_roles else 0
+    job_roles = ["Select Position..."] + JOB_ROLES
+    default_index = job_roles.index(previous.desired_position) if previous.desired_position in job_roles else 0
     desired_position = st.selectbox(
         "Desired Position",
         options=job_roles,
@@ -32,22 +38,22 @@ def candidate_form():
     if desired_position == "Select Position...":
         desired_position = ""
 
-    location = st.text_input("Current Location", st.session_state.candidate.get("location", ""))
+    location = st.text_input("Current Location", previous.location)
 
     # --- Conditional Fields ---
     fresher_info, exp_info = {}, {}
     if years_exp == 0:
         st.subheader("Education Details (Fresher)")
-        fresher_info["degree"] = st.text_input("Degree", st.session_state.candidate.get("degree", ""))
-        fresher_info["domain"] = st.text_input("Domain / Branch", st.session_state.candidate.get("domain", ""))
-        fresher_info["cgpa"] = st.text_input("CGPA / Percentage", st.session_state.candidate.get("cgpa", ""))
-        fresher_info["marks_12th"] = st.text_input("12th Marks (%)", st.session_state.candidate.get("marks_12th", ""))
-        fresher_info["marks_10th"] = st.text_input("10th Marks (%)", st.session_state.candidate.get("marks_10th", ""))
+        fresher_info["degree"] = st.text_input("Degree", previous.degree)
+        fresher_info["domain"] = st.text_input("Domain / Branch", previous.domain)
+        fresher_info["cgpa"] = st.text_input("CGPA / Percentage", previous.cgpa)
+        fresher_info["marks_12th"] = st.text_input("12th Marks (%)", previous.marks_12th)
+        fresher_info["marks_10th"] = st.text_input("10th Marks (%)", previous.marks_10th)
     else:
         st.subheader("Work Experience Details")
-        exp_info["last_company"] = st.text_input("Last Company Worked", st.session_state.candidate.get("last_company", ""))
+        exp_info["last_company"] = st.text_input("Last Company Worked", previous.last_company)
         years_val = 0
-        val = st.session_state.candidate.get("years_in_company", "")
+        val = previous.years_in_company
         try:
             years_val = int(val)
         except:
@@ -59,12 +65,67 @@ def candidate_form():
             value=years_val
         )
         exp_info["position_in_company"] = st.text_input(
-            "Position in Last Company", st.session_state.candidate.get("position_in_company", "")
+            "Position in Last Company", previous.position_in_company
         )
 
+    _skills_editor(desired_position, years_exp)
+    final_skills = _final_skills()
+
+    # --- Additional Info ---
+    st.subheader("Additional Information")
+    linkedin = st.text_input("LinkedIn Profile", previous.linkedin)
+    github = st.text_input("GitHub/Portfolio Link", previous.github)
+    preferred_location = st.text_input("Preferred Job Location", previous.preferred_location)
+
+     # --- Submit & Validation ---
+    if st.button("Save & Start Mini Interview"):
+       # Build main candidate dict
+        candidate = {
+            "name": name.strip(),
+            "email": email.strip(),
+            "phone": phone.strip(),
+            "years_exp": int(years_exp),
+            "desired_positions": [desired_position],
+            "location": location.strip(),
+            "linkedin": linkedin.strip(),
+            "github": github.strip(),
+            "preferred_location": preferred_location.strip(),
+            "tech_stack": final_skills,
+        }
+
+        # Merge conditional fields
+        if years_exp == 0:
+            candidate.update(fresher_info)  # include fresher details
+        else:
+            candidate.update(exp_info)      # include experience details
+
+        # Required fields check (shared with the bulk screening CLI)
+        errors = candidate_errors(candidate)
+        if errors:
+            for err in errors:
+                st.error(err)
+            return
+
+        st.session_state.interview.start(Candidate.from_dict(candidate))
+        save_candidate(anonymize_candidate(candidate))
+        st.session_state.questions_requested = True
+        st.rerun()  # the whole app: questions are generated outside this fragment
+
+
+def _final_skills():
+    return [s["value"] for s in st.session_state.skills if s["value"].strip() != ""]
+
+
+@st.fragment
+def _skills_editor(desired_position, years_exp):
+    """
+    Nested fragment: adding, removing or picking a skill reruns only this part.
+    State lives in `st.session_state.skills`; the position and experience
+    arguments are the form's values from its last run.
+    """
     st.subheader("Technical Skills")
 
-    common_skills = ["Python", "Java", "JavaScript", "C++", "React", "Node.js", "Django", "SQL", "AWS", "Docker"]
+    common_skills = COMMON_SKILLS
 
     # Initialize session state
     if "skills" not in st.session_state:
@@ -125,61 +186,14 @@ def candidate_form():
         if len(st.session_state.skills) > 1:
             st.button("➖ Remove Last Skill", on_click=remove_skill)
 
-    # Final list of skills
-    final_skills = [s["value"] for s in st.session_state.skills if s["value"].strip() != ""]
-
-
-
-    # --- Additional Info ---
-    st.subheader("Additional Information")
-    linkedin = st.text_input("LinkedIn Profile", st.session_state.candidate.get("linkedin", ""))
-    github = st.text_input("GitHub/Portfolio Link", st.session_state.candidate.get("github", ""))
-    preferred_location = st.text_input("Preferred Job Location", st.session_state.candidate.get("preferred_location", ""))
-
-     # --- Submit & Validation ---
-    if st.button("Save & Start Mini Interview"):
-        errors = []
-
-        # Required fields check
-        if not name.strip(): errors.append("Name is required.")
-        if not email.strip(): errors.append("Email is required.")
-        elif not re.match(r"[^@]+@[^@]+\.[^@]+", email.strip()):
-            errors.append("Email format is invalid.")
-        if not phone.strip(): errors.append("Phone number is required.")
-        elif not phone.strip().isdigit(): errors.append("Phone number must be numeric.")
-        if not desired_position.strip(): errors.append("Please select a desired position.")
-        if not location.strip(): errors.append("Location is required.")
-        if not final_skills: errors.append("At least one skill must be added.")
-
-        if errors:
-            for err in errors:
-                st.error(err)
-            return False
-
-       # Build main candidate dict
-        candidate = {
-            "name": name.strip(),
-            "email": email.strip(),
-            "phone": phone.strip(),
-            "years_exp": int(years_exp),
-            "desired_positions": [desired_position],
-            "location": location.strip(),
-            "linkedin": linkedin.strip(),
-            "github": github.strip(),
-            "preferred_location": preferred_location.strip(),
-            "tech_stack": final_skills,
-        }
-
-        # Merge conditional fields
-        if years_exp == 0:
-            candidate.update(fresher_info)  # include fresher details
-        else:
-            candidate.update(exp_info)      # include experience details
-
-        st.session_state.candidate = candidate
-        save_candidate(anonymize_candidate(candidate))
-        st.session_state.questions, st.session_state.answers, st.session_state.current_q = [], [], 0
-        st.success("✅ Candidate saved!")
-        return True
+    final_skills = _final_skills()
 
-    return False
\ No newline at end of file
+    # Position, experience and skills are all question generation needs: start it now,
+    # while the candidate fills in the rest (app.py uses it on submit if they still match)
+    interview = st.session_state.interview
+    if interview.candidate is None and not interview.archived:
+        interview.prefetch = prefetch_questions(
+            st.session_state.get("chain"),
+            {"desired_positions": [desired_position], "years_exp": years_exp, "tech_stack": final_skills},
+            current=interview.prefetch,
+        )
@@ -1,47 +1,188 @@
 import streamlit as st
-import json, re
+from core.utils import anonymize_candidate, fingerprint
+from core.result_cache import get_result_cache
+from core.evaluator import submit_answer, aggregate_results, evaluate_batch, incomplete
+from core.config import EVAL_MODE, JOB_POLL_INTERVAL
+from core.jobs import (evaluation_job_key, get_job_queue, offload_available, submit_answer_score,
+                       submit_evaluation)
+from core import metrics
 
+
+def _offload() -> bool:
+    """Whether this session's LLM work goes to the background job workers (core/jobs.py)"""
+    return offload_available(st.session_state.get("provider"), st.session_state.get("api_key"))
+
+
+def _candidate_id(session) -> str:
+    # Candidate identity is the anonymized id, so no PII ends up in keys
+    return anonymize_candidate(session.candidate.to_dict())["id"] if session.candidate else ""
+
+
+def _submit_answer(chain, q):
+    session = st.session_state.interview
+    text = st.session_state.get(f"ans_{q}", "")
+    if not text.strip():
+        st.session_state.answer_warning = "⚠️ Please write an answer before submitting."
+        return
+    answer = session.record_answer(text)
+    if answer is None:
+        return  # the session was reaped meanwhile; the next run resumes it from its checkpoint
+    if EVAL_MODE == "incremental" and chain:
+        # Score in the background while the candidate works on the next question
+        if _offload():
+            submit_answer_score(st.session_state.provider, st.session_state.model_name,
+                                _candidate_id(session), answer.to_dict())
+        else:
+            session.answer_evals.append(submit_answer(chain, answer.to_dict()))
+    if session.finished:
+        st.session_state.answers_complete = True
+
+
+@st.fragment
 def ask_questions(chain):
-    if st.session_state.questions and st.session_state.current_q < len(st.session_state.questions):
-        q = st.session_state.questions[st.session_state.current_q]
-        st.markdown(f"**Question {st.session_state.current_q+1}: {q['question']}**")
-        user_ans = st.text_area("Your Answer:", key=f"ans_{st.session_state.current_q}")
-        if st.button("Submit Answer", key=f"submit_{st.session_state.current_q}"):
-            st.session_state.answers.append({"q": q, "a": user_ans})
-            st.session_state.current_q += 1
-            st.rerun()
+    """
+    Fragment: typing and submitting an answer rerun only this part; the next
+    question renders in place. After the last answer the app reruns once so
+    evaluate_answers() shows the result.
+    """
+    if st.session_state.pop("answers_complete", False):
+        st.rerun()
+    session = st.session_state.interview
+    q = session.current_question
+    if q:
+        st.markdown(f"**Question {session.current_q+1}: {q.question}**")
+        st.text_area("Your Answer:", key=f"ans_{session.current_q}")
+        st.button("Submit Answer", key=f"submit_{session.current_q}",
+                  on_click=_submit_answer, args=(chain, session.current_q))
+        warning = st.session_state.pop("answer_warning", None)
+        if warning:
+            st.warning(warning)
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def job_progress(key, label):
+    """Fragment polling a background job; the whole app reruns once it has finished"""
+    job = get_job_queue().get(key)
+    if job is None or job.finished:
+        st.rerun()
+    st.info(f"⏳ {label}…")
+    if isinstance(job.progress, list):  # questions generated so far
+        st.markdown("\n".join(f"{i}. {q['question']}" for i, q in enumerate(job.progress, 1)))
+    elif isinstance(job.progress, dict) and job.progress.get("total"):
+        st.progress(job.progress["scored"] / job.progress["total"])
+
+
+def _evaluation_key(session):
+    return fingerprint(EVAL_MODE, _candidate_id(session), session.answer_dicts())
+
+
+def _evaluation_job_args(session) -> tuple:
+    return (st.session_state.provider, st.session_state.model_name, _candidate_id(session), EVAL_MODE,
+            session.answer_dicts())
 
+
+def _unscored(future) -> bool:
+    """A finished background score that failed or came back without a score"""
+    if not future.done():
+        return False
+    return future.cancelled() or future.exception() is not None or future.result().get("score") is None
+
+
+def _retry_evaluation(chain=None):
+    session = st.session_state.interview
+    if _offload():
+        submit_evaluation(*_evaluation_job_args(session), retry=True)
+    elif EVAL_MODE == "incremental" and chain:
+        # Only the answers that couldn't be scored are scored again; batch mode reruns in full anyway
+        for i, (future, answer) in enumerate(zip(session.answer_evals, session.answers)):
+            if _unscored(future):
+                session.answer_evals[i] = submit_answer(chain, answer.to_dict())
+
+
+def _evaluation_job(session):
+    """
+    The evaluation from the background workers, or None while it runs (a
+    polling fragment is shown) or after it failed (the error is shown, with
+    a button to queue it again). Reruns only look the job up.
+    """
+    args = _evaluation_job_args(session)
+    job = get_job_queue().get(evaluation_job_key(*args)) or submit_evaluation(*args)
+    if job.status == "done":
+        return job.result
+    if job.finished:
+        st.error(f"Error generating evaluation: {job.error or job.status}")
+        st.button("🔁 Retry evaluation", key="retry_evaluation", on_click=_retry_evaluation)
+    else:
+        job_progress(job.key, "Evaluating your answers")
+    return None
+
+
+def _collect_incremental(chain, session):
+    futures = session.answer_evals
+    # Answers recorded without a background job (e.g. chain was missing) are scored now
+    for answer in session.answers[len(futures):]:
+        futures.append(submit_answer(chain, answer.to_dict()))
+    # Background scores that failed (e.g. a timeout) are retried once here ...
+    for i, (future, answer) in enumerate(zip(futures, session.answers)):
+        if future.done() and (future.cancelled() or future.exception() is not None):
+            futures[i] = submit_answer(chain, answer.to_dict())
+    results = []
+    for future, answer in zip(futures, session.answers):
+        try:
+            results.append(future.result())
+        except Exception:
+            # ... and if that fails too the answer is left out of the average
+            results.append({"question": answer.question.question, "score": None,
+                            "feedback": "⚠️ Could not evaluate this answer."})
+    return aggregate_results(results)
+
+
+@st.fragment
 def evaluate_answers(chain):
-    # New check: only evaluate after all questions answered
-    if st.session_state.questions and st.session_state.current_q >= len(st.session_state.questions) and st.session_state.answers:
+    """Fragment without widgets: it runs on full app runs only, never on a form or answer edit"""
+    session = st.session_state.interview
+    # New check: only evaluate after all questions answered (or show the archived result)
+    if session.finished or session.archived:
 
         st.subheader("📊 Final Evaluation")
-        eval_prompt = f"""
-Evaluate the following answers. Score each (1–10) + give feedback.
-Also return a final average score.
-{json.dumps(st.session_state.answers, indent=2)}
-JSON Format:
-{{
-  "results": [
-    {{"question": "...", "score": 7, "feedback": "..."}}
-  ],
-  "final_average_score": 8
-}}
-"""
-        try:
-            evaluation_raw = "".join([c for c in chain.stream({"question": eval_prompt})])
-            try:
-                evaluation_json = json.loads(evaluation_raw)
-            except json.JSONDecodeError:
-                match = re.search(r"\{.*\}", evaluation_raw, re.DOTALL)
-                evaluation_json = json.loads(match.group()) if match else None
-
-            if evaluation_json:
-                for idx, item in enumerate(evaluation_json.get("results", []), 1):
-                    st.markdown(f"**Question {idx}: {item.get('question')}**")
-                    st.write(f"- Score: {item.get('score')}")
-                    st.write(f"- Feedback: {item.get('feedback')}")
-                    st.markdown("---")
-                st.success(f"**Final Average Score: {evaluation_json.get('final_average_score')}**")
-        except Exception as e:
-            st.error(f"Error generating evaluation: {e}")
+        # Evaluate once per (candidate, answers): reruns and reloads reuse the stored result
+        if session.archived:
+            evaluation_json = session.evaluation["result"]
+        else:
+            key = _evaluation_key(session)
+            cache = get_result_cache("evaluation")
+            evaluation_json = cached = cache.get(key)
+            if evaluation_json is None and _offload():
+                # Enqueueing is idempotent: reruns and reloads find the same job
+                evaluation_json = _evaluation_job(session)
+                if evaluation_json is None:
+                    return
+            elif evaluation_json is None:
+                try:
+                    with metrics.STAGE_SECONDS.time(stage="evaluation", mode=EVAL_MODE):
+                        if EVAL_MODE == "incremental":
+                            evaluation_json = _collect_incremental(chain, session)
+                        else:
+                            evaluation_json = evaluate_batch(chain, session.answer_dicts())
+                except Exception as e:
+                    st.error(f"Error generating evaluation: {e}")
+                    return
+            # An answer without a score (timeout, unparseable reply) is a failed evaluation:
+            # not cached or archived, so a retry can still fix it
+            scored = evaluation_json and not incomplete(evaluation_json)
+            if scored and cached is None:
+                cache.set(key, evaluation_json)
+            session.evaluation = {"key": key, "result": evaluation_json}
+            if scored:
+                # The interview is over: store it with the candidate and free the session
+                session.archive()
+
+        if evaluation_json:
+            for idx, item in enumerate(evaluation_json.get("results", []), 1):
+                st.markdown(f"**Question {idx}: {item.get('question')}**")
+                st.write(f"- Score: {item.get('score')}")
+                st.write(f"- Feedback: {item.get('feedback')}")
+                st.markdown("---")
+            st.success(f"**Final Average Score: {evaluation_json.get('final_average_score')}**")
+            if incomplete(evaluation_json):
+                st.warning("⚠️ Some answers could not be evaluated and are left out of the average.")
+                st.button("🔁 Retry evaluation", key="retry_evaluation", on_click=_retry_evaluation, args=(chain,))